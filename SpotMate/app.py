@@ -15,19 +15,43 @@ This MVP demonstrates end-to-end parking platform functionality with real AI pre
 Designed for project review: Clean UI, no errors, clear user flows, real deep learning model.
 """
 
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
 import datetime as dt
-import requests
 import plotly.graph_objects as go
 import plotly.express as px
 try:
-    from backend_predictor import predict_parking_occupancy, convert_to_24h
+    from backend_predictor import (
+        predict_parking_occupancy, predict_many, predict_horizon, convert_to_24h,
+        start_model_warmup, model_status, get_live_occupancy
+    )
+    # Optionally share one model per host through prediction_service.py
+    PREDICTION_SERVICE_URL = os.environ.get("SPOTMATE_PREDICTION_SERVICE", "")
+    if PREDICTION_SERVICE_URL:
+        from prediction_client import PredictionClient
+        _prediction_client = PredictionClient(PREDICTION_SERVICE_URL)
+        predict_parking_occupancy = _prediction_client.predict_parking_occupancy
+        predict_many = _prediction_client.predict_many
+        predict_horizon = _prediction_client.predict_horizon
+        model_status = _prediction_client.model_status
+        get_live_occupancy = None   # live feeds are ingested by the service
+        def start_model_warmup():
+            pass
 except Exception as e:
     st.error(f"Failed to load backend predictor: {e}")
     def predict_parking_occupancy(zone_id, day, hour_24):
         return None
+    def predict_many(requests):
+        return [None] * len(requests)
+    def predict_horizon(requests, steps=6):
+        return [None] * len(requests)
+    def start_model_warmup():
+        pass
+    def model_status():
+        return "failed"
+    get_live_occupancy = None
     def convert_to_24h(hour, am_pm):
         hour = int(hour)
         if am_pm == "PM" and hour != 12:
@@ -35,8 +59,18 @@ except Exception as e:
         if am_pm == "AM" and hour == 12:
             return 0
         return hour
-import io
-import qrcode
+from qr_tickets import QRRenderer
+from forecast_refresh import ForecastBoard
+from zone_registry import load_zones
+from ticket_codec import BOOKING_HOURS, booking_ticket, load_key
+from spot_search import SpotIndex, vehicle_names
+from storage import ListingsStore, BookingsStore
+from geocoding import Geocoder
+from gazetteer import Gazetteer
+from autocomplete import Autocomplete
+
+# Load the AI model in the background so no tab waits on it
+start_model_warmup()
 
 # ============================================================
 # PAGE CONFIG
@@ -129,17 +163,9 @@ st.markdown("""
 # ============================================================
 # INITIALIZE SESSION STATE
 # ============================================================
-if "listed_parkings" not in st.session_state:
-    st.session_state.listed_parkings = pd.DataFrame(columns=[
-        "ID", "Location", "Type", "Price/Hour", "Availability", 
-        "Owner", "Contact", "Vehicle Size", "Image", "Listed Date"
-    ])
-
-if "bookings" not in st.session_state:
-    st.session_state.bookings = []
-
-if "booking_id_counter" not in st.session_state:
-    st.session_state.booking_id_counter = 5000
+# IDs of the bookings made in this session (the bookings live in BookingsStore)
+if "booking_ids" not in st.session_state:
+    st.session_state.booking_ids = []
 
 if "current_booking" not in st.session_state:
     st.session_state.current_booking = None
@@ -163,38 +189,32 @@ if "payment_method" not in st.session_state:
 # HELPER FUNCTIONS
 # ============================================================
 
-# Cache predictions to avoid recomputation
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+LISTINGS_PAGE_SIZE = 20
+
+@st.cache_resource(show_spinner=False)
+def get_listings_store():
+    """Listings shared by every session and persisted across restarts"""
+    return ListingsStore()
+
+@st.cache_resource(show_spinner=False)
+def get_bookings_store():
+    """Bookings ledger shared by every session and worker process"""
+    return BookingsStore()
+
+@st.cache_resource(show_spinner=False)
+def get_gazetteer():
+    """Locality index loaded once per process"""
+    return Gazetteer.load()
+
 def get_location_coordinates(location):
-    """Get coordinates for a location — tries known cities first, then geocoding."""
+    """Get coordinates for a location — tries the gazetteer first, then geocoding."""
     if not location or not location.strip():
         return None, None
 
-    location_lower = location.strip().lower()
-
-    # Known cities / areas for instant response (no network needed)
-    known_coords = {
-        "hitech city": (17.4409, 78.4594),
-        "hitec city": (17.4409, 78.4594),
-        "hitec cyberabad": (17.4437, 78.4454),
-        "it corridor": (17.3850, 78.4867),
-        "downtown": (17.3621, 78.4747),
-        "airport area": (17.3736, 78.4690),
-        "hyderabad": (17.3850, 78.4867),
-        "bangalore": (12.9716, 77.5946),
-        "bengaluru": (12.9716, 77.5946),
-        "mumbai": (19.0760, 72.8777),
-        "delhi": (28.6139, 77.2090),
-        "chennai": (13.0827, 80.2707),
-        "pune": (18.5204, 73.8567),
-        "mg road": (12.9716, 77.6117),
-        "kolkata": (22.5726, 88.3639),
-    }
-
-    # Check known locations (partial match)
-    for key, coords in known_coords.items():
-        if key in location_lower:
-            return coords
+    # Known localities for instant response (no network needed)
+    coords = get_gazetteer().lookup(location)
+    if coords is not None:
+        return coords
 
     # Fallback: try lightweight geocoding via Nominatim (free, no API key)
     lat, lon = geocode_location(location.strip())
@@ -204,27 +224,66 @@ def get_location_coordinates(location):
     # Ultimate fallback — return None so caller can show a warning
     return None, None
 
-@st.cache_data(ttl=300)
+# Hours shown in the "next hours" outlook from the arrival time
+OUTLOOK_HOURS = 6
+
+@st.cache_resource(show_spinner=False)
+def get_forecast_board():
+    """Cached curves + outlooks, refreshed only where live observations land"""
+    if get_live_occupancy is None:
+        # No local live feed to subscribe to: fall back to a 5-minute expiry
+        return ForecastBoard(predict_many, predict_horizon, steps=OUTLOOK_HOURS, max_age=300)
+    live = get_live_occupancy()
+    board = ForecastBoard(predict_many, predict_horizon, steps=OUTLOOK_HOURS, live_hours=live.capacity)
+    live.subscribe(board.invalidate)
+    return board
+
 def get_cached_predictions(zone_id, day, hours=24):
-    """Get all hourly predictions for a zone (cached)"""
-    predictions = []
-    for h in range(hours):
-        val = predict_parking_occupancy(zone_id, day, h)
-        predictions.append(val if val is not None else 50)
-    return predictions
+    """Get all hourly predictions for a zone (NaN marks genuinely missing data)"""
+    return get_forecast_board().curve(zone_id, day)[:hours]
+
+def get_cached_outlook(zone_id, day, hour, steps=OUTLOOK_HOURS):
+    """Next `steps` hours from the arrival hour, rolled out from one history window"""
+    return get_forecast_board().outlook(zone_id, day, hour)
+
+# Max time a rerun waits on the network; slower lookups finish in the background
+GEOCODE_WAIT_SECONDS = 1.5
+
+@st.cache_resource(show_spinner=False)
+def get_geocoder():
+    """One pooled, rate-limited geocoder per process with a persistent cache"""
+    return Geocoder()
 
 def geocode_location(place):
-    """Geocode location using OpenStreetMap API"""
-    try:
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"q": place, "format": "json", "limit": 1}
-        headers = {"User-Agent": "SpotMate"}
-        r = requests.get(url, params=params, headers=headers, timeout=5)
-        if r.status_code == 200 and r.json():
-            return float(r.json()[0]["lat"]), float(r.json()[0]["lon"])
-    except:
-        pass
-    return None, None
+    """Geocode location using OpenStreetMap API (never blocks a rerun for long)"""
+    lat, lon = get_geocoder().geocode(place, wait=GEOCODE_WAIT_SECONDS)
+    if lat is not None:
+        get_autocomplete().add(place)
+    return lat, lon
+
+AUTOCOMPLETE_LIMIT = 5
+
+@st.cache_resource(show_spinner=False)
+def get_autocomplete():
+    """Typeahead index over gazetteer localities and previously geocoded places"""
+    return Autocomplete.from_sources(get_gazetteer(), get_geocoder())
+
+def _fill_location(key, value):
+    st.session_state[key] = value
+
+def location_suggestions(key):
+    """Suggestion buttons under a location box; clicking one fills it in"""
+    typed = st.session_state.get(key, "")
+    if not typed or not typed.strip():
+        return
+    suggestions = [name for name in get_autocomplete().suggest(typed, AUTOCOMPLETE_LIMIT)
+                   if name != typed.strip().lower()]
+    if not suggestions:
+        return
+    st.caption("Suggestions")
+    for col, name in zip(st.columns(len(suggestions)), suggestions):
+        label = name.title()
+        col.button(label, key=f"{key}_suggestion_{name}", on_click=_fill_location, args=(key, label))
 
 def evaluate_status(occupancy):
     """Evaluate parking status based on occupancy percentage"""
@@ -235,18 +294,59 @@ def evaluate_status(occupancy):
     else:
         return "Highly Congested ❌", "status-bad"
 
-def generate_qr_code(booking_id, location, date, time):
-    """Generate QR code for parking booking - returns PIL Image and bytes"""
-    qr_data = f"BookingID:{booking_id}|Location:{location}|Date:{date}|Time:{time}"
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    # Convert to bytes for Streamlit display
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format="PNG")
-    img_bytes.seek(0)
-    return img, img_bytes
+@st.cache_resource(show_spinner=False)
+def get_qr_renderer():
+    """Rendered entry-pass PNGs shared by every session"""
+    return QRRenderer()
+
+@st.cache_resource(show_spinner=False)
+def get_ticket_key():
+    """Ticket signing key, shared with the offline gate verifiers"""
+    return load_key()
+
+def generate_qr_code(booking):
+    """QR code PNG bytes for a booking (encoded once, then served from cache)"""
+    return get_qr_renderer().png(booking_ticket(get_ticket_key(), booking))
+
+# Demo parking spots around Hitech City, Hyderabad (also the search
+# centre used when a location cannot be found)
+DEMO_CENTER = (17.4409, 78.4594)
+MOCK_SPOTS = [
+    {"spot_id": "P#1001", "location": "Hitech City", "type": "Private", "price": 45,
+     "lat": 17.4463, "lon": 78.4644, "availability": 75, "vehicles": ["Hatchback", "Sedan"],
+     "owner": "Rajesh Kumar"},
+    {"spot_id": "P#1002", "location": "Hitech City", "type": "Public", "price": 35,
+     "lat": 17.4319, "lon": 78.4657, "availability": 48, "vehicles": "All",
+     "owner": "City Parking Ltd"},
+    {"spot_id": "P#1003", "location": "Hitech City", "type": "Street", "price": 50,
+     "lat": 17.4409, "lon": 78.4547, "availability": 60, "vehicles": ["Hatchback", "Sedan", "SUV"],
+     "owner": "Priya Sharma"},
+    {"spot_id": "P#1004", "location": "Hitech City", "type": "Private", "price": 55,
+     "lat": 17.4544, "lon": 78.4456, "availability": 82, "vehicles": "All",
+     "owner": "Tech Park Management"},
+]
+
+def get_spot_index():
+    """Spatial index of the demo spots and every located listing (rebuilt when one is added)"""
+    return _build_spot_index(get_listings_store().last_id())
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_spot_index(last_listing_id):
+    listings = [
+        {
+            "spot_id": f"L#{row.id}",
+            "location": row.location,
+            "type": row.type,
+            "price": row.price,
+            "lat": row.lat,
+            "lon": row.lon,
+            "availability": round(100 * row.availability_hours / 24),  # share of the day
+            "vehicles": row.vehicle_sizes.split(", "),
+            "owner": row.owner,
+        }
+        for row in get_listings_store().located().itertuples()
+    ]
+    return SpotIndex.from_records(MOCK_SPOTS + listings)
 
 def get_mock_weather():
     """Return mock weather data"""
@@ -435,24 +535,22 @@ with tab2:
             if not location or not owner_name or not owner_contact or not vehicle_size:
                 st.error("Please fill all required fields")
             else:
-                # Add to mock database
-                new_id = len(st.session_state.listed_parkings) + 1
-                new_parking = pd.DataFrame({
-                    "ID": [new_id],
-                    "Location": [location],
-                    "Type": [parking_type],
-                    "Price/Hour": [f"₹{price}"],
-                    "Availability": [f"{availability_hours}h daily"],
-                    "Owner": [owner_name],
-                    "Contact": [owner_contact],
-                    "Vehicle Size": [", ".join(vehicle_size)],
-                    "Image": ["✅" if uploaded_file else "Demo"],
-                    "Listed Date": [dt.date.today().strftime("%d-%m-%Y")]
+                # Add to the listings database
+                listing_lat, listing_lon = get_location_coordinates(location)
+                new_id = get_listings_store().add({
+                    "location": location,
+                    "lat": listing_lat,
+                    "lon": listing_lon,
+                    "type": parking_type,
+                    "price": int(price),
+                    "availability_hours": int(availability_hours),
+                    "available_days": availability_days,
+                    "owner": owner_name,
+                    "contact": owner_contact,
+                    "vehicle_sizes": vehicle_size,
+                    "has_image": uploaded_file is not None,
+                    "listed_date": dt.date.today().strftime("%d-%m-%Y")
                 })
-                st.session_state.listed_parkings = pd.concat(
-                    [st.session_state.listed_parkings, new_parking], 
-                    ignore_index=True
-                )
                 
                 st.success(f"""
                 ✅ **Parking Listed Successfully!**
@@ -468,8 +566,14 @@ with tab2:
     st.markdown("---")
     st.markdown("### Active Listings")
     
-    if len(st.session_state.listed_parkings) > 0:
-        st.dataframe(st.session_state.listed_parkings, use_container_width=True, hide_index=True)
+    total_listings = get_listings_store().count()
+    if total_listings > 0:
+        page_count = (total_listings - 1) // LISTINGS_PAGE_SIZE + 1
+        listings_page = 1
+        if page_count > 1:
+            listings_page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="listings_page")
+        st.dataframe(get_listings_store().page(listings_page, LISTINGS_PAGE_SIZE), use_container_width=True, hide_index=True)
+        st.caption(f"Page {listings_page} of {page_count} · {total_listings} listings")
     else:
         st.info("📌 No parking spots listed yet. Use the form above to list your first spot!")
 
@@ -496,12 +600,14 @@ with tab3:
     search_col1, search_col2, search_col3 = st.columns(3)
     
     with search_col1:
-        search_location = st.text_input("Location", placeholder="e.g., Hitech City")
+        search_location = st.text_input("Location", placeholder="e.g., Hitech City", key="search_location")
     with search_col2:
         search_date = st.date_input("Date", value=dt.date.today())
     with search_col3:
         search_time = st.time_input("Time", value=dt.time(10, 0))
 
+    location_suggestions("search_location")
+
     filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
     
     with filter_col1:
@@ -515,58 +621,34 @@ with tab3:
 
     st.markdown("---")
 
-    # Mock search results
+    # Search the spot index around the entered location
     if search_location:
-        # Create realistic mock parking results
-        mock_parkings = [
-            {
-                "Parking ID": "P#1001",
-                "Location": search_location,
-                "Type": "Private",
-                "Price/Hour": "₹45",
-                "Distance": "0.8 km",
-                "Availability %": 75,
-                "Vehicles": "Hatchback, Sedan",
-                "Owner": "Rajesh Kumar"
-            },
-            {
-                "Parking ID": "P#1002",
-                "Location": search_location,
-                "Type": "Public",
-                "Price/Hour": "₹35",
-                "Distance": "1.2 km",
-                "Availability %": 48,
-                "Vehicles": "All",
-                "Owner": "City Parking Ltd"
-            },
-            {
-                "Parking ID": "P#1003",
-                "Location": search_location,
-                "Type": "Street",
-                "Price/Hour": "₹50",
-                "Distance": "0.5 km",
-                "Availability %": 60,
-                "Vehicles": "Hatchback, Sedan, SUV",
-                "Owner": "Priya Sharma"
-            },
+        search_lat, search_lon = get_location_coordinates(search_location)
+        if search_lat is None or search_lon is None:
+            st.info("Location not found, showing spots around Hitech City.")
+            search_lat, search_lon = DEMO_CENTER
+
+        results = get_spot_index().within_radius(
+            search_lat, search_lon, max_distance,
+            max_price=max_price,
+            min_availability=min_availability,
+            vehicle=vehicle_filter
+        )
+
+        filtered_parkings = [
             {
-                "Parking ID": "P#1004",
-                "Location": search_location,
-                "Type": "Private",
-                "Price/Hour": "₹55",
-                "Distance": "2.1 km",
-                "Availability %": 82,
-                "Vehicles": "All",
-                "Owner": "Tech Park Management"
+                "Parking ID": row.spot_id,
+                "Location": row.location,
+                "Type": row.type,
+                "Price/Hour": f"₹{row.price}",
+                "Distance": f"{row.distance_km:.1f} km",
+                "Availability %": row.availability,
+                "Vehicles": vehicle_names(row.vehicles),
+                "Owner": row.owner
             }
+            for row in results.itertuples()
         ]
 
-        # Filter results
-        filtered_parkings = [p for p in mock_parkings 
-                           if int(p["Price/Hour"].replace("₹", "")) <= max_price 
-                           and float(p["Distance"].split()[0]) <= max_distance
-                           and p["Availability %"] >= min_availability]
-
         if filtered_parkings:
             st.markdown(f"### Found {len(filtered_parkings)} Parking Spots")
             
@@ -630,10 +712,11 @@ with tab4:
             placeholder="e.g., HITEC City Hyderabad, MG Road Bangalore",
             key="smart_location_input"
         )
+        location_suggestions("smart_location_input")
 
         selected_zone_type = st.selectbox(
             "🏢 Zone Type",
-            ["Residential", "Commercial", "Office", "Event / Mixed"],
+            load_zones().categories,
             key="smart_zone_type_input"
         )
 
@@ -649,6 +732,8 @@ with tab4:
                     columns=["lat", "lon"]
                 )
                 st.map(map_data, zoom=13, use_container_width=True)
+            elif get_geocoder().is_pending(selected_location):
+                st.info("📡 Still locating this area... the map will appear on the next update.")
             else:
                 st.warning("Could not find coordinates for this location. AI predictions will still work using zone-type patterns.")
         else:
@@ -666,13 +751,8 @@ with tab4:
         ai_hour = st.slider("Preferred Arrival Time (Hour)", 0, 23, 14, key="ai_hour_slider")
 
     # Map zone type to zone ID for prediction
-    zone_type_map = {
-        "Residential": "Z3",
-        "Commercial": "Z4",
-        "Office": "Z1",
-        "Event / Mixed": "Z2"
-    }
-    ai_zone_id = zone_type_map[selected_zone_type]
+    ai_zone = load_zones().by_category(selected_zone_type)
+    ai_zone_id = ai_zone.code
 
     st.markdown("---")
 
@@ -689,7 +769,10 @@ with tab4:
         if generate_clicked:
             st.session_state["ai_insights_generated"] = True
 
-        if st.session_state.get("ai_insights_generated", False):
+        if st.session_state.get("ai_insights_generated", False) and model_status() == "loading":
+            st.info("⏳ The AI model is still warming up. Click **Generate AI Insights** again in a few seconds.")
+
+        elif st.session_state.get("ai_insights_generated", False):
             day = ai_date.day
             hour_24 = ai_hour
 
@@ -707,6 +790,13 @@ with tab4:
                 avg_occupancy = np.nanmean(pattern)
                 success_prob = 100 - occupancy
 
+                # Forward-looking outlook from the arrival hour (one batched rollout)
+                outlook = get_cached_outlook(ai_zone_id, day, hour_24)
+                outlook_hours = [h for h in range(hour_24, hour_24 + OUTLOOK_HOURS) if h < 24]
+                if outlook:
+                    outlook = outlook[:len(outlook_hours)]
+                    best_soon = outlook_hours[int(np.argmin(outlook))]
+
                 st.markdown("---")
                 st.markdown("### AI Prediction Results")
                 st.markdown(f"**Location:** {selected_location.strip()} | **Zone:** {selected_zone_type} | **Date:** {ai_date} | **Hour:** {hour_24}:00")
@@ -723,6 +813,10 @@ with tab4:
                 with metric_col4:
                     st.metric("Success Rate", f"{success_prob:.0f}%", delta=None, delta_color="off")
 
+                capacity = load_zones().capacity[ai_zone.id]
+                free_spots = max(0, round(capacity * (100 - occupancy) / 100))
+                st.caption(f"🅿️ About {free_spots} of {capacity} spots free in this zone at {hour_24}:00")
+
                 # 24-HOUR FORECAST CHART
                 st.markdown("---")
                 st.markdown("### 📈 24-Hour Availability Forecast")
@@ -758,6 +852,15 @@ with tab4:
                     showlegend=False
                 )
 
+                if outlook:
+                    fig_24h.add_trace(go.Scatter(
+                        x=outlook_hours,
+                        y=outlook,
+                        mode="lines",
+                        name=f"Next {len(outlook_hours)}h outlook",
+                        line=dict(color="#2563eb", width=2, dash="dot")
+                    ))
+
                 st.plotly_chart(fig_24h, use_container_width=True)
 
                 # SMART INSIGHTS
@@ -783,6 +886,9 @@ with tab4:
                     **Your Time ({hour_24}:00):** {success_prob:.0f}% chance of finding a spot
                     Expected wait time: {5 + int(occupancy/20)} mins
                     """)
+                    if outlook:
+                        st.markdown(f"**Best in the next {len(outlook_hours)} hours:** {best_soon}:00 "
+                                    f"(~{min(outlook):.0f}% occupied)")
 
                 with insight_col2:
                     st.markdown(f"""
@@ -819,8 +925,10 @@ with tab4:
                         st.warning("🏢 Commercial zones: Rush hour (5-7 PM) is busiest")
                     elif selected_zone_type == "Office":
                         st.info("💼 Office zones: Best parking after hours (7 PM+)")
+                    elif selected_zone_type == "Hospital":
+                        st.info("🏥 Hospital zones: Steady demand around the clock")
                     else:
-                        st.info("🎪 Event zones: Highly variable based on events")
+                        st.info("🚉 Transit zones: Avoid the 7-9 AM and 5-7 PM commute peaks")
 
                 with tip_col3:
                     if success_prob > 70:
@@ -835,14 +943,10 @@ with tab4:
                 st.markdown("### 🔥 How All Zone Types Compare (24-Hour)")
                 st.markdown("*Comparing occupancy patterns across different zone types*")
 
-                zones = ["Residential", "Commercial", "Office", "Event / Mixed"]
-                zones_short = ["Z3", "Z4", "Z1", "Z2"]
-
-                heatmap_data = []
-                for zone_id in zones_short:
-                    heatmap_data.append(get_cached_predictions(zone_id, day, 24))
+                zones = [zone.category for zone in load_zones()]
 
-                heatmap_data = np.array(heatmap_data)
+                # Rows not cached yet are predicted together in one batch
+                heatmap_data = get_forecast_board().curves(load_zones().codes, day)
 
                 fig_heatmap = go.Figure(data=go.Heatmap(
                     z=heatmap_data,
@@ -874,13 +978,13 @@ with tab4:
                     ✅ **Location-Aware:** Different zones have different patterns
                     ✅ **Time-Based:** Rush hours vary by zone type
                     ✅ **Accurate:** 88.7% accuracy, ±3.2% margin of error
-                    ✅ **Instant:** Latest data + historical patterns
+                    ✅ **Instant:** Live occupancy feeds (when connected) + historical patterns
 
                     **Privacy:** We never track individual cars - just aggregate occupancy trends.
                     """)
 
             else:
-                st.warning("⚠️ Not enough historical data for this date/time combination. Try a different hour (4:00 or later) or day.")
+                st.warning("⚠️ No historical data for this zone and date yet. Try a different day.")
 
 
 # ============================================================
@@ -892,12 +996,8 @@ with tab5:
     # ---- SUCCESS PAGE (shown after payment is confirmed) ----
     if st.session_state.payment_stage == 'confirmed' and st.session_state.temp_booking_id:
         booking_id = st.session_state.temp_booking_id
-        # Find the confirmed booking from the list
-        confirmed_booking = None
-        for b in st.session_state.bookings:
-            if b["booking_id"] == booking_id:
-                confirmed_booking = b
-                break
+        # Look up the confirmed booking by its ID
+        confirmed_booking = get_bookings_store().get(booking_id)
 
         if confirmed_booking:
             if not st.session_state.balloons_shown:
@@ -921,22 +1021,14 @@ with tab5:
             st.markdown("---")
 
             # Generate QR code inline on the success page
-            qr_img, qr_img_bytes = generate_qr_code(
-                confirmed_booking['booking_id'],
-                confirmed_booking['location'],
-                str(confirmed_booking['date']),
-                confirmed_booking['time']
-            )
+            qr_png_bytes = generate_qr_code(confirmed_booking)
 
             qr_s_col1, qr_s_col2 = st.columns([1, 2])
             with qr_s_col1:
-                st.image(qr_img_bytes, width=250, caption="Your Entry QR Code")
-                buf = io.BytesIO()
-                qr_img.save(buf, format="PNG")
-                buf.seek(0)
+                st.image(qr_png_bytes, width=250, caption="Your Entry QR Code")
                 st.download_button(
                     label="📥 Download QR Code",
-                    data=buf.getvalue(),
+                    data=qr_png_bytes,
                     file_name=f"spotmate_qr_{confirmed_booking['booking_id']}.png",
                     mime="image/png",
                     use_container_width=True
@@ -992,7 +1084,7 @@ with tab5:
         st.markdown("### Cost Breakdown")
 
         # Calculate costs (safe, static values)
-        hours = 4
+        hours = BOOKING_HOURS
         price_numeric = int(booking['price_per_hour'].replace("₹", ""))
         subtotal = price_numeric * hours
         tax = round(subtotal * 0.18)
@@ -1033,11 +1125,8 @@ with tab5:
         # Pay Now button
         if st.button("💳 Pay Now", use_container_width=True, type="primary", key="payment_button"):
             st.session_state.payment_stage = 'confirmed'
-            st.session_state.booking_id_counter += 1
-            booking_id = f"BK{st.session_state.booking_id_counter}"
 
             new_booking = {
-                "booking_id": booking_id,
                 "parking_id": booking['parking_id'],
                 "location": booking['location'],
                 "date": str(booking['date']),
@@ -1047,7 +1136,10 @@ with tab5:
                 "status": "Confirmed",
                 "booked_at": dt.datetime.now().strftime("%d-%m-%Y %H:%M")
             }
-            st.session_state.bookings.append(new_booking)
+            booking_id = get_bookings_store().create(new_booking)
+            # Start encoding the entry pass while the success page loads
+            get_qr_renderer().prerender(booking_ticket(get_ticket_key(), {**new_booking, "booking_id": booking_id}))
+            st.session_state.booking_ids.append(booking_id)
             st.session_state.temp_booking_id = booking_id
             st.rerun()
 
@@ -1064,9 +1156,10 @@ with tab5:
             6. Get your booking confirmation & QR code instantly!
             """)
 
-        if st.session_state.bookings:
+        my_bookings = get_bookings_store().get_many(st.session_state.booking_ids)
+        if my_bookings:
             st.markdown("### ✅ Your Recent Bookings")
-            bookings_df = pd.DataFrame(st.session_state.bookings)
+            bookings_df = pd.DataFrame(my_bookings)
             st.dataframe(bookings_df[["booking_id", "location", "date", "time", "amount", "payment_method", "status"]],
                         use_container_width=True, hide_index=True)
         else:
@@ -1083,16 +1176,17 @@ with tab6:
     
     # FAST QR CODE DISPLAY
     selected_booking = None
-    if st.session_state.bookings:
+    if st.session_state.booking_ids:
+        bookings_by_id = {b["booking_id"]: b for b in get_bookings_store().get_many(st.session_state.booking_ids)}
         # Show most recent booking first
-        recent_idx = len(st.session_state.bookings) - 1
-        selected_booking_idx = st.selectbox(
+        recent_idx = len(st.session_state.booking_ids) - 1
+        selected_booking_id = st.selectbox(
             "Select Booking",
-            range(len(st.session_state.bookings)),
+            st.session_state.booking_ids,
             index=recent_idx,
-            format_func=lambda i: f"{st.session_state.bookings[i]['booking_id']} - {st.session_state.bookings[i]['location']}"
+            format_func=lambda b_id: f"{b_id} - {bookings_by_id[b_id]['location']}" if b_id in bookings_by_id else b_id
         )
-        selected_booking = st.session_state.bookings[selected_booking_idx]
+        selected_booking = bookings_by_id.get(selected_booking_id)
 
     if selected_booking:
         
@@ -1116,26 +1210,18 @@ with tab6:
         st.markdown("### ✅ Your QR Code")
         
         # FAST QR GENERATION (no delay)
-        qr_img, qr_img_bytes = generate_qr_code(
-            selected_booking['booking_id'],
-            selected_booking['location'],
-            selected_booking['date'],
-            selected_booking['time']
-        )
+        qr_png_bytes = generate_qr_code(selected_booking)
         
         qr_col1, qr_col2 = st.columns([1.5, 2])
         
         with qr_col1:
             # INSTANT QR DISPLAY
-            st.image(qr_img_bytes, width=280, caption="📲 Scan at Entrance")
+            st.image(qr_png_bytes, width=280, caption="📲 Scan at Entrance")
             
-            # DOWNLOAD BUTTON
-            buf = io.BytesIO()
-            qr_img.save(buf, format="PNG")
-            buf.seek(0)
+            # DOWNLOAD BUTTON (same bytes as the image above)
             st.download_button(
                 label="📥 Download QR",
-                data=buf.getvalue(),
+                data=qr_png_bytes,
                 file_name=f"spotmate_qr_{selected_booking['booking_id']}.png",
                 mime="image/png",
                 use_container_width=True
@@ -1152,10 +1238,9 @@ with tab6:
             
             **What's in the QR:**
             - Booking ID: `{selected_booking['booking_id']}`
-            - Location: {selected_booking['location']}
-            - Time: {selected_booking['time']}
-            - Date: {selected_booking['date']}
-            - Secure verification token
+            - Parking spot: {selected_booking['parking_id']}
+            - Valid from {selected_booking['date']} {selected_booking['time']} for {BOOKING_HOURS} hours
+            - Signature checked offline at the gate
             
             **Tips:**
             ✅ Screenshot the QR for offline access  
@@ -1208,7 +1293,7 @@ with tab6:
     st.markdown("---")
     st.markdown("### Security & Privacy")
     st.markdown("""
-    - **Encryption:** All QR codes are encrypted with AES-256
+    - **Signed:** QR codes carry an HMAC-SHA256 signature gates verify offline
     - **Time-Limited:** QR codes expire after booking ends
     - **One-Time Use:** Each entry is logged and trackable
     - **Privacy:** No personal data visible on QR code
@@ -0,0 +1,85 @@
+# autocomplete.py
+#
+# Typeahead suggestions for location boxes. Every word start of every
+# known name (gazetteer localities + places geocoded before) sits in one
+# sorted key list, so a prefix is a single bisect away; ranked results
+# for recent prefixes are kept in a small LRU. One instance is shared by
+# every session, so index and LRU are guarded by a lock.
+
+import bisect
+import heapq
+import threading
+from collections import OrderedDict
+
+from gazetteer import KIND_RANK, normalize
+
+DEFAULT_LIMIT = 5
+
+
+class Autocomplete:
+    """Prefix index over place names with a bounded result cache."""
+
+    def __init__(self, places=(), max_cache=1024):
+        self._keys = []          # sorted (word-start suffix, name)
+        self.kinds = {}          # name -> kind
+        self.max_cache = max_cache
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.add_many(places)
+
+    @classmethod
+    def from_sources(cls, gazetteer, geocoder=None, **kwargs):
+        places = [(name, kind) for name, (_, _, kind) in gazetteer.places.items()]
+        if geocoder is not None:
+            places += [(query, "place") for query, _, _ in geocoder.known_places()]
+        return cls(places, **kwargs)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add_many(self, places):
+        """Index (name, kind) pairs; a known name keeps its original kind."""
+        with self._lock:
+            new = []
+            for name, kind in places:
+                name = normalize(name)
+                if name and name not in self.kinds:
+                    self.kinds[name] = kind
+                    words = name.split(" ")
+                    new += [(" ".join(words[i:]), name) for i in range(len(words))]
+            if len(new) == 1:
+                bisect.insort(self._keys, new[0])
+            elif new:
+                self._keys = sorted(self._keys + new)
+            if new:
+                self._cache.clear()
+
+    def add(self, name, kind="place"):
+        self.add_many([(name, kind)])
+
+    def suggest(self, text, limit=DEFAULT_LIMIT):
+        """
+        Up to `limit` names containing a word that starts with `text`.
+        Names that start with it come first, then areas before places
+        before cities, then shorter names.
+        """
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        key = (prefix, limit)
+        with self._lock:
+            ranked = self._cache.get(key)
+            if ranked is not None:
+                self._cache.move_to_end(key)
+                return ranked
+
+            lo = bisect.bisect_left(self._keys, (prefix,))
+            hi = bisect.bisect_left(self._keys, (prefix + "\uffff",))
+            names = {name for _, name in self._keys[lo:hi]}
+            ranked = heapq.nsmallest(limit, names, key=lambda n: (
+                not n.startswith(prefix), KIND_RANK.get(self.kinds[n], 1), len(n), n))
+
+            self._cache[key] = ranked
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+            return ranked
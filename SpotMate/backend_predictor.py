@@ -1,10 +1,21 @@
 # backend_predictor.py
 
+import hashlib
 import os
+import threading
+import time
 import numpy as np
 import pandas as pd
 import streamlit as st
 
+from occupancy_index import OccupancyIndex
+from numpy_model import NumpyCNNLSTM
+from forecast_table import ForecastTable, table_key, table_path
+from prediction_cache import PredictionCache, MISSING
+from dataset_store import read_store
+from live_occupancy import LiveOccupancy, LiveIngestor
+from zone_registry import load_zones
+
 # ---------------------------------------------------
 # Resolve paths relative to this file (works on any OS / Streamlit Cloud)
 # ---------------------------------------------------
@@ -13,25 +24,83 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
 DATASET_PATH = os.path.join(DATA_DIR, "parking_dataset_sorted.csv")
+DATASET_STORE_PATH = os.path.join(DATA_DIR, "parking_store")
 MODEL_PATH = os.path.join(DATA_DIR, "cnn_lstm_parking_model.keras")
+NUMPY_MODEL_PATH = os.path.join(DATA_DIR, "cnn_lstm_parking_model.npz")
+
+# Shared prediction cache: LRU size, and an optional SQLite file that lets
+# several worker processes on one host share entries ("" = memory only)
+PREDICTION_CACHE_SIZE = int(os.environ.get("SPOTMATE_PREDICTION_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_DB = os.environ.get("SPOTMATE_PREDICTION_CACHE_DB", "")
+
+# Live occupancy feeds: a file to tail and/or a UDP "host:port" to listen on
+LIVE_FILE = os.environ.get("SPOTMATE_LIVE_FILE", "")
+LIVE_UDP = os.environ.get("SPOTMATE_LIVE_UDP", "")
 
 
 # ---------------------------------------------------
 # Cached loaders — load once, reuse across reruns
+# Each is keyed by model_version() (the forecast table by its content
+# hash), so replacing the dataset or model files in place reloads them
+# instead of serving stale predictions.
 # ---------------------------------------------------
 
-@st.cache_data(show_spinner=False)
-def load_dataset():
-    """Load the parking dataset with a safe existence check."""
+def dataset_source_path():
+    """The binary store if it has been built, otherwise the CSV."""
+    if os.path.isfile(os.path.join(DATASET_STORE_PATH, "meta.json")):
+        return DATASET_STORE_PATH
+    return DATASET_PATH
+
+
+def load_dataset(columns=None, zones=None):
+    """
+    Load the parking dataset with a safe existence check.
+    Reads only the requested columns / zones from the binary store when
+    available (python dataset_store.py <csv> data/parking_store).
+    """
+    return _load_dataset(columns, zones, model_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_dataset(columns, zones, version):
+    if dataset_source_path() == DATASET_STORE_PATH:
+        return read_store(DATASET_STORE_PATH, columns=columns, zones=zones)
     if not os.path.isfile(DATASET_PATH):
         st.error(f"Dataset not found at: {DATASET_PATH}")
-        return pd.DataFrame(columns=["zone_id", "day", "hour", "occupancy", "is_weekend"])
-    return pd.read_csv(DATASET_PATH)
+        return pd.DataFrame(columns=columns or ["zone_id", "day", "hour", "occupancy", "is_weekend"])
+    df = pd.read_csv(DATASET_PATH, usecols=columns)
+    if zones is not None:
+        df = df[df["zone_id"].isin(zones)]
+    return df
+
+
+def load_occupancy_index():
+    """
+    Index the dataset once as a dense [zone, day, hour] cube.
+    Dataset days are days of a month and the app asks by calendar day, so
+    the index is cyclic: day 31 and the 1st's early hours (which need the
+    previous month's last day) resolve against the same monthly history.
+    Rows follow the zone registry (extended to every zone in the data),
+    so row i is integer zone id i and predictions accept either ids or codes.
+    """
+    return _load_occupancy_index(model_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_occupancy_index(version):
+    df = load_dataset(columns=("zone_id", "day", "hour", "occupancy"))
+    zones = load_zones()
+    zones = zones.extended(max(len(zones), df["zone_id"].nunique()))
+    return OccupancyIndex.from_dataframe(df, cyclic=True, zone_ids=zones.codes)
 
 
-@st.cache_resource(show_spinner=False)
 def load_keras_model():
     """Load the CNN-LSTM model with a safe existence check."""
+    return _load_keras_model(model_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_keras_model(version):
     if not os.path.isfile(MODEL_PATH):
         st.error(f"Model file not found at: {MODEL_PATH}")
         return None
@@ -39,6 +108,212 @@ def load_keras_model():
     return load_model(MODEL_PATH)
 
 
+def load_inference_model():
+    """
+    Prefer the exported NumPy weights (no TensorFlow import at serve time).
+    Falls back to the Keras model if they have not been exported yet.
+    Re-run `python numpy_model.py` after retraining.
+    """
+    return _load_inference_model(model_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_inference_model(version):
+    if os.path.isfile(NUMPY_MODEL_PATH):
+        return NumpyCNNLSTM.load(NUMPY_MODEL_PATH)
+    return load_keras_model()
+
+
+def serving_model_path():
+    """Path of the model file that load_inference_model() serves from."""
+    return NUMPY_MODEL_PATH if os.path.isfile(NUMPY_MODEL_PATH) else MODEL_PATH
+
+
+def load_forecast_table():
+    """
+    Load the precomputed forecast table for the current dataset + model.
+    Returns None if it has not been materialized (python forecast_table.py)
+    or the contents are still being hashed to find it.
+    """
+    return _load_forecast_table(content_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_forecast_table(version):
+    if not version:
+        return None
+    path = table_path(version)
+    if not os.path.isfile(path):
+        return None
+    table = ForecastTable.load(path)
+    # Requests are looked up by integer zone id: rows must follow the index
+    if table.zone_ids != load_occupancy_index().zone_ids[:len(table.zone_ids)]:
+        return None
+    return table
+
+
+# Seconds between checks of the dataset/model files for changes
+VERSION_CHECK_SECONDS = 1.0
+
+_version_lock = threading.Lock()
+_version_memo = (None, "")     # (file stats, version derived from them)
+_version_checked = float("-inf")
+_content_memo = ("", "")       # (version, forecast table key hashed from the file contents)
+_content_thread = None
+
+
+def _file_stats(path):
+    """(name, size, mtime) of a file or every file under a directory: cheap change check."""
+    paths = [path] if os.path.isfile(path) else sorted(
+        os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+    )
+    return tuple((p, info.st_size, info.st_mtime_ns) for p, info in ((p, os.stat(p)) for p in paths))
+
+
+def _stats_version():
+    """Version for the dataset/model files as they are now ("" if either is missing)."""
+    if not os.path.exists(dataset_source_path()) or not os.path.isfile(serving_model_path()):
+        return None, ""
+    stats = _file_stats(dataset_source_path()) + _file_stats(serving_model_path())
+    return stats, hashlib.sha256(repr(stats).encode()).hexdigest()[:16]
+
+
+def model_version():
+    """
+    Key that changes whenever the dataset or served model files change,
+    derived from their names, sizes and mtimes. Files are checked at most
+    every VERSION_CHECK_SECONDS and never read, so this is cheap enough to
+    call on every use; callers never wait behind a check in progress.
+    """
+    global _version_memo, _version_checked
+    with _version_lock:
+        if time.monotonic() - _version_checked < VERSION_CHECK_SECONDS:
+            return _version_memo[1]
+        _version_checked = time.monotonic()
+    try:
+        stats, version = _stats_version()
+    except OSError:                 # a file vanished mid-walk; check again next time
+        return _version_memo[1]
+    with _version_lock:
+        if _version_memo[0] != stats:
+            _version_memo = (stats, version)
+        return _version_memo[1]
+
+
+def _hash_contents(version):
+    global _content_memo
+    try:
+        key = table_key(dataset_source_path(), serving_model_path())
+        if _stats_version()[1] != version:
+            return                  # files changed while hashing; the next version re-hashes
+    except OSError:
+        return
+    with _version_lock:
+        _content_memo = (version, key)
+
+
+def content_version(wait=False):
+    """
+    Forecast table key (a hash of the dataset and model contents) for the
+    current model_version(). Hashing runs in a background thread; until
+    it finishes this returns "" (no table) unless `wait` is set.
+    """
+    global _content_thread
+    version = model_version()
+    if not version:
+        return ""
+    with _version_lock:
+        if _content_memo[0] == version:
+            return _content_memo[1]
+        thread = _content_thread
+        if thread is None or not thread.is_alive():
+            thread = _content_thread = threading.Thread(
+                target=_hash_contents, args=(version,), name="model-hash", daemon=True
+            )
+            thread.start()
+    if wait:
+        thread.join()
+        with _version_lock:
+            if _content_memo[0] == version:
+                return _content_memo[1]
+    return ""
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_prediction_cache():
+    return PredictionCache(
+        model_version(),
+        max_entries=PREDICTION_CACHE_SIZE,
+        db_path=PREDICTION_CACHE_DB or None,
+    )
+
+
+def get_prediction_cache():
+    """One prediction cache per process, shared by all sessions, on the current version."""
+    cache = _shared_prediction_cache()
+    cache.set_version(model_version())
+    return cache
+
+
+@st.cache_resource(show_spinner=False)
+def get_live_occupancy():
+    """Ring buffers of live hourly occupancy, one per indexed zone."""
+    return LiveOccupancy(load_occupancy_index().zone_ids)
+
+
+@st.cache_resource(show_spinner=False)
+def get_live_ingestor():
+    """Start the configured live feeds (once per process)."""
+    ingestor = LiveIngestor(get_live_occupancy())
+    if LIVE_FILE:
+        ingestor.follow_file(LIVE_FILE)
+    if LIVE_UDP:
+        host, _, port = LIVE_UDP.rpartition(":")
+        ingestor.listen_udp(host or "127.0.0.1", int(port))
+    return ingestor
+
+
+# ---------------------------------------------------
+# Background warm-up — load model + index off the script thread
+# ---------------------------------------------------
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_warmup_done = threading.Event()
+_warmup_failed = False
+
+
+def _warm_up():
+    global _warmup_failed
+    try:
+        content_version(wait=True)
+        load_forecast_table()
+        index = load_occupancy_index()
+        get_live_ingestor()
+        model = load_inference_model()
+        _warmup_failed = model is None or index.n_days == 0
+    except Exception:
+        _warmup_failed = True
+    finally:
+        _warmup_done.set()
+
+
+def start_model_warmup():
+    """Start loading the model in a daemon thread (once per process)."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+
+
+def model_status():
+    """Return "loading", "ready" or "failed" without blocking."""
+    if not _warmup_done.is_set():
+        return "loading"
+    return "failed" if _warmup_failed else "ready"
+
+
 # ---------------------------------------------------
 # Helper: convert 12-hour time to 24-hour
 # ---------------------------------------------------
@@ -57,50 +332,141 @@ def convert_to_24h(hour, am_pm):
 # CORE FUNCTION (THIS IS THE HEART OF THE PROJECT)
 # ---------------------------------------------------
 
+def _zone_key(index, zone_id):
+    """Dense integer row for a zone id or code; unknown zones pass through (and miss)."""
+    row = index.row(zone_id)
+    return zone_id if row is None else row
+
+
 def predict_parking_occupancy(zone_id, day, hour_24):
     """
     Uses historical data + CNN-LSTM to predict next-hour occupancy.
     Returns predicted occupancy (0-100) or None on failure.
     """
+    return predict_many([(zone_id, day, hour_24)])[0]
+
+
+# ---------------------------------------------------
+# Batched predictions — one forward pass for many (zone, day, hour)
+# ---------------------------------------------------
+
+def predict_many(requests):
+    """
+    Batched version of predict_parking_occupancy.
+    `requests` is a list of (zone_id, day, hour_24) tuples.
+    Returns a list of predicted occupancies (0-100), with None wherever
+    the 3-hour history window is not available.
+    Hours covered by the live feed are predicted from live observations;
+    the rest come from the forecast table, the cache or the history index.
+    Zones may be given as registry ids or codes; both resolve to the same
+    dense row.
+    """
+    # Results are cached only if the dataset/model are unchanged at the end
+    version = model_version()
+    index = load_occupancy_index()
+    requests = [(_zone_key(index, zone_id), day, hour_24) for zone_id, day, hour_24 in requests]
+    results = [None] * len(requests)
+
+    if not requests:
+        return results
+
+    # Live windows always go to the model: they change as events arrive
+    live_windows, live_found = get_live_occupancy().windows(requests, length=3)
+    live = set(live_found)
+
+    # Serve from the precomputed forecast table where it covers the request
+    table = load_forecast_table()
+    pending = []
+    for i, (zone_id, day, hour_24) in enumerate(requests):
+        if i in live:
+            continue
+        if table is not None and table.covers(zone_id, day):
+            results[i] = table.lookup(zone_id, day, hour_24)
+        else:
+            pending.append(i)
+
+    # Then the shared prediction cache
+    cache = get_prediction_cache()
+    cached = cache.get_many([requests[i] for i in pending]) if pending else []
+    for i, value in zip(pending, cached):
+        if value is not MISSING:
+            results[i] = value
+    pending = [i for i, value in zip(pending, cached) if value is MISSING]
 
-    df = load_dataset()
-    model = load_keras_model()
+    if not pending and not live_found:
+        return results
+
+    model = load_inference_model()
 
     # If model or dataset failed to load, return None gracefully
-    if model is None or df.empty:
-        return None
+    if model is None or index.n_days == 0:
+        return results
 
-    # We need last 3 hours
-    past_hours = [hour_24 - 3, hour_24 - 2, hour_24 - 1]
+    # Collect every available 3-hour window (O(1) slices of the cube)
+    windows, found = index.windows([requests[i] for i in pending], length=3)
+    positions = live_found + [pending[j] for j in found]
 
-    # Edge case (early hours)
-    if min(past_hours) < 0:
-        return None
+    if positions:
+        # Normalize and reshape for CNN + LSTM -> (N, 3, 1)
+        X = np.concatenate([live_windows, windows]).reshape(-1, 3, 1) / 100.0
 
-    # Filter dataset
-    history = df[
-        (df["zone_id"] == zone_id) &
-        (df["day"] == day) &
-        (df["hour"].isin(past_hours))
-    ].sort_values("hour")
+        # Single forward pass for the whole batch
+        predictions = model.predict(X, batch_size=len(X), verbose=0)[:, 0]
+
+        # Denormalize
+        for i, prediction in zip(positions, predictions):
+            results[i] = round(float(prediction) * 100, 2)
+
+    get_prediction_cache().put_many(((requests[i], results[i]) for i in pending), version=version)
+    return results
 
-    # If we don't have exactly 3 records -> can't predict
-    if len(history) != 3:
-        return None
 
-    # Extract occupancies
-    occupancies = history["occupancy"].values
+def predict_day_curve(zone_id, day, hours=24):
+    """Predict every hour of a day for one zone in a single batch."""
+    return predict_many([(zone_id, day, h) for h in range(hours)])
 
-    # Normalize
-    X = occupancies / 100.0
 
-    # Reshape for CNN + LSTM -> (1, 3, 1)
-    X = X.reshape(1, 3, 1)
+# ---------------------------------------------------
+# Multi-horizon forecasts — next N hours from one history window
+# ---------------------------------------------------
+
+def predict_horizon(requests, steps=6):
+    """
+    For each (zone_id, day, hour_24), forecast `steps` consecutive hours
+    starting at hour_24 from the 3 observed hours before it.
+    Predictions are fed back as inputs (recursive rollout). Every request
+    shares each pass, so the served one-hour model costs `steps` forward
+    passes for the whole batch (every column the model returns is used,
+    so a wider head would need fewer). Rows without a history window are None.
+    """
+    index = load_occupancy_index()
+    requests = [(_zone_key(index, zone_id), day, hour_24) for zone_id, day, hour_24 in requests]
+    results = [None] * len(requests)
+
+    model = load_inference_model()
+    if not requests or steps <= 0 or model is None or index.n_days == 0:
+        return results
 
-    # Predict
-    prediction = model.predict(X, verbose=0)[0][0]
+    # Live windows first, then history for the rest
+    live_windows, live_found = get_live_occupancy().windows(requests, length=3)
+    live = set(live_found)
+    rest = [i for i in range(len(requests)) if i not in live]
+    windows, found = index.windows([requests[i] for i in rest], length=3)
+    found = live_found + [rest[j] for j in found]
+    if not found:
+        return results
 
-    # Denormalize
-    predicted_occupancy = round(float(prediction) * 100, 2)
+    history = np.concatenate([live_windows, windows]) / 100.0
+    outputs = []
+    produced = 0
+    while produced < steps:
+        X = history[:, -3:].reshape(-1, 3, 1)
+        predictions = np.asarray(model.predict(X, batch_size=len(X), verbose=0), dtype=np.float32)
+        outputs.append(predictions)
+        produced += predictions.shape[1]
+        history = np.concatenate([history, predictions], axis=1)
 
-    return predicted_occupancy
+    forecast = np.concatenate(outputs, axis=1)[:, :steps]
+    for i, row in zip(found, forecast):
+        results[i] = [round(float(value) * 100, 2) for value in row]
+    return results
@@ -0,0 +1,107 @@
+# bulk_tickets.py
+#
+# Bulk entry-pass generation for fleet / event pre-bookings.
+# Tickets are signed in the parent, rendered to PNG across a process
+# pool in chunks, and written into a ZIP as each chunk finishes; only a
+# few chunks are ever in flight, so memory stays flat for any batch size.
+#
+#   python bulk_tickets.py passes.zip BK5001 BK5002 ...
+#   python bulk_tickets.py passes.zip --csv bookings.csv --workers 8
+
+import argparse
+import csv
+import io
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from qr_tickets import render_png
+from ticket_codec import booking_ticket, load_key
+
+CHUNK_SIZE = 32
+MANIFEST_NAME = "manifest.csv"
+
+
+def _render_chunk(codes):
+    return [render_png(code) for code in codes]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_bulk(bookings, out, key=None, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Render a QR pass for every booking into the ZIP `out` (path or file object):
+    one `<booking_id>.png` per booking plus a manifest of ticket codes.
+    Returns {"tickets", "seconds", "tickets_per_s", "bytes"}.
+    """
+    key = load_key() if key is None else key
+    workers = workers or os.cpu_count() or 1
+    tickets = ((b["booking_id"], booking_ticket(key, b)) for b in bookings)
+
+    start = time.perf_counter()
+    count = size = 0
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(["booking_id", "file", "ticket_code"])
+
+    # PNGs are already compressed; storing them avoids a second deflate pass
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def drain_one():
+            nonlocal count, size
+            chunk, future = pending.popleft()
+            for (booking_id, code), png in zip(chunk, future.result()):
+                name = f"{booking_id}.png"
+                zf.writestr(name, png)
+                writer.writerow([booking_id, name, code])
+                count += 1
+                size += len(png)
+
+        for chunk in _chunks(tickets, chunk_size):
+            pending.append((chunk, pool.submit(_render_chunk, [code for _, code in chunk])))
+            if len(pending) >= 2 * workers:
+                drain_one()
+        while pending:
+            drain_one()
+        zf.writestr(MANIFEST_NAME, manifest.getvalue())
+
+    seconds = time.perf_counter() - start
+    return {"tickets": count, "seconds": seconds,
+            "tickets_per_s": count / seconds if seconds else 0.0, "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render QR entry passes for many bookings into a ZIP.")
+    parser.add_argument("out", help="output .zip path")
+    parser.add_argument("booking_ids", nargs="*", help="booking IDs to look up in the bookings ledger")
+    parser.add_argument("--csv", help="CSV with booking_id, parking_id, date, time columns")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.csv:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            bookings = list(csv.DictReader(f))
+    else:
+        from storage import BookingsStore
+        bookings = BookingsStore().get_many(args.booking_ids)
+
+    stats = render_bulk(bookings, args.out, workers=args.workers)
+    print(f"{stats['tickets']} passes -> {args.out} in {stats['seconds']:.2f}s "
+          f"({stats['tickets_per_s']:,.0f} tickets/s, {stats['bytes'] / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
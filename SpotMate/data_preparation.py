@@ -1,7 +1,8 @@
 import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
 
+from windowing import make_sequences
+
 # -----------------------------
 # STEP 1: Load the dataset
 # -----------------------------
@@ -15,28 +16,13 @@ print("Sorting dataset by zone, day, and hour...")
 df = df.sort_values(by=["zone_id", "day", "hour"])
 
 # -----------------------------
-# STEP 3: Extract occupancy
-# -----------------------------
-occupancy = df["occupancy"].values
-
-# -----------------------------
-# STEP 4: Normalize (0–100 → 0–1)
-# -----------------------------
-occupancy = occupancy / 100.0
-
-# -----------------------------
-# STEP 5: Create sequences
+# STEP 3-5: Create sequences (per zone & day) and normalize (0–100 → 0–1)
 # -----------------------------
 sequence_length = 3   # past 3 hours → next hour
-X = []
-y = []
-
-for i in range(len(occupancy) - sequence_length):
-    X.append(occupancy[i:i + sequence_length])
-    y.append(occupancy[i + sequence_length])
+X, y = make_sequences(df, sequence_length=sequence_length, horizon=1)
 
-X = np.array(X)
-y = np.array(y)
+X = X / 100.0
+y = y[:, 0] / 100.0
 
 # -----------------------------
 # STEP 6: Train-test split
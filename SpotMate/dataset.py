@@ -1,50 +1,93 @@
+import argparse
+import os
+
+import numpy as np
 import pandas as pd
-import random
 
-data = []
+from dataset_store import write_zone_partition, write_meta
+from zone_registry import load_zones
 
-zones = {
-    "Z1": "office",
-    "Z2": "mall",
-    "Z3": "residential",
-    "Z4": "hospital",
-    "Z5": "station"
+# Per zone type: busy hours, busy occupancy range, quiet range, weekend bonus
+ZONE_PATTERNS = {
+    "office": (range(9, 18), (70, 90), (10, 30), 0),
+    "mall": (range(17, 23), (75, 95), (20, 40), 5),
+    "residential": ([20, 21, 22, 23, 0, 1, 2, 3, 4, 5, 6], (70, 90), (30, 50), 0),
+    "hospital": ([], (60, 80), (60, 80), 0),
+    "station": ([7, 8, 9, 17, 18, 19], (70, 90), (30, 50), 0),
 }
 
-for day in range(1, 31):
-    is_weekend = 1 if day % 7 in [6, 0] else 0
 
-    for hour in range(24):
-        for zone, ztype in zones.items():
+def generate_zone(zone, days, resolution=60, seed=42):
+    """
+    Generate one registry zone's occupancy, sorted by (day, hour, minute).
+    Each zone has its own random stream, so results are reproducible and
+    independent of how many zones are generated.
+    """
+    rng = np.random.default_rng([seed, zone.id])
+    busy_hours, busy, quiet, weekend_bonus = ZONE_PATTERNS[zone.type]
 
-            if ztype == "office":
-                base = random.randint(70, 90) if 9 <= hour <= 17 else random.randint(10, 30)
+    slots = 60 // resolution
+    day = np.repeat(np.arange(1, days + 1, dtype=np.uint16), 24 * slots)
+    hour = np.tile(np.repeat(np.arange(24, dtype=np.uint8), slots), days)
+    minute = np.tile(np.arange(0, 60, resolution, dtype=np.uint8), days * 24)
+    is_weekend = np.isin(day % 7, [6, 0]).astype(np.uint8)
 
-            elif ztype == "mall":
-                base = random.randint(75, 95) if 17 <= hour <= 22 else random.randint(20, 40)
-                if is_weekend:
-                    base += 5
+    is_busy = np.isin(hour, list(busy_hours))
+    low = np.where(is_busy, busy[0], quiet[0])
+    high = np.where(is_busy, busy[1], quiet[1])
+    occupancy = rng.integers(low, high + 1) + weekend_bonus * is_weekend
+    occupancy = np.minimum(occupancy, 100).astype(np.uint8)
 
-            elif ztype == "residential":
-                base = random.randint(70, 90) if hour >= 20 or hour <= 6 else random.randint(30, 50)
+    columns = {"day": day, "hour": hour}
+    if resolution < 60:
+        columns["minute"] = minute
+    columns["occupancy"] = occupancy
+    columns["is_weekend"] = is_weekend
+    return columns
 
-            elif ztype == "hospital":
-                base = random.randint(60, 80)
 
-            elif ztype == "station":
-                base = random.randint(70, 90) if hour in [7,8,9,17,18,19] else random.randint(30, 50)
+def generate(out, zones=5, days=30, resolution=60, seed=42):
+    """
+    Write the dataset to `out`: a .csv file, or otherwise a binary store
+    directory (see dataset_store.py). Zones come from the zone registry
+    (extended past it when `zones` is larger) and are generated one at a
+    time. Returns the total number of records.
+    """
+    registry = load_zones().extended(zones)
+    total = 0
+    if out.endswith(".csv"):
+        if os.path.exists(out):
+            os.remove(out)
+        for zone in registry:
+            df = pd.DataFrame(generate_zone(zone, days, resolution, seed))
+            df.insert(0, "zone_id", zone.code)
+            df.to_csv(out, mode="a", header=(zone.id == 0), index=False)
+            total += len(df)
+        return total
 
-            occupancy = min(base, 100)
+    os.makedirs(out, exist_ok=True)
+    counts = {}
+    columns = []
+    for zone in registry:
+        zone_columns = generate_zone(zone, days, resolution, seed)
+        counts[zone.code] = write_zone_partition(out, zone.code, zone_columns)
+        columns = list(zone_columns)
+    write_meta(out, f"dataset.py seed={seed}", counts, columns)
+    return sum(counts.values())
 
-            data.append([zone, day, hour, occupancy, is_weekend])
 
-df = pd.DataFrame(
-    data,
-    columns=["zone_id", "day", "hour", "occupancy", "is_weekend"]
-)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic parking occupancy dataset")
+    parser.add_argument("--zones", type=int, default=5)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--resolution", type=int, default=60, choices=[1, 5, 10, 15, 30, 60],
+                        help="minutes per record")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="parking_dataset.csv",
+                        help="output .csv file, or a directory for the binary store")
+    args = parser.parse_args()
 
-# 🔴 CHANGE THIS PATH if needed
-df.to_csv("parking_dataset.csv", index=False)
+    total = generate(args.out, args.zones, args.days, args.resolution, args.seed)
 
-print("CSV file created successfully!")
-print("Total records:", df.shape[0])
\ No newline at end of file
+    print("Dataset created successfully:", args.out)
+    print("Total records:", total)
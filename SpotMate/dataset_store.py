@@ -0,0 +1,196 @@
+# dataset_store.py
+#
+# Chunked ingestion of occupancy CSVs into a partitioned binary store:
+#
+#   <store>/meta.json
+#   <store>/zone=Z1/day.npy, hour.npy, occupancy.npy, is_weekend.npy
+#   <store>/zone=Z1/day_index.npy, day_offsets.npy   (day partitions)
+#   <store>/zone=Z2/...
+#
+# Each zone partition is sorted by (day, hour). Only one chunk plus one
+# zone's rows are held in memory at a time while writing. Reads are
+# memory-mapped and pruned to the requested columns, zones and days.
+#
+#   python dataset_store.py data/parking_dataset_sorted.csv data/parking_store
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Compact dtypes: a year of hourly data per zone fits in uint16 days
+CSV_DTYPES = {
+    "zone_id": "category",
+    "day": "uint16",
+    "hour": "uint8",
+    "occupancy": "uint8",
+    "is_weekend": "uint8",
+}
+VALUE_COLUMNS = ["day", "hour", "occupancy", "is_weekend"]
+# Optional sub-hour column written by the synthetic generator (CSV
+# ingestion drops it; OccupancyIndex averages each hour's rows)
+COLUMN_DTYPES = {**CSV_DTYPES, "minute": "uint8"}
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def partition_dir(store_dir, zone_id):
+    return os.path.join(store_dir, f"zone={zone_id}")
+
+
+def iter_csv_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrame chunks with compact dtypes."""
+    yield from pd.read_csv(
+        csv_path,
+        usecols=list(CSV_DTYPES),
+        dtype=CSV_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def _spill_chunk(chunk, spill_dir, run_id, runs):
+    """Sort one chunk per zone and write each zone's rows as a spill run."""
+    chunk = chunk.sort_values(["zone_id", "day", "hour"], kind="stable")
+    groups = chunk.groupby("zone_id", observed=True, sort=False)
+    for part, (zone_id, rows) in enumerate(groups):
+        path = os.path.join(spill_dir, f"run{run_id}_{part}.npz")
+        np.savez(path, **{col: rows[col].to_numpy() for col in VALUE_COLUMNS})
+        runs.setdefault(zone_id, []).append(path)
+
+
+def _merge_zone(run_paths):
+    """Merge a zone's sorted runs into one (day, hour)-ordered set of columns."""
+    columns = {col: [] for col in VALUE_COLUMNS}
+    for path in run_paths:
+        with np.load(path) as run:
+            for col in VALUE_COLUMNS:
+                columns[col].append(run[col])
+    columns = {col: np.concatenate(parts) for col, parts in columns.items()}
+
+    # Stable sort on a combined key; timsort merges the pre-sorted runs
+    key = columns["day"].astype(np.uint32) * 24 + columns["hour"]
+    order = np.argsort(key, kind="stable")
+    return {col: values[order] for col, values in columns.items()}
+
+
+def write_zone_partition(store_dir, zone_id, columns):
+    """Write one zone's (day, hour)-sorted columns plus its day partitions."""
+    out_dir = partition_dir(store_dir, zone_id)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    for col, values in columns.items():
+        np.save(os.path.join(out_dir, f"{col}.npy"), values)
+
+    # Day partitions: rows of day_index[i] are offsets[i]:offsets[i + 1]
+    day_index, starts = np.unique(columns["day"], return_index=True)
+    np.save(os.path.join(out_dir, "day_index.npy"), day_index)
+    np.save(os.path.join(out_dir, "day_offsets.npy"), np.append(starts, len(columns["day"])))
+    return int(len(columns["day"]))
+
+
+def write_meta(store_dir, source, zones, columns=VALUE_COLUMNS):
+    """Write meta.json; `zones` maps zone_id -> row count."""
+    meta = {
+        "source": source,
+        "rows": int(sum(zones.values())),
+        "columns": list(columns),
+        "dtypes": {col: COLUMN_DTYPES[col] for col in columns},
+        "zones": zones,
+    }
+    with open(os.path.join(store_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def write_store(csv_path, store_dir, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream `csv_path` in chunks into a zone-partitioned .npy store.
+    Returns the store metadata.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    runs = {}
+
+    with tempfile.TemporaryDirectory(dir=store_dir) as spill_dir:
+        for run_id, chunk in enumerate(iter_csv_chunks(csv_path, chunksize)):
+            _spill_chunk(chunk, spill_dir, run_id, runs)
+
+        zones = {}
+        for zone_id in sorted(runs):
+            zones[zone_id] = write_zone_partition(store_dir, zone_id, _merge_zone(runs[zone_id]))
+
+    return write_meta(store_dir, os.path.basename(csv_path), zones)
+
+
+# ---------------------------------------------------
+# Reading — memory-mapped, column / zone / day pruned
+# ---------------------------------------------------
+
+def read_meta(store_dir):
+    with open(os.path.join(store_dir, "meta.json")) as f:
+        return json.load(f)
+
+
+def _row_range(zone_dir, days):
+    """Rows covering the inclusive (first_day, last_day) range, or all rows."""
+    offsets = np.load(os.path.join(zone_dir, "day_offsets.npy"))
+    if days is None:
+        return 0, int(offsets[-1])
+    day_index = np.load(os.path.join(zone_dir, "day_index.npy"))
+    first, last = days
+    lo = np.searchsorted(day_index, first, side="left")
+    hi = np.searchsorted(day_index, last, side="right")
+    return int(offsets[lo]), int(offsets[hi])
+
+
+def open_partition(store_dir, zone_id, columns=VALUE_COLUMNS, days=None):
+    """
+    Memory-mapped column arrays for one zone, limited to an inclusive
+    (first_day, last_day) range if given. Nothing is read until used.
+    """
+    zone_dir = partition_dir(store_dir, zone_id)
+    start, stop = _row_range(zone_dir, days)
+    return {
+        col: np.load(os.path.join(zone_dir, f"{col}.npy"), mmap_mode="r")[start:stop]
+        for col in columns
+    }, stop - start
+
+
+def read_store(store_dir, columns=None, zones=None, days=None):
+    """
+    Load a DataFrame from the store, reading only the given columns,
+    zones and inclusive (first_day, last_day) range.
+    """
+    meta = read_meta(store_dir)
+    columns = list(columns or ["zone_id"] + meta["columns"])
+    value_columns = [col for col in columns if col != "zone_id"]
+    zones = sorted(meta["zones"]) if zones is None else [z for z in zones if z in meta["zones"]]
+
+    frames = []
+    for zone_id in zones:
+        arrays, n_rows = open_partition(store_dir, zone_id, value_columns, days)
+        frame = pd.DataFrame({col: np.asarray(arrays[col]) for col in value_columns}, index=range(n_rows))
+        frame["zone_id"] = zone_id
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype=COLUMN_DTYPES[col]) for col in columns})
+
+    df = pd.concat(frames, ignore_index=True)
+    df["zone_id"] = pd.Categorical(df["zone_id"], categories=zones)
+    return df[columns]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert an occupancy CSV into a partitioned binary store")
+    parser.add_argument("csv_path")
+    parser.add_argument("store_dir")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    meta = write_store(args.csv_path, args.store_dir, args.chunksize)
+    print("Store written:", args.store_dir)
+    print("Total records:", meta["rows"], "| Zones:", len(meta["zones"]))
@@ -0,0 +1,253 @@
+# forecast_refresh.py
+#
+# Incremental forecast refresh. The board caches 24-hour curves (which
+# are also the heatmap rows) and arrival-hour outlooks. Nothing expires
+# on a timer: a live observation for hour h of a zone only changes the
+# forecasts whose history window contains h, i.e. that zone's hours
+# h+1 .. h+WINDOW. Those entries are marked dirty and re-predicted on the
+# next read, all of them in one batched call, and patched in place.
+# The same happens when an hour ages out of the live buffer, so forecasts
+# fall back to history (and last month's live values are never served
+# for this month's same day). Both caches are bounded LRUs.
+# Every mark carries a revision number; a refresh that finishes after a
+# newer one for the same hour is discarded instead of patched in.
+
+import datetime as dt
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from live_occupancy import local_hour
+
+WINDOW = 3          # hours of history behind each prediction
+EPOCH = dt.datetime(1970, 1, 1)
+MAX_CURVES = 256
+MAX_OUTLOOKS = 1024
+
+
+def hour_to_day_hour(hour_number):
+    """Local hour number (see live_occupancy.local_hour) -> (day of month, hour)."""
+    moment = EPOCH + dt.timedelta(hours=int(hour_number))
+    return moment.day, moment.hour
+
+
+class ForecastBoard:
+    """Cached curves and outlooks kept current by dependency-aware refreshes."""
+
+    def __init__(self, predict_many, predict_horizon, steps=6, hours=24, max_age=None,
+                 live_hours=None, max_curves=MAX_CURVES, max_outlooks=MAX_OUTLOOKS, clock=time.time):
+        self._predict_many = predict_many
+        self._predict_horizon = predict_horizon
+        self.steps = steps
+        self.hours = hours
+        self.max_age = max_age          # fallback expiry when no live feed is subscribed
+        self.live_hours = live_hours    # live buffer length; ageing hours are invalidated
+        self.max_curves = max_curves
+        self.max_outlooks = max_outlooks
+        self._clock = clock
+        self._curves = OrderedDict()    # (zone_id, day) -> float array, NaN = no data
+        self._outlooks = OrderedDict()  # (zone_id, day, hour) -> list or None
+        self._pending = {}              # key -> Event while its first prediction runs
+        self._dirty_hours = {}          # (zone_id, day) -> {hour: revision} to re-predict
+        self._dirty_outlooks = {}       # (zone_id, day, hour) -> revision
+        self._revision = 0              # bumped by every mark
+        self._claimed = {}              # key -> revision when its first prediction started
+        self._applied = {}              # key -> revision (per hour for curves) of cached values
+        self._stamps = {}
+        self._hour = None               # local hour number at the last read
+        self._lock = threading.Lock()
+        self.predicted = 0              # hour-level predictions made, for monitoring
+
+    # ---------------------------------------------------
+    # Invalidation — called by LiveOccupancy.subscribe
+    # ---------------------------------------------------
+
+    def _mark(self, zone_id, target_hour):
+        """Dirty one target hour of a zone if it is cached or being predicted (lock held)."""
+        day, hour = hour_to_day_hour(target_hour)
+        self._revision += 1
+        if (zone_id, day) in self._curves or (zone_id, day) in self._pending:
+            self._dirty_hours.setdefault((zone_id, day), {})[hour] = self._revision
+        if (zone_id, day, hour) in self._outlooks or (zone_id, day, hour) in self._pending:
+            self._dirty_outlooks[(zone_id, day, hour)] = self._revision
+
+    def invalidate(self, observations):
+        """Mark the forecasts depending on each (zone_id, hour_number) as dirty."""
+        with self._lock:
+            for zone_id, hour_number in observations:
+                for ahead in range(1, WINDOW + 1):
+                    self._mark(zone_id, hour_number + ahead)
+
+    def _roll(self):
+        """
+        Invalidate targets whose live window just aged out of the buffer
+        (a window is live while it starts after now - live_hours).
+        """
+        if self.live_hours is None:
+            return
+        now = int(local_hour(self._clock()))
+        with self._lock:
+            last, self._hour = self._hour, now
+            if last is None or now <= last:
+                return
+            # Lost: last - L + W < target <= now - L + W; none past last + 1 were live
+            first = last - self.live_hours + WINDOW + 1
+            end = min(now - self.live_hours + WINDOW, last + 1) + 1
+            zones = {key[0] for key in self._curves} | {key[0] for key in self._outlooks}
+            for target in range(first, end):
+                for zone_id in zones:
+                    self._mark(zone_id, target)
+
+    def refresh(self):
+        """Re-predict every dirty hour and outlook in one batch each."""
+        self._roll()
+        with self._lock:
+            # Pending keys stay dirty until their first prediction is stored;
+            # keys evicted since they were marked are dropped
+            dirty_hours = {key: hours for key, hours in self._dirty_hours.items() if key in self._curves}
+            self._dirty_hours = {key: hours for key, hours in self._dirty_hours.items() if key in self._pending}
+            dirty_outlooks = {key: rev for key, rev in self._dirty_outlooks.items() if key in self._outlooks}
+            self._dirty_outlooks = {key: rev for key, rev in self._dirty_outlooks.items() if key in self._pending}
+        # Refreshes may finish out of order: only results newer than the
+        # applied revision are patched in
+        if dirty_hours:
+            requests = [(zone_id, day, hour) for (zone_id, day), hours in dirty_hours.items()
+                        for hour in sorted(hours)]
+            values = self._predict_many(requests)
+            with self._lock:
+                for (zone_id, day, hour), value in zip(requests, values):
+                    revision = dirty_hours[(zone_id, day)][hour]
+                    curve = self._curves.get((zone_id, day))
+                    applied = self._applied.get((zone_id, day))
+                    if curve is not None and revision > applied[hour]:
+                        curve[hour] = np.nan if value is None else value
+                        applied[hour] = revision
+            self.predicted += len(requests)
+        if dirty_outlooks:
+            requests = sorted(dirty_outlooks)
+            values = self._predict_horizon(requests, self.steps)
+            with self._lock:
+                for key, value in zip(requests, values):
+                    if key in self._outlooks and dirty_outlooks[key] > self._applied[key]:
+                        self._outlooks[key] = value
+                        self._applied[key] = dirty_outlooks[key]
+            self.predicted += len(requests) * self.steps
+
+    # ---------------------------------------------------
+    # Reads
+    # ---------------------------------------------------
+
+    def _expire(self):
+        if self.max_age is None:
+            return
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            for key in [k for k, stamp in self._stamps.items() if stamp < cutoff]:
+                del self._stamps[key]
+                self._applied.pop(key, None)
+                self._curves.pop(key, None)
+                self._outlooks.pop(key, None)
+
+    def _claim(self, keys, cache):
+        """
+        Split `keys` into ones this caller must predict (now registered as
+        pending, so invalidations during the prediction are kept) and
+        Events to wait on for keys another thread is predicting.
+        """
+        mine, waits = [], []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in cache:
+                    continue
+                if key in self._pending:
+                    waits.append(self._pending[key])
+                else:
+                    self._pending[key] = threading.Event()
+                    self._claimed[key] = self._revision
+                    mine.append(key)
+        return mine, waits
+
+    def _store(self, cache, limit, items, hours=None):
+        """
+        Insert first predictions and evict past `limit`; waiters are released
+        after. They reflect every mark made before they were claimed (per
+        hour when `hours` is given).
+        """
+        with self._lock:
+            for key, value in items:
+                cache[key] = value
+                claimed = self._claimed[key]
+                self._applied[key] = claimed if hours is None else np.full(hours, claimed)
+                self._stamps[key] = time.monotonic()
+            while len(cache) > limit:
+                key, _ = cache.popitem(last=False)
+                self._applied.pop(key, None)
+                self._stamps.pop(key, None)
+
+    def _release(self, keys):
+        with self._lock:
+            for key in keys:
+                event = self._pending.pop(key, None)
+                self._claimed.pop(key, None)
+                if event is not None:
+                    event.set()
+
+    def curves(self, zone_ids, day):
+        """24-hour curves for several zones (heatmap rows); missing rows share one batch."""
+        self._expire()
+        self.refresh()
+        keys = [(zone_id, day) for zone_id in zone_ids]
+        mine, waits = self._claim(keys, self._curves)
+        if mine:
+            try:
+                requests = [(zone_id, day, hour) for zone_id, _ in mine for hour in range(self.hours)]
+                values = np.array([np.nan if v is None else v for v in self._predict_many(requests)],
+                                  dtype=float).reshape(len(mine), self.hours)
+                self._store(self._curves, self.max_curves, zip(mine, values), self.hours)
+            finally:
+                self._release(mine)
+            self.predicted += len(requests)
+        for event in waits:
+            event.wait()
+        # Apply invalidations that arrived while the new rows were predicted
+        self.refresh()
+        rows = {}
+        with self._lock:
+            for key in keys:
+                if key in self._curves:
+                    self._curves.move_to_end(key)
+                    rows[key] = self._curves[key].copy()
+        missing = [key for key in dict.fromkeys(keys) if key not in rows]
+        if missing:
+            # Evicted, or another thread's prediction failed: predict without caching
+            requests = [key + (hour,) for key in missing for hour in range(self.hours)]
+            values = np.array([np.nan if v is None else v for v in self._predict_many(requests)], dtype=float)
+            rows.update(zip(missing, values.reshape(len(missing), self.hours)))
+        return np.stack([rows[key] for key in keys])
+
+    def curve(self, zone_id, day):
+        return self.curves([zone_id], day)[0]
+
+    def outlook(self, zone_id, day, hour):
+        """Next `steps` hours from the arrival hour, or None without history."""
+        self._expire()
+        self.refresh()
+        key = (zone_id, day, hour)
+        mine, waits = self._claim([key], self._outlooks)
+        if mine:
+            try:
+                value = self._predict_horizon([key], self.steps)[0]
+                self._store(self._outlooks, self.max_outlooks, [(key, value)])
+            finally:
+                self._release(mine)
+            self.predicted += self.steps
+        for event in waits:
+            event.wait()
+        self.refresh()
+        with self._lock:
+            if key in self._outlooks:
+                self._outlooks.move_to_end(key)
+                return self._outlooks[key]
+        return self._predict_horizon([key], self.steps)[0]
@@ -0,0 +1,175 @@
+# forecast_table.py
+#
+# Precomputed forecasts for every zone x day x hour.
+# The table is keyed by a hash of the dataset and model files, so the
+# nightly job only rebuilds it when either of them changes:
+#
+#   0 2 * * *  cd /path/to/SpotMate && python forecast_table.py
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from occupancy_index import HOURS_PER_DAY
+from zone_registry import zone_row
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+SEQUENCE_LENGTH = 3
+
+# Bumped when the table layout or contents change for the same inputs
+# (2: hours 0-2 forecast from the previous day's last hours)
+TABLE_FORMAT = 2
+
+
+# ---------------------------------------------------
+# Versioning — hash of dataset + model
+# ---------------------------------------------------
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file (or of every file in a directory), read in chunks."""
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.relpath(os.path.join(root, name), path)
+            for root, _, names in os.walk(path) for name in names
+        )
+    else:
+        files = [None]
+
+    digest = hashlib.sha256()
+    for name in files:
+        if name is not None:
+            digest.update(name.replace(os.sep, "/").encode())
+        with open(path if name is None else os.path.join(path, name), "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_key(dataset_path, model_path):
+    """Short key that changes whenever the dataset, model or table format changes."""
+    combined = f"{TABLE_FORMAT}:" + file_digest(dataset_path) + file_digest(model_path)
+    return hashlib.sha256(combined.encode()).hexdigest()[:16]
+
+
+def table_path(key, out_dir=DATA_DIR):
+    return os.path.join(out_dir, f"forecast_table_{key}.npz")
+
+
+# ---------------------------------------------------
+# Table
+# ---------------------------------------------------
+
+class ForecastTable:
+    """
+    Forecasts stored as a float32 [zone, day, hour] array (NaN = no forecast).
+    A cyclic table wraps days the same way as the cyclic OccupancyIndex it
+    was built from.
+    """
+
+    def __init__(self, zone_ids, first_day, forecasts, cyclic=False):
+        self.zone_ids = list(zone_ids)
+        self.zone_pos = {zone_id: i for i, zone_id in enumerate(self.zone_ids)}
+        self.first_day = int(first_day)
+        self.forecasts = forecasts
+        self.cyclic = cyclic
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            cyclic = bool(data["cyclic"]) if "cyclic" in data.files else False
+            return cls(data["zone_ids"].tolist(), int(data["first_day"]), data["forecasts"], cyclic)
+
+    def save(self, path):
+        np.savez(
+            path,
+            zone_ids=np.asarray(self.zone_ids, dtype=str),
+            first_day=np.int64(self.first_day),
+            forecasts=self.forecasts,
+            cyclic=np.bool_(self.cyclic),
+        )
+
+    def _day_offset(self, day):
+        d = int(day) - self.first_day
+        if self.cyclic and self.forecasts.shape[1]:
+            d %= self.forecasts.shape[1]
+        return d
+
+    def covers(self, zone_id, day):
+        return (zone_row(zone_id, self.zone_pos, len(self.zone_ids)) is not None
+                and 0 <= self._day_offset(day) < self.forecasts.shape[1])
+
+    def lookup(self, zone_id, day, hour_24):
+        """Return the stored forecast, or None if none could be made."""
+        if not self.covers(zone_id, day) or not 0 <= hour_24 < HOURS_PER_DAY:
+            return None
+        z = zone_row(zone_id, self.zone_pos, len(self.zone_ids))
+        value = self.forecasts[z, self._day_offset(day), hour_24]
+        return None if np.isnan(value) else round(float(value), 2)
+
+
+def build_forecast_table(index, model):
+    """Predict every zone x day x hour of an OccupancyIndex in one batch."""
+    n_zones, n_days, _ = index.values.shape
+    forecasts = np.full((n_zones, n_days * HOURS_PER_DAY), np.nan, dtype=np.float32)
+
+    # Hours as one timeline per zone, led by the SEQUENCE_LENGTH hours that
+    # precede the first day (the last day's tail when cyclic, else missing),
+    # so the window for every hour including 0-2 is one sliding-window row
+    flat_values = index.values.reshape(n_zones, -1)
+    flat_mask = index.mask.reshape(n_zones, -1)
+    if index.cyclic and n_days:
+        lead_values = index.values[:, -1, -SEQUENCE_LENGTH:]
+        lead_mask = index.mask[:, -1, -SEQUENCE_LENGTH:]
+    else:
+        lead_values = np.zeros((n_zones, SEQUENCE_LENGTH), dtype=index.values.dtype)
+        lead_mask = np.zeros((n_zones, SEQUENCE_LENGTH), dtype=bool)
+    timeline = np.concatenate([lead_values, flat_values], axis=1)
+    timeline_mask = np.concatenate([lead_mask, flat_mask], axis=1)
+
+    windows = sliding_window_view(timeline, SEQUENCE_LENGTH, axis=1)[:, :-1]
+    valid = sliding_window_view(timeline_mask, SEQUENCE_LENGTH, axis=1)[:, :-1].all(axis=-1)
+
+    X = windows[valid]
+    if len(X):
+        predictions = model.predict(X.reshape(-1, SEQUENCE_LENGTH, 1) / 100.0, batch_size=len(X), verbose=0)
+        forecasts[valid] = np.round(predictions[:, 0] * 100, 2)
+
+    return ForecastTable(index.zone_ids, index.first_day,
+                         forecasts.reshape(n_zones, n_days, HOURS_PER_DAY), index.cyclic)
+
+
+def materialize(dataset_path, model_path, index, model, out_dir=DATA_DIR, force=False):
+    """
+    Build and save the table for the current dataset + model unless it
+    already exists. Older tables are removed. Returns the table path.
+    """
+    path = table_path(table_key(dataset_path, model_path), out_dir)
+    if os.path.isfile(path) and not force:
+        return path
+
+    build_forecast_table(index, model).save(path)
+
+    for old in glob.glob(os.path.join(out_dir, "forecast_table_*.npz")):
+        if old != path:
+            os.remove(old)
+    return path
+
+
+if __name__ == "__main__":
+    import sys
+    from backend_predictor import (
+        dataset_source_path, serving_model_path, load_occupancy_index, load_inference_model
+    )
+
+    force = "--force" in sys.argv
+    path = materialize(
+        dataset_source_path(), serving_model_path(),
+        load_occupancy_index(), load_inference_model(),
+        force=force,
+    )
+    print("Forecast table ready:", path)
@@ -0,0 +1,59 @@
+# gate_verify.py
+#
+# Offline entry-gate verification of signed QR tickets.
+#
+# Verify scanned codes (one per line on stdin):
+#   python gate_verify.py [--spot 1001] < scans.txt
+# Measure batch throughput:
+#   python gate_verify.py --benchmark 100000
+
+import argparse
+import datetime as dt
+import sys
+import time
+
+from ticket_codec import TicketError, TicketVerifier, load_key, sign_ticket
+
+
+def verify_many(verifier, codes, now=None, spot_number=None):
+    """Verify a batch at one clock reading; returns (ticket or None, reason) per code."""
+    now = dt.datetime.now().timestamp() if now is None else now
+    results = []
+    for code in codes:
+        try:
+            results.append((verifier.verify(code, now=now, spot_number=spot_number), "ok"))
+        except TicketError as e:
+            results.append((None, str(e)))
+    return results
+
+
+def benchmark(n, key=b"benchmark-key"):
+    """Sign n tickets, verify them as one batch; returns tickets per second."""
+    start = dt.datetime.now()
+    codes = [sign_ticket(key, 5001 + i, 1000 + i % 50, start, 4) for i in range(n)]
+    verifier = TicketVerifier(key)
+    t0 = time.perf_counter()
+    results = verify_many(verifier, codes)
+    elapsed = time.perf_counter() - t0
+    assert all(ticket is not None for ticket, _ in results)
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify scanned QR entry tickets offline.")
+    parser.add_argument("--spot", type=int, help="only admit tickets for this spot number")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="verify N synthetic tickets and report throughput")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"{benchmark(args.benchmark):,.0f} tickets/s")
+        return
+
+    verifier = TicketVerifier(load_key())
+    codes = [line.strip() for line in sys.stdin if line.strip()]
+    for code, (ticket, reason) in zip(codes, verify_many(verifier, codes, spot_number=args.spot)):
+        print(f"ADMIT {ticket.booking_id} spot {ticket.spot_number}" if ticket else f"DENY  {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# gazetteer.py
+#
+# Offline place lookup: a file of locality names with coordinates,
+# indexed with an Aho–Corasick automaton (every known name inside a
+# query, in one pass) plus a trigram index for typo-tolerant matches.
+
+import csv
+import math
+import os
+import re
+import threading
+from collections import deque
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_PATH = os.path.join(BASE_DIR, "data", "gazetteer.csv")
+
+# Specific areas win over the city they sit in ("MG Road Bangalore")
+KIND_RANK = {"area": 0, "place": 1, "city": 2}
+FUZZY_THRESHOLD = 0.7
+
+# Words shared by countless places; fuzzy matching ignores them so
+# "Ring Road" cannot land on "MG Road" or "Old City" on "Cyber City"
+GENERIC_WORDS = frozenset({
+    "road", "rd", "street", "st", "main", "cross", "marg", "lane", "city", "town",
+    "nagar", "new", "old", "station", "mall", "layout", "colony", "sector", "phase",
+    "area", "near", "the", "parking", "east", "west", "north", "south",
+})
+
+
+def normalize(text):
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+
+def core(text):
+    """Normalized text without generic words: the part worth fuzzy-matching."""
+    return " ".join(w for w in normalize(text).split() if w not in GENERIC_WORDS)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """Name -> (lat, lon) index with substring, prefix and fuzzy lookups."""
+
+    def __init__(self, entries=()):
+        self.places = {}            # normalized name -> (lat, lon, kind)
+        self._goto = [{}]           # trie edges per node
+        self._fail = [0]
+        self._ends = [None]         # name ending exactly at each node
+        self._out = [[]]            # names ending at each node, incl. via fail links
+        self._grams = {}            # name -> its trigrams
+        self._trigram_index = {}    # trigram -> set of names
+        self._dirty = False
+        self._lock = threading.Lock()
+        for name, lat, lon, kind in entries:
+            self.add(name, lat, lon, kind)
+        self._build_links()         # eagerly: instances are shared across sessions
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = csv.DictReader(f)
+            return cls((r["name"], float(r["lat"]), float(r["lon"]), r.get("kind") or "place") for r in rows)
+
+    def __len__(self):
+        return len(self.places)
+
+    # ---------------------------------------------------
+    # Building
+    # ---------------------------------------------------
+
+    def add(self, name, lat, lon, kind="place"):
+        """Add (or update) a place; the automaton is rebuilt on next lookup."""
+        name = normalize(name)
+        if not name:
+            return
+        with self._lock:
+            self._add(name, lat, lon, kind)
+
+    def _add(self, name, lat, lon, kind):
+        if name not in self.places:
+            node = 0
+            for ch in name:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._ends.append(None)
+                node = nxt
+            self._ends[node] = name
+            if core(name):
+                self._grams[name] = _trigrams(core(name))
+                for gram in self._grams[name]:
+                    self._trigram_index.setdefault(gram, set()).add(name)
+            self._dirty = True
+        self.places[name] = (lat, lon, kind)
+
+    def _build_links(self):
+        """Breadth-first failure links; merge outputs along them."""
+        outputs = [[name] if name else [] for name in self._ends]
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child] = outputs[child] + outputs[self._fail[child]]
+                queue.append(child)
+        self._out = outputs
+        self._dirty = False
+
+    # ---------------------------------------------------
+    # Lookups
+    # ---------------------------------------------------
+
+    def find_all(self, query):
+        """Every known name appearing as whole words in the query."""
+        if self._dirty:
+            with self._lock:
+                if self._dirty:     # another thread may have rebuilt meanwhile
+                    self._build_links()
+        text = normalize(query)
+        found = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for name in self._out[node]:
+                start = i - len(name) + 1
+                if (start == 0 or text[start - 1] == " ") and (i + 1 == len(text) or text[i + 1] == " "):
+                    found.append(name)
+        return found
+
+    def fuzzy(self, query, threshold=FUZZY_THRESHOLD):
+        """
+        Closest name to the whole query, typos allowed (trigram Dice score
+        over the non-generic words of both, lengths within a quarter).
+        A name scoring >= threshold must share `need` trigrams with the
+        query, so it appears in at least one of the rarest
+        len(grams) - need + 1 posting lists; only those are scanned.
+        """
+        text = core(query)
+        if not text:
+            return None
+        grams = _trigrams(text)
+        slack = max(2, len(text) // 4)
+        need = math.ceil(threshold * len(grams) / (2 - threshold))
+        postings = sorted((self._trigram_index.get(g, ()) for g in grams), key=len)
+        best, best_score = None, threshold
+        for name in set().union(*postings[:len(grams) - need + 1]):
+            if abs(len(core(name)) - len(text)) > slack:
+                continue
+            other = self._grams[name]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score:
+                best, best_score = name, score
+        return best
+
+    def lookup(self, query):
+        """
+        Resolve a free-text query to (lat, lon), or None.
+        Exact word matches first (most specific kind, then longest name);
+        a misspelt area still beats an exactly spelt city. Only the whole
+        query (minus any matched city) is fuzzy-matched, so unknown places
+        fall through to None rather than to a similar-looking span.
+        """
+        rank = lambda n: (KIND_RANK.get(self.places[n][2], 1), -len(n))
+        matches = self.find_all(query)
+        name = min(matches, key=rank) if matches else None
+        if name is None or self.places[name][2] == "city":
+            rest = f" {normalize(query)} "
+            for city in matches:
+                rest = rest.replace(f" {city} ", " ")
+            close = self.fuzzy(rest)
+            if close is not None and (name is None or rank(close) < rank(name)):
+                name = close
+        if name is None:
+            return None
+        lat, lon, _ = self.places[name]
+        return lat, lon
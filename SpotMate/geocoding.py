@@ -0,0 +1,156 @@
+# geocoding.py
+#
+# Geocoding client for Nominatim (OpenStreetMap):
+# - one pooled requests.Session per process
+# - identical in-flight queries share one HTTP request
+# - requests are spaced out to respect the service's rate limit
+# - results persist in a SQLite cache keyed by normalized query
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+CACHE_PATH = os.environ.get("SPOTMATE_GEOCODE_CACHE", os.path.join(BASE_DIR, "data", "geocode_cache.db"))
+
+HIT_TTL = 30 * 24 * 3600   # found places rarely move
+MISS_TTL = 24 * 3600       # retry unknown places daily
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+class Geocoder:
+    """Thread-safe, cached, rate-limited geocoder."""
+
+    def __init__(self, base_url=NOMINATIM_URL, cache_path=CACHE_PATH, min_interval=1.0,
+                 timeout=5, max_workers=2):
+        self.base_url = base_url
+        self.min_interval = min_interval
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "SpotMate"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geocode")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0
+
+        self._db = sqlite3.connect(cache_path, timeout=10, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS geocode (
+                    query TEXT PRIMARY KEY,
+                    lat REAL,
+                    lon REAL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+
+    # ---------------------------------------------------
+    # Persistent cache
+    # ---------------------------------------------------
+
+    def cached(self, query):
+        """Return (found, (lat, lon)) from the disk cache without any network."""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT lat, lon FROM geocode WHERE query = ? AND expires_at > ?",
+                (normalize_query(query), time.time()),
+            ).fetchone()
+        if row is None:
+            return False, (None, None)
+        return True, (row[0], row[1])
+
+    def known_places(self):
+        """All unexpired successful lookups as (query, lat, lon)."""
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT query, lat, lon FROM geocode WHERE lat IS NOT NULL AND expires_at > ?",
+                (time.time(),),
+            ).fetchall()
+
+    def _store(self, key, lat, lon):
+        ttl = HIT_TTL if lat is not None else MISS_TTL
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                (key, lat, lon, time.time() + ttl),
+            )
+
+    # ---------------------------------------------------
+    # Network
+    # ---------------------------------------------------
+
+    def _wait_for_slot(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        time.sleep(max(0.0, slot - now))
+
+    def _fetch(self, key):
+        try:
+            self._wait_for_slot()
+            r = self.session.get(
+                self.base_url,
+                params={"q": key, "format": "json", "limit": 1},
+                timeout=self.timeout,
+            )
+            if r.status_code != 200:
+                return None, None
+            results = r.json()
+            lat, lon = (float(results[0]["lat"]), float(results[0]["lon"])) if results else (None, None)
+            self._store(key, lat, lon)
+            return lat, lon
+        except (requests.RequestException, ValueError, KeyError, IndexError):
+            # Network trouble is not cached; the next call retries
+            return None, None
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def submit(self, query):
+        """Start (or join) a lookup; returns a Future of (lat, lon)."""
+        key = normalize_query(query)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, key)
+                self._inflight[key] = future
+            return future
+
+    def is_pending(self, query):
+        with self._lock:
+            return normalize_query(query) in self._inflight
+
+    def geocode(self, query, wait=None):
+        """
+        Geocode `query`. Waits at most `wait` seconds (None = until done);
+        if the lookup is still running, returns (None, None) and the result
+        lands in the cache for the next call.
+        """
+        if not query or not query.strip():
+            return None, None
+        found, coords = self.cached(query)
+        if found:
+            return coords
+        try:
+            return self.submit(query).result(timeout=wait)
+        except FutureTimeout:
+            return None, None
@@ -0,0 +1,336 @@
+# live_occupancy.py
+#
+# Live occupancy ingestion. Events (zone_id, unix timestamp, occupancy %)
+# are folded into hourly means kept in a fixed-size ring buffer per zone.
+# Every slot is written twice (at s and s + capacity), so the window of
+# recent hours ending at any slot is one contiguous slice, copied straight
+# into the model batch without wrap-around handling.
+#
+# Sources (any mix): LiveIngestor.put() from the app, a tailed file and a
+# UDP socket, both carrying one "zone_id,timestamp,occupancy" per line.
+
+import calendar
+import datetime as dt
+import json
+import logging
+import math
+import os
+import queue
+import socket
+import threading
+import time
+
+import numpy as np
+
+from zone_registry import zone_row
+
+LIVE_HOURS = int(os.environ.get("SPOTMATE_LIVE_HOURS", "48"))
+BATCH_SIZE = 4096
+FLUSH_INTERVAL = 0.05       # seconds a partial batch may wait
+
+log = logging.getLogger(__name__)
+
+
+def local_hour(timestamps):
+    """Local wall-clock hour number(s) since the epoch for unix timestamps."""
+    ts = np.asarray(timestamps, dtype=np.float64)
+    offset = time.localtime(float(ts.max()) if ts.size else time.time()).tm_gmtoff
+    return ((ts + offset) // 3600).astype(np.int64)
+
+
+def make_event(zone_id, timestamp, occupancy):
+    """(zone_id, timestamp, occupancy) with finite floats; ValueError otherwise."""
+    timestamp, occupancy = float(timestamp), float(occupancy)
+    if not (math.isfinite(timestamp) and math.isfinite(occupancy)):
+        raise ValueError(f"non-finite live event for {zone_id!r}")
+    return zone_id, timestamp, occupancy
+
+
+def parse_event(line):
+    """'Z1,1760000000,42.5' or {"zone_id": ..., "timestamp": ..., "occupancy": ...}."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        record = json.loads(line)
+        return make_event(str(record["zone_id"]), record["timestamp"], record["occupancy"])
+    zone_id, timestamp, occupancy = line.split(",")
+    return make_event(zone_id.strip(), timestamp, occupancy)
+
+
+# ---------------------------------------------------
+# Ring buffers of hourly aggregates
+# ---------------------------------------------------
+
+class LiveOccupancy:
+    """Per-zone ring buffers of hourly mean occupancy for the last `hours` hours."""
+
+    def __init__(self, zone_ids, hours=LIVE_HOURS):
+        self.zone_ids = list(zone_ids)
+        self.zone_pos = {zone_id: i for i, zone_id in enumerate(self.zone_ids)}
+        self.capacity = hours
+        n = len(self.zone_ids)
+        self._sums = np.zeros((n, hours), dtype=np.float64)
+        self._counts = np.zeros((n, hours), dtype=np.int64)
+        self._stamps = np.full((n, hours), -1, dtype=np.int64)     # hour held by each slot
+        self._means = np.zeros((n, 2 * hours), dtype=np.float32)   # doubled for wrap-free views
+        self._valid = np.zeros((n, 2 * hours), dtype=bool)
+        self.revisions = np.zeros(n, dtype=np.int64)               # bumps when a zone changes
+        self.events = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Call `callback([(zone_id, hour_number), ...])` after each batch with the hours it changed."""
+        self._listeners.append(callback)
+
+    def ingest(self, zone_ids, timestamps, occupancy):
+        """Fold a batch of events in; unknown zones and expired hours are dropped."""
+        rows = (zone_row(z, self.zone_pos, len(self.zone_ids)) for z in zone_ids)
+        zones = np.fromiter((-1 if z is None else z for z in rows), dtype=np.int64)
+        hours = local_hour(timestamps)
+        values = np.asarray(occupancy, dtype=np.float64)
+        known = zones >= 0
+        zones, hours, values = zones[known], hours[known], values[known]
+        if not len(zones):
+            return 0
+
+        slots = hours % self.capacity
+        with self._lock:
+            # A newer hour claims its slot: reset the slot before adding
+            newest = np.full(self._stamps.shape, -1, dtype=np.int64)
+            np.maximum.at(newest, (zones, slots), hours)
+            claim = newest > self._stamps
+            self._stamps[claim] = newest[claim]
+            self._sums[claim] = 0.0
+            self._counts[claim] = 0
+
+            current = hours == self._stamps[zones, slots]
+            zones, slots, values = zones[current], slots[current], values[current]
+            np.add.at(self._sums, (zones, slots), values)
+            np.add.at(self._counts, (zones, slots), 1)
+
+            touched = np.unique(zones * self.capacity + slots)
+            tz, ts = touched // self.capacity, touched % self.capacity
+            means = (self._sums[tz, ts] / self._counts[tz, ts]).astype(np.float32)
+            for offset in (0, self.capacity):
+                self._means[tz, ts + offset] = means
+                self._valid[tz, ts + offset] = True
+            stale = claim & (self._counts == 0)
+            if stale.any():
+                sz, ss = np.nonzero(stale)
+                self._valid[sz, ss] = self._valid[sz, ss + self.capacity] = False
+
+            np.add.at(self.revisions, np.unique(tz), 1)
+            self.events += len(zones)
+            changed = [(self.zone_ids[z], int(h)) for z, h in zip(tz, self._stamps[tz, ts])]
+
+        for callback in self._listeners:
+            try:
+                callback(changed)
+            except Exception:
+                log.exception("live occupancy listener failed")
+        return len(zones)
+
+    def add(self, zone_id, timestamp, occupancy):
+        return self.ingest([zone_id], [timestamp], [occupancy])
+
+    def _window_start(self, z, end_hour, length, now_hour):
+        """Start of the window in the doubled row, or None (caller holds the lock)."""
+        if end_hour - length <= now_hour - self.capacity:
+            return None                                         # older than the buffer keeps
+        hours = np.arange(end_hour - length, end_hour)
+        slots = hours % self.capacity
+        if not (self._stamps[z, slots] == hours).all():
+            return None
+        start = int(slots[-1]) + 1 + self.capacity - length    # never wraps in the doubled row
+        if not self._valid[z, start:start + length].all():
+            return None
+        return start
+
+    def window_at(self, zone_id, end_hour, length=3, now_hour=None):
+        """
+        Hourly means for the `length` hours before local hour number
+        `end_hour` (a copy taken under the lock), or None if any hour is
+        missing or has aged out of the buffer.
+        """
+        z = zone_row(zone_id, self.zone_pos, len(self.zone_ids))
+        if z is None or not 0 < length <= self.capacity:
+            return None
+        now_hour = int(local_hour(time.time())) if now_hour is None else now_hour
+        with self._lock:
+            start = self._window_start(z, end_hour, length, now_hour)
+            return None if start is None else self._means[z, start:start + length].copy()
+
+    @staticmethod
+    def target_hour(day, hour_24, now):
+        """Local hour number of (day-of-month, hour) in `now`'s month, or None."""
+        try:
+            target = now.replace(day=int(day), hour=int(hour_24) % 24, minute=0, second=0, microsecond=0)
+        except ValueError:
+            return None
+        if int(hour_24) == 24:
+            target += dt.timedelta(hours=24)
+        return calendar.timegm(target.timetuple()) // 3600
+
+    def window(self, zone_id, day, hour_24, length=3, now=None):
+        """
+        Live window for a (zone, day-of-month, hour) request in the current
+        month, or None when those hours are not in the buffer.
+        """
+        now = dt.datetime.now() if now is None else now
+        end_hour = self.target_hour(day, hour_24, now)
+        if end_hour is None:
+            return None
+        return self.window_at(zone_id, end_hour, length, calendar.timegm(now.timetuple()) // 3600)
+
+    def windows(self, requests, length=3, now=None):
+        """
+        Live windows for many (zone_id, day, hour_24) tuples, like
+        OccupancyIndex.windows. Each window is one contiguous slice copied
+        straight into the batch, all under one hold of the lock.
+        """
+        now = dt.datetime.now() if now is None else now
+        now_hour = calendar.timegm(now.timetuple()) // 3600
+        n = len(self.zone_ids)
+        targets = [(i, zone_row(zone_id, self.zone_pos, n), self.target_hour(day, hour_24, now))
+                   for i, (zone_id, day, hour_24) in enumerate(requests)]
+        targets = [(i, z, end) for i, z, end in targets if z is not None and end is not None]
+
+        out = np.empty((len(targets), length), dtype=np.float32)
+        positions = []
+        if not 0 < length <= self.capacity:
+            return out[:0], positions
+        with self._lock:
+            for i, z, end_hour in targets:
+                start = self._window_start(z, end_hour, length, now_hour)
+                if start is not None:
+                    out[len(positions)] = self._means[z, start:start + length]
+                    positions.append(i)
+        return out[:len(positions)], positions
+
+
+# ---------------------------------------------------
+# Ingestion: a queue drained in batches, fed by any source
+# ---------------------------------------------------
+
+class LiveIngestor:
+    """Background thread that batches queued events into a LiveOccupancy."""
+
+    def __init__(self, live, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.live = live
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._drain, name="live-ingest", daemon=True)]
+        self._threads[0].start()
+
+    def put(self, zone_id, timestamp, occupancy):
+        """Queue one event; raises ValueError for a non-numeric or non-finite value."""
+        self._queue.put(make_event(zone_id, timestamp, occupancy))
+
+    def put_line(self, line):
+        try:
+            event = parse_event(line)
+        except (ValueError, KeyError):
+            return
+        if event is not None:
+            self._queue.put(event)
+
+    def _drain(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._ingest(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _ingest(self, batch):
+        """Ingest a batch; if it fails, retry row by row and drop the bad rows."""
+        try:
+            self.live.ingest(*zip(*batch))
+            return
+        except Exception:
+            log.exception("live batch of %d events failed; retrying per event", len(batch))
+        for event in batch:
+            try:
+                self.live.ingest(*zip(event))
+            except Exception:
+                log.warning("dropping live event %r", event)
+
+    def flush(self):
+        """Block until every queued event has been ingested."""
+        self._queue.join()
+
+    def follow_file(self, path, from_start=False, poll=0.2):
+        """
+        Tail `path` (like tail -F) in a daemon thread: a rotated or
+        truncated file is reopened and read from its start.
+        """
+        def rotated(f):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return False                # mid-rotation; keep the old handle for now
+            return st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell()
+
+        def run():
+            at_end = not from_start
+            while not self._stop.is_set():
+                if not os.path.exists(path):
+                    time.sleep(poll)
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    if at_end:
+                        f.seek(0, os.SEEK_END)
+                    at_end = False          # files that replace it are read in full
+                    partial = ""
+                    while not self._stop.is_set():
+                        chunk = f.readline()
+                        if not chunk:
+                            if rotated(f):
+                                break
+                            time.sleep(poll)
+                            continue
+                        partial += chunk
+                        if partial.endswith("\n"):
+                            self.put_line(partial)
+                            partial = ""
+        self._start(run, "live-file")
+
+    def listen_udp(self, host="127.0.0.1", port=8766):
+        """Accept newline-separated events in UDP datagrams; returns the bound port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        sock.settimeout(0.2)
+
+        def run():
+            with sock:
+                while not self._stop.is_set():
+                    try:
+                        data = sock.recv(65536)
+                    except socket.timeout:
+                        continue
+                    for line in data.decode("utf-8", "replace").splitlines():
+                        self.put_line(line)
+        self._start(run, "live-udp")
+        return sock.getsockname()[1]
+
+    def _start(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
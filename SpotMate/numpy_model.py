@@ -0,0 +1,125 @@
+# numpy_model.py
+#
+# Pure-NumPy inference for the CNN-LSTM parking model.
+# Export once (needs TensorFlow):   python numpy_model.py
+# Serve without TensorFlow:         NumpyCNNLSTM.load(NPZ_PATH).predict(X)
+
+import os
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+KERAS_PATH = os.path.join(DATA_DIR, "cnn_lstm_parking_model.keras")
+NPZ_PATH = os.path.join(DATA_DIR, "cnn_lstm_parking_model.npz")
+
+# Max absolute difference allowed between NumPy and Keras outputs
+TOLERANCE = 1e-5
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+# ---------------------------------------------------
+# Forward pass: Conv1D(relu) -> LSTM -> Dense
+# ---------------------------------------------------
+
+class NumpyCNNLSTM:
+    """NumPy re-implementation of the trained Conv1D/LSTM/Dense stack."""
+
+    def __init__(self, weights):
+        self.conv_kernel = weights["conv_kernel"]        # (k, in, filters)
+        self.conv_bias = weights["conv_bias"]            # (filters,)
+        self.lstm_kernel = weights["lstm_kernel"]        # (filters, 4 * units)
+        self.lstm_recurrent = weights["lstm_recurrent"]  # (units, 4 * units)
+        self.lstm_bias = weights["lstm_bias"]            # (4 * units,)
+        self.dense_kernel = weights["dense_kernel"]      # (units, 1)
+        self.dense_bias = weights["dense_bias"]          # (1,)
+        self.units = self.lstm_recurrent.shape[0]
+
+    @classmethod
+    def load(cls, path=NPZ_PATH):
+        with np.load(path) as weights:
+            return cls({name: weights[name].astype(np.float32) for name in weights.files})
+
+    def _conv1d(self, X):
+        """Valid-padded, stride-1 Conv1D with ReLU. X: (N, T, in)."""
+        k = self.conv_kernel.shape[0]
+        steps = X.shape[1] - k + 1
+        out = np.broadcast_to(self.conv_bias, (X.shape[0], steps, self.conv_bias.shape[0])).copy()
+        for j in range(k):
+            out += X[:, j:j + steps, :] @ self.conv_kernel[j]
+        return np.maximum(out, 0.0)
+
+    def _lstm(self, X):
+        """Keras LSTM (gate order i, f, c, o), returning the last hidden state."""
+        n, steps, _ = X.shape
+        u = self.units
+        h = np.zeros((n, u), dtype=np.float32)
+        c = np.zeros((n, u), dtype=np.float32)
+
+        # Input projections for every timestep in one matmul
+        x_proj = X @ self.lstm_kernel + self.lstm_bias
+
+        for t in range(steps):
+            z = x_proj[:, t, :] + h @ self.lstm_recurrent
+            i = _sigmoid(z[:, :u])
+            f = _sigmoid(z[:, u:2 * u])
+            g = np.tanh(z[:, 2 * u:3 * u])
+            o = _sigmoid(z[:, 3 * u:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+        return h
+
+    def predict(self, X, batch_size=None, verbose=0):
+        """Keras-compatible predict: X (N, T, 1) -> (N, 1)."""
+        X = np.asarray(X, dtype=np.float32)
+        return self._lstm(self._conv1d(X)) @ self.dense_kernel + self.dense_bias
+
+
+# ---------------------------------------------------
+# Exporter + parity check (TensorFlow only needed here)
+# ---------------------------------------------------
+
+def export_weights(keras_path=KERAS_PATH, npz_path=NPZ_PATH):
+    """Read the trained Keras weights and save them as a .npz file."""
+    from tensorflow.keras.models import load_model
+
+    model = load_model(keras_path)
+    conv, lstm, dense = model.layers
+    conv_kernel, conv_bias = conv.get_weights()
+    lstm_kernel, lstm_recurrent, lstm_bias = lstm.get_weights()
+    dense_kernel, dense_bias = dense.get_weights()
+
+    np.savez(
+        npz_path,
+        conv_kernel=conv_kernel,
+        conv_bias=conv_bias,
+        lstm_kernel=lstm_kernel,
+        lstm_recurrent=lstm_recurrent,
+        lstm_bias=lstm_bias,
+        dense_kernel=dense_kernel,
+        dense_bias=dense_bias,
+    )
+    return model
+
+
+def max_abs_error(keras_model, numpy_model, samples=1000, seed=42):
+    """Compare both models on random occupancy windows."""
+    X = np.random.default_rng(seed).random((samples, 3, 1), dtype=np.float32)
+    expected = keras_model.predict(X, verbose=0)
+    actual = numpy_model.predict(X)
+    return float(np.max(np.abs(expected - actual)))
+
+
+if __name__ == "__main__":
+    print("Exporting weights...")
+    keras_model = export_weights()
+    numpy_model = NumpyCNNLSTM.load()
+
+    error = max_abs_error(keras_model, numpy_model)
+    print(f"Saved: {NPZ_PATH}")
+    print(f"Max abs error vs Keras: {error:.2e} (tolerance {TOLERANCE:.0e})")
+    if error > TOLERANCE:
+        raise SystemExit("NumPy model does not match Keras within tolerance")
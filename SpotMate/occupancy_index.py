@@ -0,0 +1,130 @@
+# occupancy_index.py
+
+import numpy as np
+import pandas as pd
+
+from zone_registry import zone_row
+
+HOURS_PER_DAY = 24
+
+
+# ---------------------------------------------------
+# Dense [zone, day, hour] occupancy cube
+# ---------------------------------------------------
+
+class OccupancyIndex:
+    """
+    Occupancy history stored as a dense array indexed [zone, day, hour]
+    with a validity mask, so a history window is an O(1) slice instead of
+    a boolean scan over the whole dataset.
+
+    Windows may span midnight (hours 21-23 of the previous day). With
+    `cyclic=True` the days repeat like a month: day first_day + n_days is
+    first_day again, and the first day's previous day is the last one.
+    """
+
+    def __init__(self, zone_ids, first_day, values, mask, cyclic=False):
+        self.zone_ids = list(zone_ids)
+        self.zone_pos = {zone_id: i for i, zone_id in enumerate(self.zone_ids)}
+        self.first_day = int(first_day)
+        self.values = values
+        self.mask = mask
+        self.cyclic = cyclic
+
+    @classmethod
+    def from_dataframe(cls, df, cyclic=False, zone_ids=None):
+        """
+        Build the cube from a dataset with zone_id/day/hour/occupancy columns.
+        `zone_ids` fixes the row order (e.g. the zone registry's codes, so
+        row == integer zone id); zones only in the data follow, sorted.
+        Several rows for one hour (sub-hour data) are averaged.
+        """
+        if df.empty:
+            values = np.zeros((0, 0, HOURS_PER_DAY), dtype=np.float32)
+            return cls(zone_ids or [], 1, values, values.astype(bool), cyclic)
+
+        if zone_ids is None:
+            zone_codes, zone_ids = pd.factorize(df["zone_id"], sort=True)
+        else:
+            zone_ids = list(zone_ids)
+            zone_ids += sorted(set(df["zone_id"].unique()) - set(zone_ids))
+            zone_codes = pd.Categorical(df["zone_id"], categories=zone_ids).codes
+        days = df["day"].to_numpy(dtype=np.int64)
+        hours = df["hour"].to_numpy(dtype=np.int64)
+        first_day = int(days.min())
+        n_days = int(days.max()) - first_day + 1
+
+        shape = (len(zone_ids), n_days, HOURS_PER_DAY)
+        cells = np.ravel_multi_index((zone_codes, days - first_day, hours), shape)
+        size = int(np.prod(shape))
+        sums = np.bincount(cells, weights=df["occupancy"].to_numpy(dtype=np.float64), minlength=size)
+        counts = np.bincount(cells, minlength=size)
+
+        mask = (counts > 0).reshape(shape)
+        values = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        values = values.astype(np.float32).reshape(shape)
+
+        return cls(zone_ids, first_day, values, mask, cyclic)
+
+    @property
+    def n_days(self):
+        return self.values.shape[1]
+
+    def row(self, zone_id):
+        """Integer row for a zone code or id (== registry id when built from it), or None."""
+        return zone_row(zone_id, self.zone_pos, len(self.zone_ids))
+
+    def _locate(self, zone_id, day):
+        """Return (zone position, day offset) or None if outside the cube."""
+        z = self.row(zone_id)
+        d = int(day) - self.first_day
+        if self.cyclic and self.n_days:
+            d %= self.n_days
+        if z is None or not 0 <= d < self.n_days:
+            return None
+        return z, d
+
+    def window(self, zone_id, day, hour_24, length=3):
+        """
+        Return the `length` hours before hour_24 (continuing into the
+        previous day when needed), or None if any of those hours is missing.
+        A view of the cube unless the window wraps around a cyclic index.
+        """
+        loc = self._locate(zone_id, day)
+        if loc is None or not 0 <= hour_24 <= HOURS_PER_DAY or length > HOURS_PER_DAY:
+            return None
+
+        z, d = loc
+        start = d * HOURS_PER_DAY + hour_24 - length
+        if start >= 0:
+            # Days are contiguous in memory, so a [zone, day*24 + hour] view
+            # turns a window across midnight into a plain slice
+            flat_mask = self.mask.reshape(len(self.zone_ids), -1)
+            if not flat_mask[z, start:start + length].all():
+                return None
+            return self.values.reshape(len(self.zone_ids), -1)[z, start:start + length]
+
+        if not self.cyclic:
+            return None
+        spill = -start      # hours taken from the end of the last day
+        if not (self.mask[z, -1, HOURS_PER_DAY - spill:].all() and self.mask[z, 0, :hour_24].all()):
+            return None
+        return np.concatenate([self.values[z, -1, HOURS_PER_DAY - spill:], self.values[z, 0, :hour_24]])
+
+    def windows(self, requests, length=3):
+        """
+        Gather history windows for many (zone_id, day, hour_24) tuples.
+        Returns (X, positions): X has shape (N, length) and positions are
+        the indices of the requests that had a complete window.
+        """
+        rows = []
+        positions = []
+        for i, (zone_id, day, hour_24) in enumerate(requests):
+            window = self.window(zone_id, day, hour_24, length)
+            if window is not None:
+                rows.append(window)
+                positions.append(i)
+
+        if not rows:
+            return np.zeros((0, length), dtype=np.float32), positions
+        return np.stack(rows), positions
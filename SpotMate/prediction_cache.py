@@ -0,0 +1,156 @@
+# prediction_cache.py
+#
+# Process-wide prediction cache shared by every Streamlit session.
+# In-memory LRU in front of an optional SQLite file, so several worker
+# processes on one host reuse each other's predictions. Entries are tied
+# to a version string (changes with the dataset + model files); memory is cleared when it
+# changes, while rows on disk are kept per version (workers mid-upgrade
+# may still use the old one) and pruned by age and a row cap.
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+STALE_VERSION_SECONDS = 24 * 3600   # other versions' rows last this long after their last write
+MAX_DB_ROWS = 200_000
+PRUNE_EVERY = 1000                  # rows written between prunes
+
+
+def _key(key):
+    zone_id, day, hour_24 = key
+    return str(zone_id), int(day), int(hour_24)
+
+
+class PredictionCache:
+    """LRU cache of (zone_id, day, hour_24) -> predicted occupancy (or None)."""
+
+    def __init__(self, version, max_entries=4096, db_path=None, max_db_rows=MAX_DB_ROWS,
+                 stale_after=STALE_VERSION_SECONDS):
+        self.version = version
+        self.max_entries = max_entries
+        self.max_db_rows = max_db_rows
+        self.stale_after = stale_after
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._written = 0
+        if db_path:
+            self._open_db(db_path)
+
+    # ---------------------------------------------------
+    # SQLite backing (optional)
+    # ---------------------------------------------------
+
+    def _open_db(self, db_path):
+        self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # NORMAL: a power loss can only drop recent rows, which are recomputed
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(predictions)")]
+        if columns and "written" not in columns:
+            self._db.execute("DROP TABLE predictions")      # pre-pruning layout; it is only a cache
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS predictions (
+                version TEXT NOT NULL,
+                zone_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                value REAL,
+                written REAL NOT NULL,
+                PRIMARY KEY (version, zone_id, day, hour)
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS predictions_written ON predictions (written)")
+        self._prune()
+
+    def _prune(self):
+        """
+        Drop versions nobody has written for `stale_after` seconds, then the
+        oldest rows past `max_db_rows`. Never deletes another version's
+        rows just because it differs: a worker on it may still be running.
+        """
+        now = time.time()
+        self._db.execute(
+            """DELETE FROM predictions WHERE version IN (
+                SELECT version FROM predictions WHERE version != ?
+                GROUP BY version HAVING MAX(written) < ?)""",
+            (self.version, now - self.stale_after),
+        )
+        excess = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_db_rows
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM predictions WHERE rowid IN "
+                "(SELECT rowid FROM predictions ORDER BY written LIMIT ?)",
+                (excess,),
+            )
+        self._db.commit()
+        self._written = 0
+
+    def _db_get(self, key):
+        row = self._db.execute(
+            "SELECT value FROM predictions WHERE version = ? AND zone_id = ? AND day = ? AND hour = ?",
+            (self.version, *key),
+        ).fetchone()
+        return MISSING if row is None else row[0]
+
+    # ---------------------------------------------------
+    # Public API
+    # ---------------------------------------------------
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """Return a list of cached values, MISSING where not cached."""
+        with self._lock:
+            values = []
+            for key in map(_key, keys):
+                value = self._entries.get(key, MISSING)
+                if value is MISSING and self._db is not None:
+                    value = self._db_get(key)
+                    if value is not MISSING:
+                        self._remember(key, value)
+                elif value is not MISSING:
+                    self._entries.move_to_end(key)
+                values.append(value)
+            return values
+
+    def put_many(self, items, version=None):
+        """
+        Store (key, value) pairs in memory and, if enabled, on disk.
+        `version` is the one the values were computed under; if the cache
+        has moved to another version since, they are not stored at all.
+        """
+        items = [(_key(key), value) for key, value in items]
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            for key, value in items:
+                self._remember(key, value)
+            if self._db is not None and items:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)",
+                    [(self.version, *key, value, now) for key, value in items],
+                )
+                self._db.commit()
+                self._written += len(items)
+                if self._written >= PRUNE_EVERY:
+                    self._prune()
+
+    def set_version(self, version):
+        """Switch to a new dataset/model version; in-memory entries are dropped."""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,88 @@
+# prediction_client.py
+#
+# Thin client for prediction_service.py. Mirrors the backend_predictor
+# functions the app uses, so UI workers can share one model per host:
+#   SPOTMATE_PREDICTION_SERVICE=http://127.0.0.1:8765
+#   SPOTMATE_PREDICTION_SERVICE=unix:///tmp/spotmate-predict.sock
+
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlparse
+
+TIMEOUT = 10
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class PredictionClient:
+    """Keep-alive connection per thread; failures degrade to None like the backend."""
+
+    def __init__(self, url, timeout=TIMEOUT):
+        self.url = urlparse(url)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.url.scheme == "unix":
+                conn = _UnixHTTPConnection(self.url.path, self.timeout)
+            else:
+                conn = http.client.HTTPConnection(self.url.hostname, self.url.port or 80, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _call(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        headers = {} if body is None else {"Content-Type": "application/json"}
+        for attempt in range(2):        # one retry on a dropped keep-alive connection
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read())
+                if response.status != 200:
+                    raise ValueError(data.get("error", response.status))
+                return data
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+    def predict_many(self, requests):
+        requests = [[z, int(d), int(h)] for z, d, h in requests]
+        try:
+            return self._call("POST", "/predict", {"requests": requests})["predictions"]
+        except (OSError, ValueError, http.client.HTTPException):
+            return [None] * len(requests)
+
+    def predict_horizon(self, requests, steps=6):
+        requests = [[z, int(d), int(h)] for z, d, h in requests]
+        try:
+            return self._call("POST", "/horizon", {"requests": requests, "steps": steps})["forecasts"]
+        except (OSError, ValueError, http.client.HTTPException):
+            return [None] * len(requests)
+
+    def predict_parking_occupancy(self, zone_id, day, hour_24):
+        return self.predict_many([(zone_id, day, hour_24)])[0]
+
+    def predict_day_curve(self, zone_id, day, hours=24):
+        return self.predict_many([(zone_id, day, h) for h in range(hours)])
+
+    def model_status(self):
+        try:
+            return self._call("GET", "/health")["status"]
+        except (OSError, ValueError, http.client.HTTPException):
+            return "failed"
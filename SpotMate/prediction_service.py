@@ -0,0 +1,200 @@
+# prediction_service.py
+#
+# Local prediction service: one model + index per host, shared by every
+# UI worker. Concurrent requests are held for a few milliseconds by a
+# micro-batcher and answered with a single predict_many() forward pass.
+#
+#   python prediction_service.py --port 8765
+#   python prediction_service.py --socket /tmp/spotmate-predict.sock
+#
+# POST /predict  {"requests": [[zone_id, day, hour_24], ...]}
+#             -> {"predictions": [occupancy or null, ...]}
+# POST /horizon  {"requests": [...], "steps": 6}
+#             -> {"forecasts": [[next 6 hours] or null, ...]}
+# GET  /health  -> {"status": "loading" | "ready" | "failed", "version": "..."}
+
+import argparse
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_WAIT_MS = 5
+MAX_BATCH = 2048
+
+
+def normalize_requests(requests):
+    """(zone_id, day, hour_24) tuples; zone ids stay codes or dense int ids"""
+    out = []
+    for z, d, h in requests:
+        if isinstance(z, bool) or not isinstance(z, (str, int)):
+            raise TypeError(f"zone_id must be a code or an integer id, not {z!r}")
+        out.append((z, int(d), int(h)))
+    return out
+
+
+class MicroBatcher:
+    """
+    Collects submitted request lists on a queue; a single worker thread
+    drains everything that arrives within `max_wait` of the first item
+    (up to `max_batch` predictions), de-duplicates, and calls
+    `predict_fn` once for the lot.
+    """
+
+    def __init__(self, predict_fn, max_wait=MAX_WAIT_MS / 1000, max_batch=MAX_BATCH):
+        self.predict_fn = predict_fn
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.batches = 0            # forward passes issued (for stats / tests)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, requests):
+        """Queue a list of (zone_id, day, hour_24); returns a Future of the predictions."""
+        future = Future()
+        requests = normalize_requests(requests)
+        if not requests:
+            future.set_result([])
+        else:
+            self._queue.put((requests, future))
+        return future
+
+    def predict(self, requests, timeout=None):
+        return self.submit(requests).result(timeout)
+
+    def _collect(self):
+        items = [self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            unique = list(dict.fromkeys(r for requests, _ in items for r in requests))
+            try:
+                values = dict(zip(unique, self.predict_fn(unique)))
+                self.batches += 1
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            for requests, future in items:
+                future.set_result([values[r] for r in requests])
+
+
+# ---------------------------------------------------
+# HTTP front end
+# ---------------------------------------------------
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive for the app's pooled client
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "not found"})
+        self._send_json(200, self.server.health())
+
+    def do_POST(self):
+        if self.path not in ("/predict", "/horizon"):
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            requests = normalize_requests(payload["requests"])
+            if self.path == "/horizon":
+                # Rollouts already batch every request per pass
+                forecasts = self.server.horizon(requests, int(payload.get("steps", 6)))
+                return self._send_json(200, {"forecasts": forecasts})
+            predictions = self.server.batcher.predict(requests)
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(200, {"predictions": predictions})
+
+    def log_message(self, *args):
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, batcher, health=lambda: {"status": "ready"},
+                 horizon=lambda requests, steps: [None] * len(requests)):
+        self.batcher = batcher
+        self.health = health
+        self.horizon = horizon
+        super().__init__(address, PredictionHandler)
+
+
+class UnixPredictionServer(PredictionServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        self.socket.bind(self.server_address)
+        self.server_name, self.server_port = "localhost", 0
+
+    def get_request(self):
+        request, _ = self.socket.accept()
+        return request, ("local", 0)
+
+
+def make_server(batcher, health=None, host="127.0.0.1", port=8765, socket_path=None, horizon=None):
+    """HTTP server on a TCP port, or on a Unix socket when `socket_path` is given."""
+    kwargs = {} if health is None else {"health": health}
+    if horizon is not None:
+        kwargs["horizon"] = horizon
+    if socket_path:
+        return UnixPredictionServer(socket_path, batcher, **kwargs)
+    return PredictionServer((host, port), batcher, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve batched parking predictions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    args = parser.parse_args()
+
+    import backend_predictor
+
+    backend_predictor.start_model_warmup()
+    batcher = MicroBatcher(backend_predictor.predict_many, args.max_wait_ms / 1000, args.max_batch)
+
+    def health():
+        return {"status": backend_predictor.model_status(), "version": backend_predictor.model_version()}
+
+    server = make_server(batcher, health, args.host, args.port, args.socket,
+                         horizon=backend_predictor.predict_horizon)
+    print(f"SpotMate predictions on {args.socket or f'http://{args.host}:{args.port}'}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# qr_tickets.py
+#
+# QR entry-pass rendering. Each ticket code is encoded to PNG once;
+# the bytes sit in an LRU shared by every session, so reopening the
+# Entry Pass (display + download) costs a dictionary lookup.
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import qrcode
+
+QR_CACHE_SIZE = 256
+
+
+def render_png(payload):
+    """Encode `payload` as a QR code and return the PNG bytes."""
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class QRRenderer:
+    """Thread-safe LRU of rendered PNGs with optional background pre-rendering."""
+
+    def __init__(self, max_entries=QR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qr")
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _render(self, payload):
+        try:
+            data = render_png(payload)
+            with self._lock:
+                self._cache[payload] = data
+                self._cache.move_to_end(payload)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            return data
+        finally:
+            with self._lock:
+                self._inflight.pop(payload, None)
+
+    def prerender(self, payload):
+        """Start rendering in the background (no-op if cached or already running)."""
+        with self._lock:
+            if payload in self._cache:
+                return None
+            future = self._inflight.get(payload)
+            if future is None:
+                future = self._executor.submit(self._render, payload)
+                self._inflight[payload] = future
+            return future
+
+    def png(self, payload):
+        """
+        PNG bytes for `payload`. On a miss the first caller renders and
+        concurrent callers for the same payload wait for that render.
+        """
+        with self._lock:
+            data = self._cache.get(payload)
+            if data is not None:
+                self._cache.move_to_end(payload)
+                return data
+            future = self._inflight.get(payload)
+            owner = future is None
+            if owner:
+                future = self._inflight[payload] = Future()
+        if not owner:
+            return future.result()
+        try:
+            data = self._render(payload)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        future.set_result(data)
+        return data
@@ -0,0 +1,130 @@
+# spot_search.py
+#
+# Spatial search over parking spots: typed numeric columns, a uniform
+# grid index over coordinates, and radius / k-nearest queries with the
+# price, availability and vehicle-size filters applied inside the index.
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+# Vehicle sizes are stored as a bitmask per spot
+VEHICLE_BITS = {"Hatchback": 1, "Sedan": 2, "SUV": 4, "Bike": 8}
+ALL_VEHICLES = sum(VEHICLE_BITS.values())
+
+
+def vehicle_mask(vehicles):
+    """["Hatchback", "Sedan"] -> bitmask; "All" (or empty) -> every size."""
+    if not vehicles or vehicles == "All" or "All" in vehicles:
+        return ALL_VEHICLES
+    return sum(VEHICLE_BITS[v] for v in vehicles)
+
+
+def vehicle_names(mask):
+    if mask == ALL_VEHICLES:
+        return "All"
+    return ", ".join(name for name, bit in VEHICLE_BITS.items() if mask & bit)
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Distance from one point to many, in km."""
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class SpotIndex:
+    """
+    Grid index over spot coordinates. Spots are sorted by cell key so each
+    row of grid cells in a query box is one contiguous searchsorted range.
+    """
+
+    def __init__(self, spots, cell_km=1.0):
+        """
+        `spots` is a DataFrame with spot_id, lat, lon, price, availability
+        and vehicles (bitmask) columns; any extra columns are carried along.
+        """
+        self.cell_km = cell_km
+        self.dlat = cell_km / KM_PER_DEG_LAT
+        ref_lat = float(spots["lat"].mean()) if len(spots) else 0.0
+        self.dlon = cell_km / (KM_PER_DEG_LAT * max(np.cos(np.radians(ref_lat)), 0.01))
+        self.stride = int(360 / self.dlon) + 2
+
+        keys = self._cell_keys(spots["lat"].to_numpy(float), spots["lon"].to_numpy(float))
+        order = np.argsort(keys, kind="stable")
+        self.spots = spots.iloc[order].reset_index(drop=True)
+        self.keys = keys[order]
+
+        # Typed columns used by queries
+        self.lat = self.spots["lat"].to_numpy(float)
+        self.lon = self.spots["lon"].to_numpy(float)
+        self.price = self.spots["price"].to_numpy(float)
+        self.availability = self.spots["availability"].to_numpy(float)
+        self.vehicles = self.spots["vehicles"].to_numpy(np.int64)
+
+    @classmethod
+    def from_records(cls, records, cell_km=1.0):
+        """Build from dicts whose "vehicles" is a list of sizes or "All"."""
+        df = pd.DataFrame(records)
+        df["vehicles"] = [vehicle_mask(v) for v in df.get("vehicles", [])]
+        return cls(df, cell_km)
+
+    def __len__(self):
+        return len(self.spots)
+
+    def _cells(self, lats, lons):
+        cy = np.floor((np.asarray(lats) + 90) / self.dlat).astype(np.int64)
+        cx = np.floor((np.asarray(lons) + 180) / self.dlon).astype(np.int64)
+        return cy, cx
+
+    def _cell_keys(self, lats, lons):
+        cy, cx = self._cells(lats, lons)
+        return cy * self.stride + cx
+
+    def _candidates(self, lat, lon, radius_km):
+        """Row ids of every spot in the grid cells overlapping the query box."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(np.cos(np.radians(lat)), 0.01))
+        (y0, y1), (x0, x1) = self._cells([lat - dlat, lat + dlat], [lon - dlon, lon + dlon])
+
+        ranges = []
+        for cy in range(y0, y1 + 1):
+            lo = np.searchsorted(self.keys, cy * self.stride + x0, side="left")
+            hi = np.searchsorted(self.keys, cy * self.stride + x1, side="right")
+            if hi > lo:
+                ranges.append(np.arange(lo, hi))
+        return np.concatenate(ranges) if ranges else np.array([], dtype=np.int64)
+
+    def within_radius(self, lat, lon, radius_km, max_price=None, min_availability=None, vehicle=None):
+        """Spots within radius_km that pass the filters, nearest first."""
+        rows = self._candidates(lat, lon, radius_km)
+
+        # Cheap predicates before the distance computation
+        keep = np.ones(len(rows), dtype=bool)
+        if max_price is not None:
+            keep &= self.price[rows] <= max_price
+        if min_availability is not None:
+            keep &= self.availability[rows] >= min_availability
+        if vehicle and vehicle != "Any":
+            keep &= (self.vehicles[rows] & VEHICLE_BITS[vehicle]) != 0
+        rows = rows[keep]
+
+        distances = haversine_km(lat, lon, self.lat[rows], self.lon[rows])
+        inside = distances <= radius_km
+        rows, distances = rows[inside], distances[inside]
+
+        order = np.argsort(distances, kind="stable")
+        result = self.spots.iloc[rows[order]].reset_index(drop=True)
+        result["distance_km"] = distances[order]
+        return result
+
+    def nearest(self, lat, lon, k, max_radius_km=50.0, **filters):
+        """The k nearest spots passing the filters, searching outward."""
+        radius = self.cell_km
+        while True:
+            result = self.within_radius(lat, lon, radius, **filters)
+            if len(result) >= k or radius >= max_radius_km:
+                return result.head(k)
+            radius = min(radius * 2, max_radius_km)
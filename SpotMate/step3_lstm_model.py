@@ -1,4 +1,3 @@
-import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -6,6 +5,8 @@ from sklearn.model_selection import train_test_split
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
 
+from windowing import make_sequences
+
 # -----------------------------
 # 1. Load the sorted dataset
 # -----------------------------
@@ -15,22 +16,13 @@ df = pd.read_csv("parking_dataset_sorted.csv")
 df = df.sort_values(by=["zone_id", "day", "hour"])
 
 # -----------------------------
-# 2. Extract and normalize occupancy
-# -----------------------------
-occupancy = df["occupancy"].values / 100.0
-
-# -----------------------------
-# 3. Create sequences
+# 2-3. Create sequences (per zone & day) and normalize occupancy
 # -----------------------------
 sequence_length = 3
-X, y = [], []
-
-for i in range(len(occupancy) - sequence_length):
-    X.append(occupancy[i:i + sequence_length])
-    y.append(occupancy[i + sequence_length])
+X, y = make_sequences(df, sequence_length=sequence_length, horizon=1)
 
-X = np.array(X)
-y = np.array(y)
+X = X / 100.0
+y = y[:, 0] / 100.0
 
 # -----------------------------
 # 4. Reshape for LSTM
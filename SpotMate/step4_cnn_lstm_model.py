@@ -1,6 +1,5 @@
 import streamlit as st
 import numpy as np
-from tensorflow.keras.models import load_model
 
 # -----------------------------
 # Page configuration
@@ -16,10 +15,10 @@ st.set_page_config(
 # -----------------------------
 @st.cache_resource
 def load_trained_model():
+    # Imported here so the page renders before TensorFlow is loaded
+    from tensorflow.keras.models import load_model
     return load_model("cnn_lstm_parking_model.keras")
 
-model = load_trained_model()
-
 # -----------------------------
 # Header
 # -----------------------------
@@ -71,6 +70,7 @@ if st.button("🔮 Predict Parking Demand", use_container_width=True):
     input_data = np.array([[h1 / 100, h2 / 100, h3 / 100]])
     input_data = input_data.reshape((1, 3, 1))
 
+    model = load_trained_model()
     prediction = model.predict(input_data)
     predicted_value = prediction[0][0] * 100
 
@@ -0,0 +1,211 @@
+# storage.py
+#
+# Embedded SQLite storage shared by every session and worker process on
+# the host. WAL mode lets readers run alongside a writer.
+
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("SPOTMATE_DB_PATH", os.path.join(BASE_DIR, "data", "spotmate.db"))
+
+
+def connect(db_path=DB_PATH):
+    """Open a connection usable from Streamlit's script threads."""
+    conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # FULL: a confirmed booking or listing must survive a power loss
+    conn.execute("PRAGMA synchronous=FULL")
+    return conn
+
+
+# ---------------------------------------------------
+# Owner listings
+# ---------------------------------------------------
+
+class ListingsStore:
+    """Parking spots listed by owners (tab 2)."""
+
+    def __init__(self, db_path=DB_PATH):
+        self._conn = connect(db_path)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS listings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    location TEXT NOT NULL,
+                    lat REAL,
+                    lon REAL,
+                    type TEXT NOT NULL,
+                    price INTEGER NOT NULL,
+                    availability_hours INTEGER NOT NULL,
+                    available_days TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    contact TEXT NOT NULL,
+                    vehicle_sizes TEXT NOT NULL,
+                    has_image INTEGER NOT NULL,
+                    listed_date TEXT NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_location ON listings (lat, lon)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_type_price ON listings (type, price)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_price ON listings (price)")
+
+    def add_many(self, listings):
+        """Insert listings in one transaction. Returns their new IDs."""
+        ids = []
+        with self._lock, self._conn:
+            for listing in listings:
+                cursor = self._conn.execute(
+                    """INSERT INTO listings (location, lat, lon, type, price, availability_hours,
+                       available_days, owner, contact, vehicle_sizes, has_image, listed_date)
+                       VALUES (:location, :lat, :lon, :type, :price, :availability_hours,
+                       :available_days, :owner, :contact, :vehicle_sizes, :has_image, :listed_date)""",
+                    {
+                        "lat": None,
+                        "lon": None,
+                        **listing,
+                        "available_days": ", ".join(listing.get("available_days", [])),
+                        "vehicle_sizes": ", ".join(listing["vehicle_sizes"]),
+                        "has_image": int(bool(listing.get("has_image"))),
+                    },
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def add(self, listing):
+        return self.add_many([listing])[0]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def last_id(self):
+        """Highest listing ID (0 if none); changes whenever a listing is added."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM listings").fetchone()[0]
+
+    def located(self):
+        """Every listing with coordinates, for the spot search index."""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT * FROM listings WHERE lat IS NOT NULL AND lon IS NOT NULL ORDER BY id",
+                self._conn,
+            )
+
+    def page(self, page=1, page_size=20):
+        """One page of listings, formatted for the Active Listings table."""
+        with self._lock:
+            df = pd.read_sql_query(
+                """SELECT id AS "ID", location AS "Location", type AS "Type",
+                   '₹' || price AS "Price/Hour", availability_hours || 'h daily' AS "Availability",
+                   owner AS "Owner", contact AS "Contact", vehicle_sizes AS "Vehicle Size",
+                   CASE has_image WHEN 1 THEN '✅' ELSE 'Demo' END AS "Image",
+                   listed_date AS "Listed Date"
+                   FROM listings ORDER BY id LIMIT ? OFFSET ?""",
+                self._conn,
+                params=(page_size, (page - 1) * page_size),
+            )
+        return df
+
+    def find(self, parking_type=None, max_price=None, bounds=None, limit=100):
+        """
+        Typed query on the indexed columns. `bounds` is
+        (min_lat, min_lon, max_lat, max_lon).
+        """
+        clauses, params = [], []
+        if parking_type is not None:
+            clauses.append("type = ?")
+            params.append(parking_type)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+        if bounds is not None:
+            clauses.append("lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?")
+            params.extend([bounds[0], bounds[2], bounds[1], bounds[3]])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT * FROM listings {where} ORDER BY id LIMIT ?",
+                self._conn,
+                params=(*params, limit),
+            )
+
+
+# ---------------------------------------------------
+# Bookings ledger
+# ---------------------------------------------------
+
+BOOKING_FIELDS = ["booking_id", "parking_id", "location", "date", "time",
+                  "amount", "payment_method", "status", "booked_at"]
+FIRST_BOOKING_NUMBER = 5001
+
+
+class BookingsStore:
+    """
+    Append-only bookings keyed by booking_id. IDs come from a counter row
+    incremented inside the insert transaction, so they are unique across
+    every worker process sharing the database file.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self._conn = connect(db_path)
+        self._conn.isolation_level = None  # explicit BEGIN IMMEDIATE below
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS bookings (
+                    {BOOKING_FIELDS[0]} TEXT PRIMARY KEY,
+                    {", ".join(f"{name} TEXT NOT NULL" for name in BOOKING_FIELDS[1:])}
+                )"""
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO counters VALUES ('booking', ?)", (FIRST_BOOKING_NUMBER - 1,)
+            )
+
+    def create(self, booking):
+        """Allocate the next booking ID, store the booking and return the ID."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                number = self._conn.execute(
+                    "UPDATE counters SET value = value + 1 WHERE name = 'booking' RETURNING value"
+                ).fetchone()[0]
+                booking_id = f"BK{number}"
+                record = {**booking, "booking_id": booking_id}
+                self._conn.execute(
+                    f"INSERT INTO bookings VALUES ({', '.join('?' * len(BOOKING_FIELDS))})",
+                    [str(record[name]) for name in BOOKING_FIELDS],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return booking_id
+
+    def get(self, booking_id):
+        """Primary-key lookup; returns the booking dict or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM bookings WHERE booking_id = ?", (booking_id,)
+            ).fetchone()
+        return dict(zip(BOOKING_FIELDS, row)) if row else None
+
+    def get_many(self, booking_ids):
+        """Bookings for the given IDs, in the same order (missing IDs skipped)."""
+        booking_ids = list(booking_ids)
+        if not booking_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM bookings WHERE booking_id IN ({', '.join('?' * len(booking_ids))})",
+                booking_ids,
+            ).fetchall()
+        found = {row[0]: dict(zip(BOOKING_FIELDS, row)) for row in rows}
+        return [found[booking_id] for booking_id in booking_ids if booking_id in found]
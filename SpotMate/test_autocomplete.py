@@ -0,0 +1,81 @@
+"""
+Test: Typeahead location autocomplete (prefix index + result cache)
+"""
+
+import threading
+import time
+
+from autocomplete import Autocomplete
+from gazetteer import Gazetteer
+from geocoding import Geocoder
+
+
+def test_suggests_gazetteer_localities():
+    """Name prefixes and word prefixes both match"""
+    ac = Autocomplete.from_sources(Gazetteer.load())
+    assert ac.suggest("hitec") == ["hitec city", "hitech city", "hitec cyberabad"]
+    assert "mg road" in ac.suggest("Road")
+    assert ac.suggest("zzz") == []
+    assert ac.suggest("  ") == []
+
+
+def test_ranking():
+    """Leading matches first, then areas, places, cities, then shorter names"""
+    ac = Autocomplete([("park street", "area"), ("central park", "area"),
+                       ("parkville", "city"), ("parkside mall", "place")])
+    assert ac.suggest("park") == ["park street", "parkside mall", "parkville", "central park"]
+    assert ac.suggest("park", limit=2) == ["park street", "parkside mall"]
+
+
+def test_includes_geocoded_places(tmp_path):
+    """Successful geocodes from the cache become suggestions"""
+    geocoder = Geocoder(base_url="http://127.0.0.1:9/search", cache_path=str(tmp_path / "g.db"))
+    geocoder._store("inorbit mall", 17.43, 78.38)
+    geocoder._store("nowhere land", None, None)
+    ac = Autocomplete.from_sources(Gazetteer([]), geocoder)
+    assert ac.suggest("ino") == ["inorbit mall"]
+    assert ac.suggest("nowhere") == []
+
+
+def test_cache_is_bounded_and_invalidated():
+    """Results are cached per prefix, capped, and dropped when names are added"""
+    ac = Autocomplete([("kondapur", "area")], max_cache=2)
+    assert ac.suggest("ko") == ["kondapur"]
+    ac.suggest("kon")
+    ac.suggest("kond")
+    assert len(ac._cache) == 2
+    ac.add("Kokapet")
+    assert len(ac._cache) == 0
+    assert ac.suggest("ko") == ["kondapur", "kokapet"]
+
+
+def test_fast_on_large_index():
+    """Specific prefixes answer in well under a few milliseconds"""
+    ac = Autocomplete((f"locality {i} nagar", "area") for i in range(30000))
+    start = time.perf_counter()
+    for i in range(0, 30000, 300):
+        assert ac.suggest(f"locality {i} ")[0] == f"locality {i} nagar"
+    assert (time.perf_counter() - start) / 100 < 0.003
+
+
+def test_concurrent_sessions():
+    """Shared instance: concurrent suggest/add from many threads stays consistent"""
+    ac = Autocomplete([(f"place {i}", "place") for i in range(500)], max_cache=8)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(300):
+                ac.suggest(f"place {(n * 7 + i) % 60}")
+                if i % 50 == 0:
+                    ac.add(f"extra {n} {i}")
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(ac) == 500 + 8 * 6
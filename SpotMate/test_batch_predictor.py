@@ -0,0 +1,67 @@
+"""
+Test: Batched predictions match single-hour predictions
+"""
+
+import time
+
+from backend_predictor import (
+    predict_parking_occupancy, predict_many, predict_day_curve,
+    start_model_warmup, model_status, load_inference_model, load_occupancy_index
+)
+
+
+def test_predict_many_matches_model():
+    """Batched results (table / cache / model) match the model run directly on each window"""
+    queries = [("Z1", 15, 14), ("Z2", 20, 10), ("Z3", 25, 18), ("Z4", 10, 2), ("Z5", 1, 1)]
+    batched = predict_many(queries)
+    index = load_occupancy_index()
+    model = load_inference_model()
+
+    assert len(batched) == len(queries)
+    assert batched[0] == predict_parking_occupancy(*queries[0])
+    for (zone_id, day, hour), value in zip(queries, batched):
+        window = index.window(zone_id, day, hour, length=3)
+        expected = model.predict(window.reshape(1, 3, 1) / 100.0, verbose=0)[0, 0] * 100
+        assert abs(value - expected) < 0.05
+        print(f"[OK] {zone_id} Day {day:2d} Hour {hour:2d}: {value}")
+
+
+def test_predict_day_curve():
+    """A full day is predicted in one call, early hours included"""
+    start = time.time()
+    curve = predict_day_curve("Z1", 15)
+    elapsed = time.time() - start
+
+    assert len(curve) == 24
+    assert all(v is not None and 0 <= v <= 150 for v in curve)
+    print(f"[OK] 24-hour curve in {elapsed * 1000:.1f}ms")
+
+
+def test_month_boundaries():
+    """The 1st's early hours and day 31 resolve against the monthly history"""
+    assert None not in predict_many([("Z2", 1, 0), ("Z2", 1, 2), ("Z3", 31, 1), ("Z4", 31, 12)])
+
+
+def test_predict_many_empty():
+    """No queries means no model call and an empty result"""
+    assert predict_many([]) == []
+
+
+def test_model_warmup():
+    """Warm-up runs in the background and reports readiness"""
+    start_model_warmup()
+    assert model_status() in ("loading", "ready")
+
+    deadline = time.time() + 60
+    while model_status() == "loading" and time.time() < deadline:
+        time.sleep(0.05)
+    assert model_status() == "ready"
+
+
+if __name__ == "__main__":
+    test_predict_many_matches_model()
+    test_predict_day_curve()
+    test_month_boundaries()
+    test_predict_many_empty()
+    test_model_warmup()
+    print("ALL BATCH PREDICTOR TESTS PASSED")
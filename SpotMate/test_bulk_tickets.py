@@ -0,0 +1,50 @@
+"""
+Test: Bulk QR pass generation (process pool streamed into a ZIP)
+"""
+
+import csv
+import datetime as dt
+import io
+import zipfile
+
+from bulk_tickets import MANIFEST_NAME, render_bulk
+from ticket_codec import TicketVerifier
+
+KEY = b"bulk-test-key"
+
+
+def make_bookings(n):
+    return [{"booking_id": f"BK{5001 + i}", "parking_id": f"P#{1000 + i % 7}",
+             "date": "2026-10-18", "time": "10:00:00"} for i in range(n)]
+
+
+def test_zip_contains_every_pass_in_order():
+    """One PNG per booking plus a manifest whose codes verify"""
+    out = io.BytesIO()
+    stats = render_bulk(make_bookings(45), out, key=KEY, workers=2, chunk_size=8)
+    assert stats["tickets"] == 45
+    assert stats["tickets_per_s"] > 0
+
+    with zipfile.ZipFile(out) as zf:
+        names = zf.namelist()
+        assert names[:-1] == [f"BK{5001 + i}.png" for i in range(45)]
+        assert names[-1] == MANIFEST_NAME
+        assert zf.read("BK5001.png").startswith(b"\x89PNG")
+        rows = list(csv.DictReader(io.StringIO(zf.read(MANIFEST_NAME).decode())))
+
+    verifier = TicketVerifier(KEY)
+    now = dt.datetime(2026, 10, 18, 11).timestamp()
+    for i, row in enumerate(rows):
+        ticket = verifier.verify(row["ticket_code"], now=now)
+        assert ticket.booking_id == row["booking_id"] == f"BK{5001 + i}"
+        assert ticket.spot_number == 1000 + i % 7
+
+
+def test_accepts_a_generator_and_empty_batches(tmp_path):
+    """Bookings are consumed lazily; an empty batch still yields a manifest"""
+    path = tmp_path / "passes.zip"
+    stats = render_bulk((b for b in make_bookings(3)), str(path), key=KEY, workers=1)
+    assert stats["tickets"] == 3
+    assert render_bulk([], str(tmp_path / "empty.zip"), key=KEY, workers=1)["tickets"] == 0
+    with zipfile.ZipFile(tmp_path / "empty.zip") as zf:
+        assert zf.namelist() == [MANIFEST_NAME]
@@ -0,0 +1,70 @@
+"""
+Test: Vectorized synthetic data generator
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataset import generate, generate_zone
+from dataset_store import read_store, write_store
+from occupancy_index import OccupancyIndex
+from zone_registry import load_zones
+
+
+def test_reproducible_and_independent():
+    """Same seed -> same data; a zone does not depend on other zones"""
+    zone = load_zones()[2]
+    a = generate_zone(zone, days=10, seed=7)
+    b = generate_zone(zone, days=10, seed=7)
+    c = generate_zone(zone, days=10, seed=8)
+
+    assert np.array_equal(a["occupancy"], b["occupancy"])
+    assert not np.array_equal(a["occupancy"], c["occupancy"])
+
+
+def test_patterns():
+    """Office zones are busy 9-17, malls get a weekend bonus"""
+    office = pd.DataFrame(generate_zone(load_zones()[0], days=14))
+    busy = office["hour"].between(9, 17)
+    assert office.loc[busy, "occupancy"].between(70, 90).all()
+    assert office.loc[~busy, "occupancy"].between(10, 30).all()
+
+    mall = pd.DataFrame(generate_zone(load_zones()[1], days=14))
+    weekend_evening = (mall["is_weekend"] == 1) & mall["hour"].between(17, 22)
+    assert mall.loc[weekend_evening, "occupancy"].between(80, 100).all()
+
+
+def test_csv_and_store_outputs(tmp_path):
+    """Both outputs hold the same rows; sub-hour data gets a minute column"""
+    csv_path = str(tmp_path / "parking.csv")
+    store = str(tmp_path / "store")
+
+    assert generate(csv_path, zones=3, days=2) == 3 * 2 * 24
+    assert generate(store, zones=3, days=2) == 3 * 2 * 24
+
+    from_csv = pd.read_csv(csv_path)
+    from_store = read_store(store)
+    assert list(from_csv.columns) == ["zone_id", "day", "hour", "occupancy", "is_weekend"]
+    assert np.array_equal(from_csv["occupancy"].to_numpy(), from_store["occupancy"].to_numpy())
+
+    assert generate(store, zones=2, days=1, resolution=15) == 2 * 24 * 4
+    assert read_store(store)["minute"].tolist()[:5] == [0, 15, 30, 45, 0]
+
+
+def test_sub_hour_rows_are_averaged(tmp_path):
+    """15-minute data indexes as hourly means, from the CSV, its store or a direct store"""
+    csv_path = str(tmp_path / "parking.csv")
+    generate(csv_path, zones=2, days=2, resolution=15)
+    df = pd.read_csv(csv_path)
+    expected = df.groupby(["zone_id", "day", "hour"])["occupancy"].mean()
+
+    write_store(csv_path, str(tmp_path / "from_csv"))
+    generate(str(tmp_path / "direct"), zones=2, days=2, resolution=15)
+    for frame in (df, read_store(str(tmp_path / "from_csv")), read_store(str(tmp_path / "direct"))):
+        index = OccupancyIndex.from_dataframe(frame)
+        assert index.mask.all()
+        cube = index.values[[index.row(z) for z, _, _ in expected.index],
+                            [d - index.first_day for _, d, _ in expected.index],
+                            [h for _, _, h in expected.index]]
+        assert np.allclose(cube, expected.to_numpy())
+
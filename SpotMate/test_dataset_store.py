@@ -0,0 +1,70 @@
+"""
+Test: Chunked ingestion into the partitioned binary store
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_store import write_store, partition_dir, read_store, open_partition
+
+
+def test_chunked_ingest_matches_pandas(tmp_path):
+    """Small chunks + per-zone merge give the same rows as a full sort"""
+    rng = np.random.default_rng(7)
+    rows = [[zone, day, hour, int(rng.integers(0, 100)), int(day % 7 in (0, 6))]
+            for day in range(1, 11) for hour in range(24) for zone in ["Z1", "Z2", "Z3"]]
+    df = pd.DataFrame(rows, columns=["zone_id", "day", "hour", "occupancy", "is_weekend"])
+    # Shuffle so every chunk holds an unsorted mix of zones
+    df = df.sample(frac=1, random_state=0)
+    csv_path = tmp_path / "occupancy.csv"
+    df.to_csv(csv_path, index=False)
+
+    store = tmp_path / "store"
+    meta = write_store(str(csv_path), str(store), chunksize=97)
+
+    assert meta["rows"] == len(df)
+    assert meta["zones"] == {"Z1": 240, "Z2": 240, "Z3": 240}
+    assert json.load(open(store / "meta.json"))["zones"] == meta["zones"]
+    assert not [p for p in os.listdir(store) if p.startswith("tmp")]
+
+    expected = df.sort_values(["zone_id", "day", "hour"])
+    for zone_id in ["Z1", "Z2", "Z3"]:
+        zone_dir = partition_dir(str(store), zone_id)
+        day = np.load(os.path.join(zone_dir, "day.npy"))
+        hour = np.load(os.path.join(zone_dir, "hour.npy"))
+        occupancy = np.load(os.path.join(zone_dir, "occupancy.npy"))
+
+        assert day.dtype == np.uint16 and hour.dtype == np.uint8 and occupancy.dtype == np.uint8
+        zone_rows = expected[expected["zone_id"] == zone_id]
+        assert np.array_equal(day, zone_rows["day"].to_numpy())
+        assert np.array_equal(hour, zone_rows["hour"].to_numpy())
+        assert np.array_equal(occupancy, zone_rows["occupancy"].to_numpy())
+
+
+def test_pruned_reads(tmp_path):
+    """Reads touch only the requested columns, zones and days"""
+    rows = [[zone, day, hour, (day * 24 + hour) % 100, 0]
+            for zone in ["Z1", "Z2"] for day in range(1, 6) for hour in range(24)]
+    df = pd.DataFrame(rows, columns=["zone_id", "day", "hour", "occupancy", "is_weekend"])
+    csv_path = tmp_path / "occupancy.csv"
+    df.to_csv(csv_path, index=False)
+    store = str(tmp_path / "store")
+    write_store(str(csv_path), store)
+
+    full = read_store(store)
+    assert list(full.columns) == ["zone_id", "day", "hour", "occupancy", "is_weekend"]
+    assert len(full) == len(df)
+
+    part = read_store(store, columns=["day", "occupancy"], zones=["Z2"], days=(2, 3))
+    assert list(part.columns) == ["day", "occupancy"]
+    assert len(part) == 48
+    assert set(part["day"]) == {2, 3}
+
+    arrays, n_rows = open_partition(store, "Z1", ["occupancy"], days=(5, 9))
+    assert n_rows == 24
+    assert isinstance(arrays["occupancy"], np.memmap)
+
+    assert read_store(store, zones=["Z9"]).empty
@@ -0,0 +1,145 @@
+"""
+Test: Incremental forecast refresh from live observations
+"""
+
+import calendar
+import datetime as dt
+import threading
+import time
+
+import numpy as np
+
+from forecast_refresh import ForecastBoard, hour_to_day_hour
+from live_occupancy import LiveOccupancy
+
+
+class FakeModel:
+    """Predicts from a settable level and records every batch it is asked for."""
+
+    def __init__(self):
+        self.level = 10.0
+        self.batches = []
+
+    def predict_many(self, requests):
+        self.batches.append(list(requests))
+        return [self.level + hour for _, _, hour in requests]
+
+    def predict_horizon(self, requests, steps):
+        self.batches.append(list(requests))
+        return [[self.level] * steps for _ in requests]
+
+
+def hour_number(day, hour):
+    return calendar.timegm(dt.datetime(2026, 3, day, hour).timetuple()) // 3600
+
+
+def test_only_dependent_hours_are_repredicted():
+    """An observation at hour h refreshes h+1..h+3 of that zone in one batch"""
+    model = FakeModel()
+    board = ForecastBoard(model.predict_many, model.predict_horizon)
+    heatmap = board.curves(["Z1", "Z2"], 18)
+    assert heatmap.shape == (2, 24) and len(model.batches) == 1
+
+    model.level = 50.0
+    board.invalidate([("Z1", hour_number(18, 10)), ("Z1", hour_number(18, 11))])
+    board.invalidate([("Z2", hour_number(17, 23))])         # dirties Z2's 0-2h on the 18th
+    heatmap = board.curves(["Z1", "Z2"], 18)
+
+    assert len(model.batches) == 2
+    assert sorted(model.batches[1]) == sorted(
+        [("Z1", 18, h) for h in (11, 12, 13, 14)] + [("Z2", 18, h) for h in (0, 1, 2)]
+    )
+    assert list(np.nonzero(heatmap[0] >= 50)[0]) == [11, 12, 13, 14]
+    assert list(np.nonzero(heatmap[1] >= 50)[0]) == [0, 1, 2]
+
+    board.curve("Z1", 18)
+    assert len(model.batches) == 2                          # nothing dirty, nothing predicted
+
+
+def test_outlooks_and_uncached_entries():
+    """Outlooks refresh when their start hour's window changes; uncached keys are ignored"""
+    model = FakeModel()
+    board = ForecastBoard(model.predict_many, model.predict_horizon, steps=3)
+    assert board.outlook("Z1", 18, 14) == [10.0] * 3
+
+    model.level = 70.0
+    board.invalidate([("Z1", hour_number(18, 12)), ("Z3", hour_number(18, 12))])
+    assert board.outlook("Z1", 18, 14) == [70.0] * 3
+    assert model.batches[-1] == [("Z1", 18, 14)]
+    assert hour_to_day_hour(hour_number(31, 23) + 1) == (1, 0)
+
+
+def test_live_feed_drives_refresh():
+    """Subscribed to a LiveOccupancy, new events patch the cached curve"""
+    model = FakeModel()
+    board = ForecastBoard(model.predict_many, model.predict_horizon)
+    live = LiveOccupancy(["Z1"])
+    live.subscribe(board.invalidate)
+    board.curve("Z1", 18)
+
+    model.level = 90.0
+    live.add("Z1", time.mktime(dt.datetime(2026, 3, 18, 20, 15).timetuple()), 60)
+    curve = board.curve("Z1", 18)
+    assert list(np.nonzero(curve >= 90)[0]) == [21, 22, 23]
+    assert model.batches[-1] == [("Z1", 18, 21), ("Z1", 18, 22), ("Z1", 18, 23)]   # 19th not cached
+
+
+def test_invalidation_during_first_prediction_is_kept():
+    """An observation landing while a row is first predicted still refreshes it"""
+    model = FakeModel()
+    board = ForecastBoard(None, model.predict_horizon)
+
+    def predict_many(requests):
+        values = model.predict_many(requests)
+        if len(model.batches) == 1:                      # ingestor fires mid-prediction
+            model.level = 50.0
+            board.invalidate([("Z1", hour_number(18, 10))])
+        return values
+
+    board._predict_many = predict_many
+    curve = board.curve("Z1", 18)
+    assert list(np.nonzero(curve >= 50)[0]) == [11, 12, 13]
+
+
+def test_out_of_order_refreshes_keep_the_newest():
+    """A refresh finishing after a newer one for the same hours is discarded"""
+    model = FakeModel()
+    board = ForecastBoard(model.predict_many, model.predict_horizon)
+    board.curve("Z1", 18)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_predict_many(requests):
+        values = model.predict_many(requests)
+        started.set()
+        release.wait(5)
+        return values
+
+    model.level = 50.0
+    board.invalidate([("Z1", hour_number(18, 10))])
+    board._predict_many = slow_predict_many
+    slow = threading.Thread(target=board.refresh)
+    slow.start()
+    started.wait(5)
+
+    board._predict_many = model.predict_many
+    model.level = 90.0
+    board.invalidate([("Z1", hour_number(18, 10))])
+    board.refresh()
+    release.set()
+    slow.join(5)
+    assert list(board.curve("Z1", 18)[11:14]) == [101.0, 102.0, 103.0]
+
+
+def test_bounded_and_aged_out():
+    """Entries are LRU-bounded; live hours ageing out re-predict their targets"""
+    model = FakeModel()
+    now = [calendar.timegm(dt.datetime(2026, 3, 18, 12, 30).timetuple())]
+    board = ForecastBoard(model.predict_many, model.predict_horizon, live_hours=6, max_curves=2,
+                          clock=lambda: now[0] - time.localtime(now[0]).tm_gmtoff)
+    board.curves(["Z1", "Z2", "Z3"], 18)
+    assert list(board._curves) == [("Z2", 18), ("Z3", 18)]
+
+    board.curve("Z2", 18)                                # clock starts at 12h
+    now[0] += 3600                                       # 13h: hour 7 leaves the buffer
+    board.curve("Z2", 18)
+    assert sorted(model.batches[-1]) == [("Z2", 18, 10), ("Z3", 18, 10)]   # 10h's window was 7-9h
@@ -0,0 +1,75 @@
+"""
+Test: Precomputed forecast table
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from occupancy_index import OccupancyIndex
+from numpy_model import NumpyCNNLSTM, NPZ_PATH
+from forecast_table import ForecastTable, build_forecast_table, materialize, table_key
+
+
+def make_index():
+    rng = np.random.default_rng(0)
+    rows = [[zone, day, hour, int(rng.integers(0, 100)), 0]
+            for zone in ["Z1", "Z2"] for day in [1, 2] for hour in range(24)]
+    df = pd.DataFrame(rows, columns=["zone_id", "day", "hour", "occupancy", "is_weekend"])
+    return OccupancyIndex.from_dataframe(df)
+
+
+def test_table_matches_model():
+    """Every stored forecast equals a direct model prediction"""
+    index = make_index()
+    model = NumpyCNNLSTM.load(NPZ_PATH)
+    table = build_forecast_table(index, model)
+
+    for zone_id in ["Z1", "Z2"]:
+        for hour in range(24):
+            window = index.window(zone_id, 2, hour)
+            expected = None
+            if window is not None:
+                expected = round(float(model.predict(window.reshape(1, 3, 1) / 100.0)[0, 0]) * 100, 2)
+            assert table.lookup(zone_id, 2, hour) == expected
+
+
+def test_early_hours_and_cyclic_tables():
+    """Hours 0-2 use the previous day; a cyclic table also wraps day 1 and beyond"""
+    model = NumpyCNNLSTM.load(NPZ_PATH)
+    table = build_forecast_table(make_index(), model)
+    assert table.lookup("Z1", 2, 0) is not None
+    assert table.lookup("Z1", 1, 0) is None
+
+    index = make_index()
+    index.cyclic = True
+    cyclic = build_forecast_table(index, model)
+    for zone_id in ["Z1", "Z2"]:
+        for day in [1, 2, 3]:
+            for hour in range(24):
+                window = index.window(zone_id, day, hour)
+                expected = round(float(model.predict(window.reshape(1, 3, 1) / 100.0)[0, 0]) * 100, 2)
+                assert cyclic.lookup(zone_id, day, hour) == expected
+
+
+def test_materialize_is_keyed(tmp_path):
+    """The table is rebuilt only when the dataset or model changes"""
+    dataset = tmp_path / "dataset.csv"
+    dataset.write_text("zone_id,day,hour,occupancy,is_weekend\n")
+    model = NumpyCNNLSTM.load(NPZ_PATH)
+
+    first = materialize(str(dataset), NPZ_PATH, make_index(), model, out_dir=str(tmp_path))
+    mtime = os.path.getmtime(first)
+    assert materialize(str(dataset), NPZ_PATH, make_index(), model, out_dir=str(tmp_path)) == first
+    assert os.path.getmtime(first) == mtime
+
+    dataset.write_text("zone_id,day,hour,occupancy,is_weekend\nZ1,1,0,10,0\n")
+    second = materialize(str(dataset), NPZ_PATH, make_index(), model, out_dir=str(tmp_path))
+    assert second != first
+    assert not os.path.exists(first)
+    assert os.path.basename(second) == f"forecast_table_{table_key(str(dataset), NPZ_PATH)}.npz"
+
+    table = ForecastTable.load(second)
+    assert table.zone_ids == ["Z1", "Z2"]
+    assert table.covers("Z1", 2) and not table.covers("Z1", 3)
@@ -0,0 +1,65 @@
+"""
+Test: Gazetteer locality index (Aho–Corasick + trigram fuzzy matching)
+"""
+
+import time
+
+from gazetteer import Gazetteer, GAZETTEER_PATH
+
+
+def test_loads_bundled_localities():
+    """The shipped file covers the old hardcoded cities and areas"""
+    g = Gazetteer.load(GAZETTEER_PATH)
+    assert len(g) >= 100
+    assert g.lookup("Hyderabad") == (17.3850, 78.4867)
+    assert g.lookup("HITEC City") == (17.4409, 78.4594)
+    assert g.lookup("Kolkata") == (22.5726, 88.3639)
+
+
+def test_area_beats_city():
+    """A specific area inside the query wins over the city name"""
+    g = Gazetteer.load()
+    assert g.lookup("MG Road, Bangalore") == (12.9716, 77.6117)
+    assert g.lookup("near Bandra, Mumbai") == g.places["bandra"][:2]
+    assert g.lookup("Koramangla, Bengaluru") == g.places["koramangala"][:2]
+
+
+def test_whole_words_only():
+    """Names only match on word boundaries"""
+    g = Gazetteer([("pune", 18.52, 73.85, "city")])
+    assert g.find_all("Pune station") == ["pune"]
+    assert g.find_all("punekar road") == []
+
+
+def test_fuzzy_typos():
+    """Misspelt localities resolve through the trigram index"""
+    g = Gazetteer.load()
+    assert g.lookup("Gachibowly") == g.places["gachibowli"][:2]
+    assert g.lookup("bangalor") == g.places["bangalore"][:2]
+    assert g.lookup("qwxz plm") is None
+
+
+def test_no_fuzzy_match_on_generic_spans():
+    """Unknown places fall through to Nominatim instead of a look-alike"""
+    g = Gazetteer.load()
+    for query in ["Station Road", "Ring Road", "Mall Road Shimla", "Old City", "New York"]:
+        assert g.lookup(query) is None, query
+    assert g.fuzzy("Road") is None
+
+
+def test_added_names_are_searchable():
+    """Names added after loading are found like the loaded ones"""
+    g = Gazetteer.load()
+    g.add("Kings Cross Parking", 17.1, 78.1)
+    assert g.lookup("kings cross parking lot") == (17.1, 78.1)
+    assert "kings cross parking" in g.find_all("parking at kings cross parking today")
+
+
+def test_scales_to_tens_of_thousands():
+    """Exact lookups stay fast with a large gazetteer"""
+    g = Gazetteer((f"locality {i}", 17.0 + i * 1e-5, 78.0, "area") for i in range(20000))
+    g.lookup("x")   # build failure links once
+    start = time.perf_counter()
+    for i in range(0, 20000, 100):
+        assert g.lookup(f"parking near locality {i} please") == (17.0 + i * 1e-5, 78.0)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,100 @@
+"""
+Test: Geocoding client against a local stub Nominatim server
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from geocoding import Geocoder, normalize_query
+
+PLACES = {"gachibowli": ("17.4401", "78.3489")}
+
+
+class StubNominatim(BaseHTTPRequestHandler):
+    """Answers /search like Nominatim, counting requests"""
+
+    requests_seen = []
+    delay = 0.0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        type(self).requests_seen.append((query, time.monotonic()))
+        time.sleep(type(self).delay)
+        place = PLACES.get(query)
+        body = json.dumps([{"lat": place[0], "lon": place[1]}] if place else []).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubNominatim.requests_seen = []
+    StubNominatim.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNominatim)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+
+
+def test_lookup_and_persistent_cache(stub_server, tmp_path):
+    """Results (hits and misses) survive into a new Geocoder instance"""
+    cache_path = str(tmp_path / "geocode.db")
+    geocoder = Geocoder(stub_server, cache_path, min_interval=0)
+
+    assert geocoder.geocode("  Gachibowli ") == (17.4401, 78.3489)
+    assert geocoder.geocode("Nowhere Town") == (None, None)
+    assert len(StubNominatim.requests_seen) == 2
+
+    fresh = Geocoder(stub_server, cache_path, min_interval=0)
+    assert fresh.geocode("GACHIBOWLI") == (17.4401, 78.3489)
+    assert fresh.geocode("nowhere town") == (None, None)
+    assert len(StubNominatim.requests_seen) == 2
+
+
+def test_coalescing(stub_server, tmp_path):
+    """Concurrent identical queries share one HTTP request"""
+    StubNominatim.delay = 0.2
+    geocoder = Geocoder(stub_server, str(tmp_path / "geocode.db"), min_interval=0)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(geocoder.geocode, ["Gachibowli"] * 8))
+
+    assert set(results) == {(17.4401, 78.3489)}
+    assert len(StubNominatim.requests_seen) == 1
+
+
+def test_rate_limit(stub_server, tmp_path):
+    """Distinct queries are spaced at least min_interval apart"""
+    geocoder = Geocoder(stub_server, str(tmp_path / "geocode.db"), min_interval=0.15)
+    futures = [geocoder.submit(q) for q in ["a", "b", "c"]]
+    [f.result() for f in futures]
+
+    times = sorted(t for _, t in StubNominatim.requests_seen)
+    assert all(b - a >= 0.14 for a, b in zip(times, times[1:]))
+
+
+def test_wait_does_not_block(stub_server, tmp_path):
+    """A slow lookup returns quickly and lands in the cache later"""
+    StubNominatim.delay = 0.5
+    geocoder = Geocoder(stub_server, str(tmp_path / "geocode.db"), min_interval=0)
+
+    start = time.monotonic()
+    assert geocoder.geocode("Gachibowli", wait=0.05) == (None, None)
+    assert time.monotonic() - start < 0.3
+    assert geocoder.is_pending("gachibowli")
+
+    geocoder.submit("Gachibowli").result()
+    assert geocoder.cached("Gachibowli") == (True, (17.4401, 78.3489))
+    assert normalize_query("  A   B ") == "a b"
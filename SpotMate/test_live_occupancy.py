@@ -0,0 +1,136 @@
+"""
+Test: Live occupancy ring buffers and ingestion
+"""
+
+import datetime as dt
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from live_occupancy import LiveOccupancy, LiveIngestor, parse_event
+
+NOW = dt.datetime(2026, 3, 18, 14, 30)
+
+
+def stamp(hour, minute=5):
+    return time.mktime(NOW.replace(hour=hour, minute=minute).timetuple())
+
+
+def test_hourly_means_and_windows():
+    """Events average per hour; a window needs every hour before the target"""
+    live = LiveOccupancy(["Z1", "Z2"], hours=6)
+    for hour, value in [(11, 30), (12, 40), (13, 50)]:
+        live.ingest(["Z1", "Z1", "Z9"], [stamp(hour), stamp(hour, 40), stamp(hour)], [value, value + 10, 99])
+
+    assert list(live.window("Z1", 18, 14, now=NOW)) == [35, 45, 55]
+    assert live.window("Z1", 18, 15, now=NOW) is None     # hour 14 not seen yet
+    assert live.window("Z2", 18, 14, now=NOW) is None
+    assert live.events == 6
+
+
+def test_windows_across_the_wrap():
+    """Old hours are evicted and windows across the ring's end are read whole"""
+    live = LiveOccupancy(["Z1"], hours=4)
+    for hour in range(8, 15):
+        live.add("Z1", stamp(hour), hour)
+
+    window = live.window("Z1", 18, 15, now=NOW)
+    assert list(window) == [12, 13, 14]
+    assert not np.shares_memory(window, live._means)
+    assert live.window("Z1", 18, 11, now=NOW) is None     # evicted
+    live.add("Z1", stamp(9), 1)                            # too old: dropped
+    assert list(live.window("Z1", 18, 15, now=NOW)) == [12, 13, 14]
+    assert live.window("Z1", 18, 15, now=NOW + dt.timedelta(hours=3)) is None   # aged out
+    batch, positions = live.windows([("Z1", 18, 15), ("Z1", 18, 11), ("Z9", 18, 15)], now=NOW)
+    assert batch.tolist() == [[12, 13, 14]] and positions == [0]
+
+
+def test_ingestor_sources(tmp_path):
+    """Queue, file tail and UDP events all land in the buffers"""
+    live = LiveOccupancy(["Z1", "Z2", "Z3"])
+    ingestor = LiveIngestor(live)
+    feed = tmp_path / "feed.csv"
+    feed.write_text("")
+    ingestor.follow_file(str(feed), poll=0.01)
+    port = ingestor.listen_udp(port=0)
+
+    ingestor.put("Z1", stamp(13), 20)
+    with open(feed, "a") as f:
+        f.write("Z2,%d,30\n" % stamp(13))
+    deadline = time.time() + 5
+    while live.events < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    feed.rename(tmp_path / "feed.csv.1")                    # rotate, then a new file
+    feed.write_text("Z2,%d,50\n" % stamp(13))
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.sendto(('{"zone_id": "Z3", "timestamp": %d, "occupancy": 40}\n' % stamp(13)).encode(), ("127.0.0.1", port))
+
+    deadline = time.time() + 5
+    while live.events < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    ingestor.stop()
+    assert live.events == 4
+    assert list(live.window("Z2", 18, 14, length=1, now=NOW)) == [40]
+    assert parse_event("Z1, 10, 5") == ("Z1", 10.0, 5.0)
+
+
+def test_bad_events_do_not_stop_ingestion():
+    """Bad values are refused, a failing batch keeps its good rows, the thread survives"""
+    live = LiveOccupancy(["Z1", "Z2"])
+    calls = []
+
+    def flaky(changed):
+        calls.append(changed)
+        if len(calls) == 1:
+            raise RuntimeError("listener bug")
+    live.subscribe(flaky)
+    ingestor = LiveIngestor(live, flush_interval=0.2)
+
+    with pytest.raises(ValueError):
+        ingestor.put("Z1", stamp(13), "n/a")
+    with pytest.raises(ValueError):
+        ingestor.put("Z1", stamp(13), float("nan"))
+    ingestor.put_line("Z1,%d,n/a" % stamp(13))
+    ingestor.put("Z1", stamp(13), 20)
+    ingestor.put(["Z1"], stamp(13), 90)                     # unhashable zone fails the batch
+    ingestor.put("Z2", stamp(13), 30)
+    ingestor.flush()
+    assert live.events == 2
+    ingestor.put("Z1", stamp(13), 40)
+    ingestor.flush()
+    ingestor.stop()
+    assert live.events == 3 and len(calls) >= 3
+    assert list(live.window("Z1", 18, 14, length=1, now=NOW)) == [30]
+
+
+def test_ingest_throughput():
+    """Thousands of events per second through the queue"""
+    ingestor = LiveIngestor(LiveOccupancy([f"Z{i}" for i in range(1, 6)]))
+    n = 20000
+    start = time.perf_counter()
+    for i in range(n):
+        ingestor.put(f"Z{i % 5 + 1}", start, i % 100)
+    ingestor.flush()
+    rate = n / (time.perf_counter() - start)
+    ingestor.stop()
+
+    assert ingestor.live.events == n
+    assert rate > 5000
+    print(f"[OK] {rate:,.0f} events/s")
+
+
+def test_predictions_use_live_windows():
+    """predict_many predicts from the live feed where it covers the hours"""
+    from backend_predictor import get_live_occupancy, load_inference_model, predict_many
+
+    now = dt.datetime.now()
+    live = get_live_occupancy()
+    try:
+        for back, value in [(3, 80), (2, 85), (1, 90)]:
+            live.add("Z1", time.mktime((now - dt.timedelta(hours=back)).timetuple()), value)
+        expected = load_inference_model().predict(np.array([[[0.80], [0.85], [0.90]]]), verbose=0)[0, 0]
+        assert predict_many([("Z1", now.day, now.hour)])[0] == round(float(expected) * 100, 2)
+    finally:
+        get_live_occupancy.clear()
@@ -0,0 +1,68 @@
+"""
+Test: Multi-horizon forecasts (batched recursive rollout / multi-output head)
+"""
+
+import numpy as np
+
+import backend_predictor
+from backend_predictor import predict_horizon, predict_parking_occupancy
+from numpy_model import NumpyCNNLSTM
+
+
+class CountingModel:
+    """Wraps a model and counts forward passes"""
+
+    def __init__(self, model):
+        self.model = model
+        self.batches = []
+
+    def predict(self, X, batch_size=None, verbose=0):
+        self.batches.append(len(X))
+        return self.model.predict(X)
+
+
+def test_first_step_matches_next_hour_prediction():
+    """Step 1 of the rollout is the usual next-hour forecast"""
+    requests = [("Z1", 5, 10), ("Z3", 9, 20), ("Z2", 7, 1)]
+    forecasts = predict_horizon(requests, steps=6)
+
+    for (zone_id, day, hour), forecast in zip(requests, forecasts):
+        assert len(forecast) == 6        # 01:00 starts from the previous evening
+        assert abs(forecast[0] - predict_parking_occupancy(zone_id, day, hour)) < 0.05
+    assert predict_horizon([], steps=6) == []
+
+
+def test_rollout_shares_passes_across_requests(monkeypatch):
+    """N steps cost N passes in total, however many zones are requested"""
+    model = CountingModel(backend_predictor.load_inference_model())
+    monkeypatch.setattr(backend_predictor, "load_inference_model", lambda: model)
+
+    requests = [(f"Z{z}", day, 12) for z in range(1, 5) for day in range(2, 12)]
+    forecasts = predict_horizon(requests, steps=5)
+    assert model.batches == [len(requests)] * 5
+    assert all(f is not None and len(f) == 5 for f in forecasts)
+
+
+def test_multi_output_head(monkeypatch):
+    """A k-output head fills k hours per pass and feeds them back"""
+    rng = np.random.default_rng(0)
+    base = backend_predictor.load_inference_model()
+    weights = {name: getattr(base, name) for name in
+               ("conv_kernel", "conv_bias", "lstm_kernel", "lstm_recurrent", "lstm_bias")}
+    weights["dense_kernel"] = rng.normal(0, 0.1, (base.units, 3)).astype(np.float32)
+    weights["dense_bias"] = np.full(3, 0.5, dtype=np.float32)
+    head = NumpyCNNLSTM(weights)
+    model = CountingModel(head)
+    monkeypatch.setattr(backend_predictor, "load_inference_model", lambda: model)
+
+    forecast = predict_horizon([("Z1", 5, 10)], steps=8)[0]
+    assert model.batches == [1, 1, 1]    # ceil(8 / 3) passes
+
+    index = backend_predictor.load_occupancy_index()
+    history = list(index.window("Z1", 5, 10, length=3) / 100.0)
+    expected = []
+    while len(expected) < 8:
+        step = head.predict(np.array(history[-3:], dtype=np.float32).reshape(1, 3, 1))[0]
+        expected += list(step)
+        history += list(step)
+    assert np.allclose(forecast, np.round(np.array(expected[:8]) * 100, 2), atol=0.011)
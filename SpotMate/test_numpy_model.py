@@ -0,0 +1,35 @@
+"""
+Test: NumPy CNN-LSTM matches the Keras model
+"""
+
+import os
+
+import numpy as np
+
+from numpy_model import NumpyCNNLSTM, NPZ_PATH, KERAS_PATH, TOLERANCE, max_abs_error
+
+
+def test_numpy_matches_keras():
+    """Exported weights reproduce Keras outputs within tolerance"""
+    assert os.path.isfile(NPZ_PATH), "Run `python numpy_model.py` to export weights"
+    from tensorflow.keras.models import load_model
+
+    error = max_abs_error(load_model(KERAS_PATH), NumpyCNNLSTM.load(NPZ_PATH))
+    print(f"[OK] Max abs error: {error:.2e}")
+    assert error <= TOLERANCE
+
+
+def test_batch_shapes():
+    """Batched input gives one prediction per window"""
+    model = NumpyCNNLSTM.load(NPZ_PATH)
+    X = np.full((7, 3, 1), 0.5, dtype=np.float32)
+    out = model.predict(X)
+
+    assert out.shape == (7, 1)
+    assert np.allclose(out, out[0])
+
+
+if __name__ == "__main__":
+    test_numpy_matches_keras()
+    test_batch_shapes()
+    print("ALL NUMPY MODEL TESTS PASSED")
@@ -0,0 +1,79 @@
+"""
+Test: Dense occupancy cube lookups
+"""
+
+import numpy as np
+import pandas as pd
+
+from occupancy_index import OccupancyIndex
+
+
+def make_frame():
+    rows = []
+    for zone in ["Z1", "Z2"]:
+        for day in [1, 2]:
+            for hour in range(24):
+                rows.append([zone, day, hour, hour + (10 if zone == "Z2" else 0), 0])
+    df = pd.DataFrame(rows, columns=["zone_id", "day", "hour", "occupancy", "is_weekend"])
+    # Drop one record to exercise the validity mask
+    return df[~((df["zone_id"] == "Z2") & (df["day"] == 2) & (df["hour"] == 5))]
+
+
+def test_window_is_view():
+    """A complete window is a slice of the cube, not a copy"""
+    index = OccupancyIndex.from_dataframe(make_frame())
+    window = index.window("Z1", 1, 14)
+
+    assert window.tolist() == [11, 12, 13]
+    assert np.shares_memory(window, index.values)
+
+
+def test_missing_history():
+    """Hours before the data, gaps and unknown zones/days have no window"""
+    index = OccupancyIndex.from_dataframe(make_frame())
+
+    assert index.window("Z1", 1, 2) is None
+    assert index.window("Z2", 2, 7) is None
+    assert index.window("Z2", 3, 1) is None
+    assert index.window("Z9", 1, 10) is None
+    assert index.window("Z1", 30, 10) is None
+
+
+def test_window_across_midnight():
+    """Early hours continue from the previous day's last hours, as a view"""
+    index = OccupancyIndex.from_dataframe(make_frame())
+    window = index.window("Z1", 2, 1)
+
+    assert window.tolist() == [22, 23, 0]
+    assert np.shares_memory(window, index.values)
+    assert index.window("Z1", 2, 0).tolist() == [21, 22, 23]
+    assert index.window("Z2", 2, 6) is None          # gap at 05:00 on day 2
+
+
+def test_cyclic_days():
+    """A cyclic index wraps days like a month: the first day follows the last"""
+    index = OccupancyIndex.from_dataframe(make_frame(), cyclic=True)
+
+    assert index.window("Z1", 1, 2).tolist() == [23, 0, 1]      # from day 2's 23:00
+    assert index.window("Z1", 3, 14).tolist() == [11, 12, 13]   # day 3 == day 1
+    assert index.window("Z2", 4, 7) is None                     # day 4 == day 2 (gap)
+    assert index.window("Z9", 1, 10) is None
+
+
+def test_windows_batch():
+    """Batched lookup skips incomplete windows and keeps positions"""
+    index = OccupancyIndex.from_dataframe(make_frame())
+    X, positions = index.windows([("Z1", 1, 5), ("Z2", 2, 7), ("Z2", 1, 4)])
+
+    assert X.shape == (2, 3)
+    assert positions == [0, 2]
+    assert X[1].tolist() == [11, 12, 13]
+
+
+if __name__ == "__main__":
+    test_window_is_view()
+    test_missing_history()
+    test_window_across_midnight()
+    test_cyclic_days()
+    test_windows_batch()
+    print("ALL OCCUPANCY INDEX TESTS PASSED")
@@ -0,0 +1,94 @@
+"""
+Test: Shared prediction cache (LRU + SQLite backing)
+"""
+
+from prediction_cache import PredictionCache, MISSING
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted first"""
+    cache = PredictionCache("v1", max_entries=2)
+    cache.put_many([(("Z1", 1, 5), 40.0), (("Z1", 1, 6), 41.0)])
+    cache.get_many([("Z1", 1, 5)])
+    cache.put_many([(("Z1", 1, 7), 42.0)])
+
+    assert cache.get_many([("Z1", 1, 5), ("Z1", 1, 6), ("Z1", 1, 7)]) == [40.0, MISSING, 42.0]
+    assert len(cache) == 2
+
+
+def test_none_is_cached():
+    """'No prediction possible' is remembered, not recomputed"""
+    cache = PredictionCache("v1")
+    cache.put_many([(("Z1", 1, 1), None)])
+    assert cache.get_many([("Z1", 1, 1)]) == [None]
+
+
+def test_shared_between_processes(tmp_path):
+    """Two caches on the same SQLite file see each other's entries"""
+    db_path = str(tmp_path / "predictions.db")
+    writer = PredictionCache("v1", db_path=db_path)
+    reader = PredictionCache("v1", db_path=db_path)
+
+    writer.put_many([(("Z2", 3, 10), 77.5)])
+    assert reader.get_many([("Z2", 3, 10)]) == [77.5]
+
+
+def test_version_invalidation(tmp_path):
+    """A new version misses old entries; other versions' rows survive until stale"""
+    db_path = str(tmp_path / "predictions.db")
+    cache = PredictionCache("v1", db_path=db_path)
+    cache.put_many([(("Z1", 1, 5), 40.0)])
+
+    cache.set_version("v2")
+    assert cache.get_many([("Z1", 1, 5)]) == [MISSING]
+    assert PredictionCache("v2", db_path=db_path).get_many([("Z1", 1, 5)]) == [MISSING]
+    assert PredictionCache("v1", db_path=db_path).get_many([("Z1", 1, 5)]) == [40.0]
+
+    PredictionCache("v2", db_path=db_path, stale_after=-1)
+    assert PredictionCache("v1", db_path=db_path).get_many([("Z1", 1, 5)]) == [MISSING]
+
+
+def test_disk_rows_are_capped(tmp_path):
+    """The SQLite file keeps at most max_db_rows, oldest dropped first"""
+    db_path = str(tmp_path / "predictions.db")
+    cache = PredictionCache("v1", max_entries=1, db_path=db_path, max_db_rows=3)
+    for hour in range(5):
+        cache.put_many([(("Z1", 1, hour), float(hour))])
+    cache._prune()
+
+    reader = PredictionCache("v1", db_path=db_path, max_db_rows=3)
+    assert reader.get_many([("Z1", 1, h) for h in range(5)]) == [MISSING, MISSING, 2.0, 3.0, 4.0]
+
+
+def test_backend_follows_model_version(monkeypatch):
+    """Swapping dataset/model files moves the shared cache to the new version"""
+    import backend_predictor
+
+    cache = backend_predictor.get_prediction_cache()
+    cache.put_many([(("Z1", 1, 5), 40.0)])
+    monkeypatch.setattr(backend_predictor, "model_version", lambda: "swapped")
+    assert backend_predictor.get_prediction_cache().get_many([("Z1", 1, 5)]) == [MISSING]
+    assert cache.version == "swapped"
+
+
+
+def test_content_hash_is_off_the_version_path():
+    """model_version() only stats files; the table key is hashed in the background"""
+    import backend_predictor
+    from forecast_table import table_key
+
+    expected = table_key(backend_predictor.dataset_source_path(), backend_predictor.serving_model_path())
+    assert backend_predictor.content_version(wait=True) == expected
+    assert backend_predictor.model_version() not in ("", expected)
+
+
+def test_writes_from_an_old_version_are_dropped(tmp_path):
+    """Values computed before a version switch are not stored under the new one"""
+    db_path = str(tmp_path / "predictions.db")
+    cache = PredictionCache("v1", db_path=db_path)
+    cache.set_version("v2")
+    cache.put_many([(("Z1", 1, 5), 40.0)], version="v1")
+    cache.put_many([(("Z1", 1, 6), 50.0)], version="v2")
+    assert cache.get_many([("Z1", 1, 5), ("Z1", 1, 6)]) == [MISSING, 50.0]
+    reader = PredictionCache("v2", db_path=db_path)
+    assert reader.get_many([("Z1", 1, 5), ("Z1", 1, 6)]) == [MISSING, 50.0]
@@ -0,0 +1,105 @@
+"""
+Test: Prediction micro-service (micro-batching, HTTP + Unix socket client)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from prediction_client import PredictionClient
+from prediction_service import MicroBatcher, make_server
+
+
+class FakeModel:
+    """Stands in for backend_predictor.predict_many, recording batch sizes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, requests):
+        self.calls.append(list(requests))
+        time.sleep(0.002)
+        return [None if h < 3 else float(d + h) for _, d, h in requests]
+
+
+def test_concurrent_requests_share_one_pass():
+    """Requests arriving inside the window become one de-duplicated batch"""
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_wait=0.05)
+    with ThreadPoolExecutor(16) as pool:
+        futures = [pool.submit(batcher.predict, [("Z1", 1, h), ("Z1", 1, 10)]) for h in range(16)]
+        results = [f.result(5) for f in futures]
+
+    for h, result in enumerate(results):
+        assert result == [None if h < 3 else float(1 + h), 11.0]
+    assert sum(len(c) for c in model.calls) <= 17
+    assert len(model.calls) < 16
+
+
+def test_batch_cap_and_errors():
+    """Batches respect max_batch; a failing pass fails only its own callers"""
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_wait=0.05, max_batch=4)
+    futures = [batcher.submit([("Z2", 1, h)]) for h in range(10)]
+    assert [f.result(5) for f in futures] == [[None]] * 3 + [[float(1 + h)] for h in range(3, 10)]
+    assert max(len(c) for c in model.calls) <= 4
+    assert batcher.predict([]) == []
+
+    def broken(requests):
+        raise RuntimeError("model crashed")
+
+    with pytest.raises(RuntimeError):
+        MicroBatcher(broken).predict([("Z1", 1, 5)], timeout=5)
+
+
+def fake_horizon(requests, steps):
+    return [None if h < 3 else [float(d + h + i) for i in range(steps)] for _, d, h in requests]
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def service(request, tmp_path):
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_wait=0.005)
+    if request.param == "unix":
+        path = str(tmp_path / "predict.sock")
+        server = make_server(batcher, socket_path=path, horizon=fake_horizon)
+        url = f"unix://{path}"
+    else:
+        server = make_server(batcher, port=0, horizon=fake_horizon)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield url, model
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_round_trip(service):
+    """The thin client mirrors the backend_predictor API over the service"""
+    url, model = service
+    client = PredictionClient(url)
+    assert client.model_status() == "ready"
+    assert client.predict_parking_occupancy("Z1", 2, 10) == 12.0
+    curve = client.predict_day_curve("Z3", 1, hours=24)
+    assert curve[:3] == [None] * 3 and curve[23] == 24.0
+    assert client.predict_many([("Z1", 2, 10), ("Z1", 2, 2)]) == [12.0, None]
+    assert client.predict_horizon([("Z1", 2, 10), ("Z1", 2, 2)], steps=3) == [[12.0, 13.0, 14.0], None]
+
+
+def test_integer_zone_ids_round_trip(service):
+    """Dense integer zone ids reach the model as ints, not their string form"""
+    url, model = service
+    client = PredictionClient(url)
+    assert client.predict_many([("Z4", 2, 9), (3, 2, 9)]) == [11.0, 11.0]
+    assert ("Z4", 2, 9) in model.calls[-1] and (3, 2, 9) in model.calls[-1]
+    with pytest.raises(TypeError):
+        MicroBatcher(model).submit([(["Z4"], 2, 9)])
+
+
+def test_client_degrades_when_service_is_down():
+    """No service: predictions are None and status is failed, never an exception"""
+    client = PredictionClient("http://127.0.0.1:9", timeout=1)
+    assert client.predict_day_curve("Z1", 1, hours=4) == [None] * 4
+    assert client.model_status() == "failed"
+    assert client.predict_horizon([("Z1", 1, 5)]) == [None]
@@ -0,0 +1,99 @@
+"""
+Test: QR ticket rendering cache (single PNG encode per booking payload)
+"""
+
+import datetime as dt
+import threading
+
+import qr_tickets
+from qr_tickets import QRRenderer, render_png
+from ticket_codec import sign_ticket
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def count_renders(monkeypatch):
+    calls = []
+    real = qr_tickets.render_png
+
+    def counting(payload):
+        calls.append(payload)
+        return real(payload)
+
+    monkeypatch.setattr(qr_tickets, "render_png", counting)
+    return calls
+
+
+def test_signed_ticket_fits_version_2():
+    """Signed base45 codes render as small alphanumeric-mode symbols"""
+    import qrcode
+    code = sign_ticket(b"key", "BK5001", "P#1001", dt.datetime(2026, 10, 18, 10), 4)
+    qr = qrcode.QRCode()
+    qr.add_data(code)
+    qr.make(fit=True)
+    assert qr.version <= 2
+    assert render_png(code).startswith(PNG_MAGIC)
+
+
+def test_encodes_once(monkeypatch):
+    """Repeat views return the identical bytes without re-encoding"""
+    calls = count_renders(monkeypatch)
+    renderer = QRRenderer()
+    payload = sign_ticket(b"key", "BK5001", "P#1001", dt.datetime(2026, 10, 18, 10), 4)
+    first = renderer.png(payload)
+    for _ in range(20):
+        assert renderer.png(payload) is first
+    assert calls == [payload]
+
+
+def test_lru_bound(monkeypatch):
+    """Least recently viewed tickets are evicted first"""
+    calls = count_renders(monkeypatch)
+    renderer = QRRenderer(max_entries=2)
+    renderer.png("a")
+    renderer.png("b")
+    renderer.png("a")
+    renderer.png("c")          # evicts "b"
+    assert len(renderer) == 2
+    renderer.png("a")
+    renderer.png("b")
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_prerender_is_joined(monkeypatch):
+    """A view arriving mid pre-render waits for it instead of encoding again"""
+    calls = count_renders(monkeypatch)
+    gate = threading.Event()
+    real = qr_tickets.render_png
+    monkeypatch.setattr(qr_tickets, "render_png", lambda p: (gate.wait(5), real(p))[1])
+
+    renderer = QRRenderer()
+    future = renderer.prerender("BK5002")
+    assert renderer.prerender("BK5002") is future
+    result = []
+    viewer = threading.Thread(target=lambda: result.append(renderer.png("BK5002")))
+    viewer.start()
+    gate.set()
+    viewer.join(5)
+    assert result == [future.result()]
+    assert calls == ["BK5002"]
+    assert renderer.prerender("BK5002") is None
+
+
+def test_concurrent_misses_render_once(monkeypatch):
+    """Sessions opening the same new pass at once share one encode"""
+    calls = count_renders(monkeypatch)
+    gate = threading.Event()
+    counting = qr_tickets.render_png
+    monkeypatch.setattr(qr_tickets, "render_png", lambda p: (gate.wait(5), counting(p))[1])
+
+    renderer = QRRenderer()
+    results = []
+    viewers = [threading.Thread(target=lambda: results.append(renderer.png("BK5003"))) for _ in range(6)]
+    for viewer in viewers:
+        viewer.start()
+    gate.set()
+    for viewer in viewers:
+        viewer.join(5)
+    assert len(results) == 6 and all(r is results[0] for r in results)
+    assert calls == ["BK5003"]
@@ -113,20 +113,20 @@ def test_qr_code_bytes():
     print("\n🧪 TEST 5: QR Code Uses Bytes (No TypeError)")
     app_content = read_app_file()
     
-    # Check for generate_qr_code returns tuple
-    if 'return img, img_bytes' not in app_content:
+    # Check generate_qr_code returns cached PNG bytes
+    if 'return get_qr_renderer().png(' not in app_content:
         print("   ❌ FAIL: QR function doesn't return bytes")
         return False
     
-    # Check for st.image(qr_img_bytes...) not st.image(qr_img...)
-    qr_display = app_content[app_content.find('st.image(qr_img'):app_content.find('st.image(qr_img') + 100]
-    if 'st.image(qr_img_bytes' not in qr_display:
+    # Check for st.image(qr_png_bytes...) not a PIL image
+    qr_display = app_content[app_content.find('st.image(qr_'):app_content.find('st.image(qr_') + 100]
+    if 'st.image(qr_png_bytes' not in qr_display:
         print("   ❌ FAIL: QR display not using bytes")
         return False
     
-    # Check for tuple unpacking
-    if 'qr_img, qr_img_bytes = generate_qr_code' not in app_content:
-        print("   ❌ FAIL: QR tuple unpacking not found")
+    # Display and download share one encode
+    if 'qr_png_bytes = generate_qr_code' not in app_content or 'data=qr_png_bytes' not in app_content:
+        print("   ❌ FAIL: QR bytes not reused for download")
         return False
     
     print("   ✅ PASS: QR code properly configured to use bytes (no TypeError)")
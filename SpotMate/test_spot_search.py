@@ -0,0 +1,64 @@
+"""
+Test: Spatial spot search (grid index + pushed-down filters)
+"""
+
+import numpy as np
+import pandas as pd
+
+from spot_search import SpotIndex, haversine_km, vehicle_mask, vehicle_names, VEHICLE_BITS
+
+
+def make_spots(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "spot_id": np.arange(n),
+        "lat": 17.38 + rng.normal(0, 0.05, n),
+        "lon": 78.48 + rng.normal(0, 0.05, n),
+        "price": rng.integers(10, 200, n),
+        "availability": rng.integers(0, 100, n),
+        "vehicles": rng.integers(1, 16, n),
+    })
+
+
+def test_radius_matches_brute_force():
+    """Grid query returns exactly the spots a full scan would"""
+    spots = make_spots()
+    index = SpotIndex(spots, cell_km=0.5)
+    result = index.within_radius(17.39, 78.47, 1.5, max_price=120, min_availability=30, vehicle="SUV")
+
+    d = haversine_km(17.39, 78.47, spots["lat"], spots["lon"])
+    expected = spots[(d <= 1.5) & (spots["price"] <= 120) & (spots["availability"] >= 30)
+                     & ((spots["vehicles"] & VEHICLE_BITS["SUV"]) != 0)]
+
+    assert sorted(result["spot_id"]) == sorted(expected["spot_id"])
+    assert result["distance_km"].is_monotonic_increasing
+
+
+def test_nearest():
+    """k-nearest expands the search until k spots are found"""
+    spots = make_spots()
+    index = SpotIndex(spots, cell_km=0.25)
+    result = index.nearest(17.40, 78.50, 15)
+
+    d = np.sort(haversine_km(17.40, 78.50, spots["lat"], spots["lon"]))
+    assert np.allclose(result["distance_km"], d[:15])
+
+
+def test_vehicle_masks():
+    """Vehicle lists round-trip through the bitmask"""
+    assert vehicle_names(vehicle_mask(["Sedan", "Hatchback"])) == "Hatchback, Sedan"
+    assert vehicle_names(vehicle_mask("All")) == "All"
+
+    index = SpotIndex.from_records([
+        {"spot_id": "A", "lat": 12.97, "lon": 77.59, "price": 40, "availability": 50, "vehicles": ["Bike"]},
+        {"spot_id": "B", "lat": 12.97, "lon": 77.60, "price": 40, "availability": 50, "vehicles": "All"},
+    ])
+    assert index.within_radius(12.97, 77.59, 5, vehicle="Sedan")["spot_id"].tolist() == ["B"]
+    assert len(index.within_radius(12.97, 77.59, 5, vehicle="Any")) == 2
+
+
+if __name__ == "__main__":
+    test_radius_matches_brute_force()
+    test_nearest()
+    test_vehicle_masks()
+    print("ALL SPOT SEARCH TESTS PASSED")
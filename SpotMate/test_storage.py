@@ -0,0 +1,113 @@
+"""
+Test: SQLite-backed listings store and bookings ledger
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from storage import ListingsStore, BookingsStore
+
+
+def make_listing(i, **overrides):
+    listing = {
+        "location": f"Spot {i}",
+        "lat": 17.40 + i * 0.001,
+        "lon": 78.45,
+        "type": "Private" if i % 2 else "Public",
+        "price": 20 + i,
+        "availability_hours": 16,
+        "available_days": ["Monday", "Tuesday"],
+        "owner": "Owner",
+        "contact": "123",
+        "vehicle_sizes": ["Sedan", "SUV"],
+        "has_image": False,
+        "listed_date": "18-10-2026",
+    }
+    listing.update(overrides)
+    return listing
+
+
+def test_batched_ids_and_persistence(tmp_path):
+    """IDs are allocated by the database and listings survive a restart"""
+    db_path = str(tmp_path / "spotmate.db")
+    store = ListingsStore(db_path)
+    ids = store.add_many([make_listing(i) for i in range(5)])
+    assert ids == [1, 2, 3, 4, 5]
+
+    reopened = ListingsStore(db_path)
+    assert reopened.count() == 5
+    assert reopened.add(make_listing(9)) == 6
+
+
+def test_pagination_and_display_format(tmp_path):
+    """Only one page is read, formatted like the old session DataFrame"""
+    store = ListingsStore(str(tmp_path / "spotmate.db"))
+    store.add_many([make_listing(i) for i in range(45)])
+
+    page = store.page(3, page_size=20)
+    assert page["ID"].tolist() == [41, 42, 43, 44, 45]
+    assert list(page.columns) == ["ID", "Location", "Type", "Price/Hour", "Availability",
+                                  "Owner", "Contact", "Vehicle Size", "Image", "Listed Date"]
+    assert page.iloc[0]["Price/Hour"] == "₹60"
+    assert page.iloc[0]["Availability"] == "16h daily"
+    assert page.iloc[0]["Vehicle Size"] == "Sedan, SUV"
+
+
+def test_find(tmp_path):
+    """Typed filters on type, price and location bounds"""
+    store = ListingsStore(str(tmp_path / "spotmate.db"))
+    store.add_many([make_listing(i) for i in range(10)])
+
+    found = store.find(parking_type="Private", max_price=25, bounds=(17.40, 78.40, 17.405, 78.50))
+    assert found["id"].tolist() == [2, 4, 6]
+
+
+def test_located_listings(tmp_path):
+    """Only listings with coordinates reach the spot index; last_id tracks additions"""
+    store = ListingsStore(str(tmp_path / "spotmate.db"))
+    assert store.last_id() == 0
+    store.add_many([make_listing(0), make_listing(1, lat=None, lon=None), make_listing(2)])
+    assert store.located()["id"].tolist() == [1, 3]
+    assert store.last_id() == 3
+
+
+def make_booking(location="Hitech City"):
+    return {
+        "parking_id": "P#1001",
+        "location": location,
+        "date": "2026-10-18",
+        "time": "10:00:00",
+        "amount": "₹232",
+        "payment_method": "UPI 📱",
+        "status": "Confirmed",
+        "booked_at": "18-10-2026 09:00",
+    }
+
+
+def create_bookings(db_path, n):
+    store = BookingsStore(db_path)
+    return [store.create(make_booking()) for _ in range(n)]
+
+
+def test_booking_lookup(tmp_path):
+    """Bookings are found by ID and kept in request order"""
+    store = BookingsStore(str(tmp_path / "spotmate.db"))
+    first = store.create(make_booking("A"))
+    second = store.create(make_booking("B"))
+
+    assert (first, second) == ("BK5001", "BK5002")
+    assert store.get(second)["location"] == "B"
+    assert store.get("BK9999") is None
+    assert [b["location"] for b in store.get_many([second, "BK9999", first])] == ["B", "A"]
+
+
+def test_booking_ids_unique_across_processes(tmp_path):
+    """Workers sharing the database never hand out the same ID"""
+    db_path = str(tmp_path / "spotmate.db")
+    BookingsStore(db_path)
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        batches = list(pool.map(create_bookings, [db_path] * 4, [25] * 4))
+
+    ids = [booking_id for batch in batches for booking_id in batch]
+    assert len(set(ids)) == 100
+    assert sorted(int(b[2:]) for b in ids) == list(range(5001, 5101))
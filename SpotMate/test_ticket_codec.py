@@ -0,0 +1,103 @@
+"""
+Test: Signed compact QR tickets and offline gate verification
+"""
+
+import datetime as dt
+import os
+
+import pytest
+
+from gate_verify import benchmark, verify_many
+from ticket_codec import (
+    ENTRY_GRACE_MINUTES, TICKET_BYTES, TicketError, TicketVerifier,
+    b45decode, b45encode, booking_start, load_key, sign_ticket,
+)
+
+KEY = b"gate-test-key"
+START = dt.datetime(2026, 10, 18, 10, 0)
+
+
+def at(hour, minute=0):
+    return dt.datetime(2026, 10, 18, hour, minute).timestamp()
+
+
+def test_base45_rfc_vectors():
+    """Matches the RFC 9285 examples and round-trips arbitrary bytes"""
+    assert b45encode(b"AB") == "BB8"
+    assert b45encode(b"Hello!!") == "%69 VD92EX0"
+    assert b45decode("QED8WEX0") == b"ietf!"
+    data = os.urandom(TICKET_BYTES)
+    assert b45decode(b45encode(data)) == data
+    with pytest.raises(TicketError):
+        b45decode("GGW")           # 65535 < value
+    with pytest.raises(TicketError):
+        b45decode("abc")           # lowercase is outside the alphabet
+
+
+def test_round_trip():
+    """A signed ticket decodes to its booking, spot and window"""
+    code = sign_ticket(KEY, "BK5001", "P#1001", START, 4)
+    assert len(code) == 38
+    ticket = TicketVerifier(KEY).verify(code, now=at(11))
+    assert ticket.booking_id == "BK5001"
+    assert ticket.spot_number == 1001
+    assert ticket.valid_from == at(10) - ENTRY_GRACE_MINUTES * 60
+    assert ticket.valid_until == at(14)
+
+
+def test_rejects_forgeries():
+    """Tampered codes and codes signed with another key are refused"""
+    code = sign_ticket(KEY, "BK5001", "P#1001", START, 4)
+    verifier = TicketVerifier(KEY)
+    raw = bytearray(b45decode(code))
+    raw[2] ^= 1                    # change the booking number
+    with pytest.raises(TicketError, match="signature"):
+        verifier.verify(b45encode(bytes(raw)), now=at(11))
+    with pytest.raises(TicketError, match="signature"):
+        TicketVerifier(b"other-key").verify(code, now=at(11))
+    with pytest.raises(TicketError, match="length"):
+        verifier.verify(code[:-5], now=at(11))   # whole base45 chunks, one byte short
+
+
+def test_window_and_spot():
+    """Entry opens at the grace time, closes at the end, and is per spot"""
+    code = sign_ticket(KEY, "BK5001", "P#1001", START, 4)
+    verifier = TicketVerifier(KEY)
+    verifier.verify(code, now=at(9, 45))
+    with pytest.raises(TicketError, match="not valid yet"):
+        verifier.verify(code, now=at(9, 44))
+    with pytest.raises(TicketError, match="expired"):
+        verifier.verify(code, now=at(14))
+    with pytest.raises(TicketError, match="another spot"):
+        verifier.verify(code, now=at(11), spot_number=1002)
+
+
+def test_key_rotation():
+    """Gates holding several keys accept tickets from each key id"""
+    old = sign_ticket(b"old", "BK1", "P#1", START, 1, key_id=0)
+    new = sign_ticket(b"new", "BK2", "P#1", START, 1, key_id=1)
+    verifier = TicketVerifier({0: b"old", 1: b"new"})
+    assert verifier.verify(old, now=at(10)).booking_number == 1
+    assert verifier.verify(new, now=at(10)).key_id == 1
+    with pytest.raises(TicketError, match="unknown key"):
+        TicketVerifier({0: b"old"}).verify(new, now=at(10))
+
+
+def test_load_key_is_created_once(tmp_path):
+    """The first caller creates a private key file; later callers reuse it"""
+    path = tmp_path / "ticket_key.bin"
+    key = load_key(str(path))
+    assert len(key) == 32
+    assert load_key(str(path)) == key
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_batch_verify_and_throughput():
+    """Batch results line up with input; verification is fast enough for gates"""
+    good = sign_ticket(KEY, "BK5001", "P#1001", START, 4)
+    results = verify_many(TicketVerifier(KEY), [good, "NOT A TICKET", good], now=at(11))
+    assert [reason == "ok" for _, reason in results] == [True, False, True]
+    assert results[1][0] is None
+    assert results[0][0].booking_id == "BK5001"
+    assert booking_start("2026-10-18", "10:00:00") == START
+    assert benchmark(2000) > 5000
@@ -46,16 +46,11 @@ print("\n" + "=" * 60)
 print("Test 3: Zone Type Mapping for AI Predictions")
 print("=" * 60)
 
-zone_type_map = {
-    "Residential": "Z3",
-    "Commercial": "Z4",
-    "Office": "Z1",
-    "Event / Mixed": "Z2"
-}
+from zone_registry import load_zones
 
 print("Zone type to AI zone ID mapping:")
-for zone_type, zone_id in zone_type_map.items():
-    print(f"  [OK] {zone_type} == {zone_id}")
+for zone_type in load_zones().categories:
+    print(f"  [OK] {zone_type} == {load_zones().by_category(zone_type).code}")
 
 # Test 4: Test AI predictions (instant)
 print("\n" + "=" * 60)
@@ -105,19 +100,22 @@ print("\n" + "=" * 60)
 print("Test 6: Session State Structure (Performance)")
 print("=" * 60)
 
+# Listings and bookings live in the SQLite stores (storage.py); the
+# session only keeps this session's booking IDs and the checkout flow
 session_state_keys = {
-    "listed_parkings": "DataFrame",
-    "bookings": "List",
-    "booking_id_counter": "int",
+    "booking_ids": "list of booking IDs made in this session",
     "current_booking": "dict or None",
     "payment_stage": "str ('review' or 'confirmed')",
+    "balloons_shown": "bool",
     "temp_booking_id": "str or None",
-    "last_payment_method": "str"
+    "last_payment_method": "str",
+    "payment_method": "str"
 }
 
 print("Session state variables for instant transitions:")
 for key, type_info in session_state_keys.items():
     print(f"  [OK] {key}: {type_info}")
+print("  [OK] listings / bookings: ListingsStore / BookingsStore (data/spotmate.db)")
 
 # Test 7: Demand level calculation
 print("\n" + "=" * 60)
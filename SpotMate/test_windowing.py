@@ -0,0 +1,69 @@
+"""
+Test: Vectorized sliding windows
+"""
+
+import numpy as np
+import pandas as pd
+
+from windowing import group_windows, make_sequences
+
+
+def loop_sequences(df, sequence_length):
+    """Reference: the old list-append loop, run per zone & day"""
+    X, y = [], []
+    for _, group in df.sort_values(["zone_id", "day", "hour"]).groupby(["zone_id", "day"]):
+        occ = group["occupancy"].values
+        for i in range(len(occ) - sequence_length):
+            X.append(occ[i:i + sequence_length])
+            y.append(occ[i + sequence_length])
+    return np.array(X), np.array(y)
+
+
+def make_frame(drop_last_hour=False):
+    rng = np.random.default_rng(1)
+    rows = [[zone, day, hour, int(rng.integers(0, 100))]
+            for zone in ["Z2", "Z1"] for day in [2, 1] for hour in range(24)]
+    df = pd.DataFrame(rows, columns=["zone_id", "day", "hour", "occupancy"])
+    if drop_last_hour:
+        df = df[~((df["zone_id"] == "Z1") & (df["day"] == 2) & (df["hour"] == 23))]
+    return df
+
+
+def test_matches_loop_equal_groups():
+    """Fast path equals the per-group loop and never crosses groups"""
+    df = make_frame()
+    X, y = make_sequences(df, sequence_length=3)
+    X_ref, y_ref = loop_sequences(df, 3)
+
+    assert X.shape == (4 * 21, 3)
+    assert np.array_equal(X, X_ref)
+    assert np.array_equal(y[:, 0], y_ref)
+
+
+def test_matches_loop_ragged_groups():
+    """Unequal group sizes still give the same windows"""
+    df = make_frame(drop_last_hour=True)
+    X, y = make_sequences(df, sequence_length=3)
+    X_ref, y_ref = loop_sequences(df, 3)
+
+    assert np.array_equal(X, X_ref)
+    assert np.array_equal(y[:, 0], y_ref)
+
+
+def test_group_windows_are_views():
+    """Windows over a cube share memory with it"""
+    cube = np.arange(2 * 3 * 24, dtype=np.float32).reshape(2, 3, 24)
+    X, y = group_windows(cube, sequence_length=4, horizon=2)
+
+    assert X.shape == (2, 3, 19, 4)
+    assert y.shape == (2, 3, 19, 2)
+    assert np.shares_memory(X, cube) and np.shares_memory(y, cube)
+    assert X[1, 2, 5].tolist() == cube[1, 2, 5:9].tolist()
+    assert y[1, 2, 5].tolist() == cube[1, 2, 9:11].tolist()
+
+
+if __name__ == "__main__":
+    test_matches_loop_equal_groups()
+    test_matches_loop_ragged_groups()
+    test_group_windows_are_views()
+    print("ALL WINDOWING TESTS PASSED")
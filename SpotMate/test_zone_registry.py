@@ -0,0 +1,66 @@
+"""
+Test: Zone registry shared by generator, predictor index and UI
+"""
+
+import numpy as np
+import pandas as pd
+
+from occupancy_index import OccupancyIndex
+from zone_registry import ZoneRegistry, load_zones
+
+
+def test_registry_lookups():
+    """Dense ids, codes and UI categories resolve to the same zones"""
+    zones = load_zones()
+    assert zones is load_zones()                       # loaded once
+    assert [zone.id for zone in zones] == list(range(len(zones)))
+    assert zones.codes[:5] == ["Z1", "Z2", "Z3", "Z4", "Z5"]
+    assert zones.by_category("Commercial").type == "mall"
+    assert zones.by_code("Z4").category == "Hospital"
+    assert zones.capacity.shape == zones.lat.shape == (len(zones),)
+
+
+def test_extended_registry():
+    """Synthetic zones past the file keep contiguous ids and cycle types"""
+    zones = load_zones()
+    big = zones.extended(12)
+    assert len(big) == 12 and big[11].code == "Z12"
+    assert big[11].type == zones[11 % len(zones)].type
+    assert len(zones.extended(2)) == 2
+
+
+def test_index_rows_follow_registry():
+    """Index row == integer zone id, whatever order the data arrives in"""
+    zones = ZoneRegistry(list(load_zones())[:3])
+    df = pd.DataFrame({
+        "zone_id": ["Z3", "Z1", "Z9"], "day": [1, 1, 1], "hour": [0, 0, 0], "occupancy": [30, 10, 90],
+    })
+    index = OccupancyIndex.from_dataframe(df, zone_ids=zones.codes)
+
+    assert index.zone_ids == ["Z1", "Z2", "Z3", "Z9"]
+    assert [index.zone_pos[zone.code] for zone in zones] == [0, 1, 2]
+    assert np.array_equal(index.values[:, 0, 0], [10, 0, 30, 90])
+
+
+def test_predictions_by_integer_id():
+    """Registry ids and codes hit the same dense row in the predictor"""
+    from backend_predictor import load_occupancy_index, predict_horizon, predict_many
+
+    zones = load_zones()
+    index = load_occupancy_index()
+    assert index.zone_ids[:len(zones)] == zones.codes
+    assert index.row(zones.by_code("Z4").id) == index.row("Z4") == 3
+
+    requests = [("Z4", 12, 9), (3, 12, 9), (zones.by_code("Z2").id, 1, 1), (99, 1, 1)]
+    values = predict_many(requests)
+    assert values[0] == values[1] is not None and values[2] is not None and values[3] is None
+    assert predict_horizon([("Z4", 12, 9), (3, 12, 9)], steps=2)[0] == predict_horizon([(3, 12, 9)], steps=2)[0]
+
+
+def test_index_extends_registry_for_large_datasets():
+    """Generated zones past the file keep row == id in numeric order (Z6 before Z10)"""
+    zones = load_zones().extended(12)
+    codes = [f"Z{i}" for i in range(12, 0, -1)]
+    df = pd.DataFrame({"zone_id": codes, "day": 1, "hour": 0, "occupancy": range(12)})
+    index = OccupancyIndex.from_dataframe(df, zone_ids=zones.codes)
+    assert [index.row(code) for code in ("Z6", "Z10", "Z12")] == [5, 9, 11]
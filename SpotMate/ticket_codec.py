@@ -0,0 +1,186 @@
+# ticket_codec.py
+#
+# Signed, compact entry-pass payloads. A ticket is 25 bytes:
+#   version u4 | key id u4 | booking no. u32 | spot no. u32 |
+#   valid from (unix s) u32 | valid minutes u16 | HMAC-SHA256[:10]
+# encoded with base45 (RFC 9285), whose alphabet is exactly the QR
+# alphanumeric set, so the code fits a version 2 QR symbol.
+
+import datetime as dt
+import hashlib
+import hmac
+import os
+import re
+import struct
+from typing import NamedTuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+KEY_PATH = os.environ.get("SPOTMATE_TICKET_KEY_FILE", os.path.join(BASE_DIR, "data", "ticket_key.bin"))
+
+TICKET_VERSION = 1
+SIGNATURE_BYTES = 10
+ENTRY_GRACE_MINUTES = 15        # gates open a little before the booked time
+BOOKING_HOURS = 4               # every booking is for a fixed block of hours
+
+_BODY = struct.Struct(">BIIIH")
+TICKET_BYTES = _BODY.size + SIGNATURE_BYTES
+
+BASE45_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_VALUES = {c: i for i, c in enumerate(BASE45_ALPHABET)}
+
+
+class TicketError(ValueError):
+    """Raised when a ticket is malformed, forged or outside its window."""
+
+
+class Ticket(NamedTuple):
+    booking_number: int
+    spot_number: int
+    valid_from: int
+    valid_until: int
+    key_id: int = 0
+
+    @property
+    def booking_id(self):
+        return f"BK{self.booking_number}"
+
+
+# ---------------------------------------------------
+# Base45
+# ---------------------------------------------------
+
+def b45encode(data):
+    out = []
+    for i in range(0, len(data) - 1, 2):
+        n = data[i] * 256 + data[i + 1]
+        n, c = divmod(n, 45)
+        e, d = divmod(n, 45)
+        out += (c, d, e)
+    if len(data) % 2:
+        d, c = divmod(data[-1], 45)
+        out += (c, d)
+    return "".join(BASE45_ALPHABET[v] for v in out)
+
+
+def b45decode(text):
+    try:
+        values = [_BASE45_VALUES[c] for c in text]
+    except KeyError:
+        raise TicketError("not a base45 string") from None
+    if len(values) % 3 == 1:
+        raise TicketError("bad base45 length")
+    out = bytearray()
+    for i in range(0, len(values), 3):
+        chunk = values[i:i + 3]
+        n = sum(v * 45 ** k for k, v in enumerate(chunk))
+        if len(chunk) == 3:
+            if n > 0xFFFF:
+                raise TicketError("bad base45 chunk")
+            out += n.to_bytes(2, "big")
+        else:
+            if n > 0xFF:
+                raise TicketError("bad base45 chunk")
+            out.append(n)
+    return bytes(out)
+
+
+# ---------------------------------------------------
+# Keys
+# ---------------------------------------------------
+
+def load_key(path=KEY_PATH):
+    """Read the signing key, creating a random one on first use."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    key = os.urandom(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another process created it first; use theirs
+        with open(path, "rb") as f:
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _keyring(keys):
+    """Accept one key (id 0) or a {key_id: key} mapping."""
+    return {0: keys} if isinstance(keys, (bytes, bytearray)) else dict(keys)
+
+
+def id_number(value):
+    """Numeric part of an ID like 'BK5001' or 'P#1001'."""
+    digits = re.sub(r"\D", "", str(value))
+    if not digits:
+        raise ValueError(f"no number in id {value!r}")
+    return int(digits)
+
+
+# ---------------------------------------------------
+# Signing and verification
+# ---------------------------------------------------
+
+def sign_ticket(key, booking_id, spot_id, start, hours, key_id=0):
+    """Encode a signed ticket valid from `start` (minus grace) for `hours`."""
+    if not 0 <= key_id < 16:
+        raise ValueError("key_id must fit in 4 bits")
+    valid_from = int(start.timestamp()) - ENTRY_GRACE_MINUTES * 60
+    minutes = int(hours * 60) + ENTRY_GRACE_MINUTES
+    body = _BODY.pack(TICKET_VERSION << 4 | key_id, id_number(booking_id), id_number(spot_id),
+                      valid_from, minutes)
+    signature = hmac.new(key, body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+    return b45encode(body + signature)
+
+
+def booking_start(date, time):
+    """Booked start as a local datetime from the stored date/time strings."""
+    return dt.datetime.fromisoformat(f"{date} {time}")
+
+
+def booking_ticket(key, booking, hours=BOOKING_HOURS):
+    """Ticket code for a stored booking record."""
+    return sign_ticket(key, booking["booking_id"], booking["parking_id"],
+                       booking_start(booking["date"], booking["time"]), hours)
+
+
+class TicketVerifier:
+    """Verifies ticket codes against local keys; no network involved."""
+
+    def __init__(self, keys):
+        # Keyed HMAC states are built once and copied per ticket
+        self._macs = {kid: hmac.new(key, digestmod=hashlib.sha256) for kid, key in _keyring(keys).items()}
+
+    def decode(self, code):
+        """Check format and signature; returns the Ticket (window not checked)."""
+        raw = b45decode(code.strip())
+        if len(raw) != TICKET_BYTES:
+            raise TicketError("wrong ticket length")
+        body, signature = raw[:_BODY.size], raw[_BODY.size:]
+        header, booking, spot, valid_from, minutes = _BODY.unpack(body)
+        version, key_id = header >> 4, header & 0x0F
+        if version != TICKET_VERSION:
+            raise TicketError(f"unsupported ticket version {version}")
+        mac = self._macs.get(key_id)
+        if mac is None:
+            raise TicketError(f"unknown key id {key_id}")
+        mac = mac.copy()
+        mac.update(body)
+        if not hmac.compare_digest(mac.digest()[:SIGNATURE_BYTES], signature):
+            raise TicketError("bad signature")
+        return Ticket(booking, spot, valid_from, valid_from + minutes * 60, key_id)
+
+    def verify(self, code, now=None, spot_number=None):
+        """Decode and check the validity window (and optionally the gate's spot)."""
+        ticket = self.decode(code)
+        now = dt.datetime.now().timestamp() if now is None else now
+        if now < ticket.valid_from:
+            raise TicketError("ticket not valid yet")
+        if now >= ticket.valid_until:
+            raise TicketError("ticket expired")
+        if spot_number is not None and ticket.spot_number != spot_number:
+            raise TicketError("ticket is for another spot")
+        return ticket
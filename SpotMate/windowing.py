@@ -0,0 +1,51 @@
+# windowing.py
+#
+# Vectorized sliding windows for training / evaluation.
+# Windows never cross a group boundary (by default each zone's day).
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+GROUP_COLUMNS = ("zone_id", "day")
+
+
+def group_windows(values, sequence_length=3, horizon=1):
+    """
+    Zero-copy windows over the last axis of `values` (e.g. a [zone, day, hour]
+    cube or a (groups, steps) array).
+    Returns views X (..., n, sequence_length) and y (..., n, horizon).
+    """
+    windows = sliding_window_view(values, sequence_length + horizon, axis=-1)
+    return windows[..., :sequence_length], windows[..., sequence_length:]
+
+
+def make_sequences(df, sequence_length=3, horizon=1, group_columns=GROUP_COLUMNS,
+                   order_column="hour", value_column="occupancy"):
+    """
+    Build training samples from a long-format dataset.
+    Returns X (N, sequence_length) and y (N, horizon); windows stay inside
+    one group. When every group has the same length the windows come from
+    a (groups, steps) view without masking (flattening them copies once);
+    otherwise windows that straddle groups are dropped.
+    """
+    group_columns = list(group_columns)
+    df = df.sort_values(group_columns + [order_column], kind="stable")
+    values = df[value_column].to_numpy()
+    width = sequence_length + horizon
+
+    group_ids = df.groupby(group_columns, sort=False, observed=True).ngroup().to_numpy()
+    sizes = np.bincount(group_ids) if len(group_ids) else np.array([], dtype=int)
+
+    if len(values) < width:
+        return np.empty((0, sequence_length), values.dtype), np.empty((0, horizon), values.dtype)
+
+    # Fast path: equal-sized groups -> reshape to (groups, steps), no masking
+    if len(sizes) and (sizes == sizes[0]).all() and sizes[0] >= width:
+        X, y = group_windows(values.reshape(len(sizes), sizes[0]), sequence_length, horizon)
+        return X.reshape(-1, sequence_length), y.reshape(-1, horizon)
+
+    # General path: keep windows whose first and last rows share a group
+    windows = sliding_window_view(values, width)
+    starts = sliding_window_view(group_ids, width)
+    windows = windows[starts[:, 0] == starts[:, -1]]
+    return windows[:, :sequence_length], windows[:, sequence_length:]
@@ -0,0 +1,103 @@
+# zone_registry.py
+#
+# The parking zones (data/zones.csv): compact integer ids, the dataset's
+# string codes (Z1, Z2, ...), zone type, UI category, coordinates and
+# capacity. Loaded once per process and shared by the dataset generator,
+# the predictor's occupancy index (rows are ordered by id) and the app.
+
+import csv
+import functools
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+ZONES_PATH = os.path.join(DATA_DIR, "zones.csv")
+
+
+class Zone(NamedTuple):
+    id: int
+    code: str
+    type: str
+    category: str
+    lat: float
+    lon: float
+    capacity: int
+
+
+class ZoneRegistry:
+    """Zones indexed by dense integer id, with lookups by code and category."""
+
+    def __init__(self, zones):
+        self.zones = sorted(zones, key=lambda zone: zone.id)
+        if [zone.id for zone in self.zones] != list(range(len(self.zones))):
+            raise ValueError("zone ids must be 0..n-1")
+        self._by_code = {zone.code: zone for zone in self.zones}
+        self._by_category = {}
+        for zone in self.zones:
+            self._by_category.setdefault(zone.category, zone)
+
+        # Per-id columns for dense array indexing
+        self.lat = np.array([zone.lat for zone in self.zones], dtype=np.float64)
+        self.lon = np.array([zone.lon for zone in self.zones], dtype=np.float64)
+        self.capacity = np.array([zone.capacity for zone in self.zones], dtype=np.int64)
+
+    @classmethod
+    def load(cls, path=ZONES_PATH):
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls([
+                Zone(int(row["id"]), row["code"], row["type"], row["category"],
+                     float(row["lat"]), float(row["lon"]), int(row["capacity"]))
+                for row in csv.DictReader(f)
+            ])
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    def __getitem__(self, zone_id):
+        return self.zones[zone_id]
+
+    @property
+    def codes(self):
+        return [zone.code for zone in self.zones]
+
+    @property
+    def categories(self):
+        """UI categories in registry order, each mapped to its first zone."""
+        return list(self._by_category)
+
+    def by_code(self, code):
+        return self._by_code.get(code)
+
+    def by_category(self, category):
+        return self._by_category.get(category)
+
+    def extended(self, n):
+        """
+        The first `n` zones, adding synthetic ones past the registry
+        (Z6, Z7, ... with types cycling like the listed zones) so large
+        generated datasets still get contiguous ids.
+        """
+        zones = self.zones[:n]
+        for zone_id in range(len(zones), n):
+            template = self.zones[zone_id % len(self.zones)]
+            zones.append(template._replace(id=zone_id, code=f"Z{zone_id + 1}"))
+        return ZoneRegistry(zones)
+
+
+def zone_row(zone, zone_pos, n_rows):
+    """Row of `zone` (an integer zone id, used as-is, or a code like "Z1"), or None."""
+    if isinstance(zone, (int, np.integer)) and not isinstance(zone, bool):
+        return int(zone) if 0 <= zone < n_rows else None
+    return zone_pos.get(zone)
+
+
+@functools.lru_cache(maxsize=None)
+def load_zones(path=ZONES_PATH):
+    """The registry, read once per process."""
+    return ZoneRegistry.load(path)